@@ -3,15 +3,83 @@ Automação completa para extração de dados do portal Gente e Gestão
 Automatiza o processo de login, navegação e extração de dados de colaboradores
 """
 
+import codecs
+import gzip
 import os
 import re
-import html
+import time
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+)
 from services.login_service import LoginService
+from services.session_cache import SessionCache, obter_cache_sessao
+from services.debug_writer import GravadorDebug, obter_gravador_debug
+from services.page_state import EstadoPagina
+from services.checkpoints import (
+    ETAPA_BUSCA,
+    ETAPA_EXTRACAO,
+    Checkpoint,
+    CheckpointsPipeline,
+)
+from services.retentativas import (
+    OrcamentoRetentativas,
+    PoliticaRetentativa,
+    levantar_status_transitorio,
+)
+from services.transporte_http import TransporteHTTP, obter_transporte_http
+from services.metricas import (
+    METRICAS_DESLIGADAS,
+    ColetorMetricas,
+    Cronometro,
+    Etapa,
+    obter_coletor_metricas,
+)
+from services.devexpress_decoder import DevExpressDecoder, TAMANHO_BLOCO_PADRAO
+from services.colaborador import Colaborador
+from services.csv_export import (
+    ExportadorCSV,
+    formatar_cpf_sem_pontos,
+    formatar_data_vencimento,
+)
+from services.regras_texto import BUSCA_CPF, REGRAS_COLABORADOR, extrair_nome
+from services.devexpress_grid import (
+    ID_TABELA_PRINCIPAL,
+    ExtratorGridDevExpress,
+    linha_de_cabecalho,
+    montar_colaborador,
+)
+from utils.file_util import slug_credencial
+from utils.format_util import formatar_numero
+
+# Endereços do portal (GEG_LOGIN_URL/GEG_RELATORIO_URL apontam para outro
+# servidor, ex.: o portal local de benchmarks.portal_fake)
+URL_LOGIN_PADRAO = "https://www.genteegestao.com.br/portal/index.aspx"
+URL_RELATORIO_PADRAO = "https://www.genteegestao.com.br/GEG/Paginas/Relatorios/Prontuario/SituacaoCondutorAnalitico.aspx"
+
+# Parâmetro do callback do PanelGrid para pedir uma página da grid.
+# {pagina} é o índice da página (0 = primeira) e {tamanho} o número de linhas.
+PARAMETRO_CALLBACK_PAGINA = "c0:PAGERONCLICK|PN{pagina}|PSP{tamanho}"
+
+# Resumo do pager DevExpress ("Página 1 de 12 (2.345 itens)")
+PADRAO_TOTAL_PAGINAS = re.compile(
+    r"(?:P[áa]gina|Page)\s+\d+\s+(?:de|of)\s+(\d+)", re.IGNORECASE
+)
+
+# Células que começam com número/pontuação não são nomes (extração alternativa)
+PADRAO_INICIO_NUMERICO = re.compile(r"[\d\.\-]")
 
 
 class AutomacaoGEG:
@@ -19,31 +87,132 @@ class AutomacaoGEG:
     Classe principal para automação da extração de dados do portal Gente e Gestão
     """
 
-    def __init__(self, output_dir: str = "output"):
+    def __init__(
+        self,
+        output_dir: str = "output",
+        paginar: Optional[bool] = None,
+        tamanho_pagina: Optional[int] = None,
+        max_paginas_simultaneas: Optional[int] = None,
+        tentativas_pagina: int = 3,
+        cache_sessao: Optional[SessionCache] = None,
+        gravador_debug: Optional[GravadorDebug] = None,
+        login_url: Optional[str] = None,
+        relatorio_url: Optional[str] = None,
+        coletor_metricas: Optional[ColetorMetricas] = None,
+        transporte: Optional[TransporteHTTP] = None,
+        checkpoints: Optional[CheckpointsPipeline] = None,
+        orcamento_retentativas: Optional[OrcamentoRetentativas] = None,
+        credencial_log: Optional[str] = None,
+        execucao_metricas: Optional[str] = None,
+    ):
         """
         Inicializa a automação
 
         Args:
             output_dir: Diretório para salvar arquivos de saída
+            paginar: Se deve buscar a grid página por página em vez de um único
+                callback (padrão: variável GEG_PAGINAR)
+            tamanho_pagina: Linhas por página no modo paginado (GEG_TAMANHO_PAGINA)
+            max_paginas_simultaneas: Limite de callbacks de página em paralelo
+                (GEG_MAX_PAGINAS_SIMULTANEAS)
+            tentativas_pagina: Tentativas por página antes de desistir (falhas
+                transitórias, com backoff exponencial e jitter)
+            cache_sessao: Cache de sessões autenticadas (padrão: cache compartilhado
+                do processo, desligado com GEG_CACHE_SESSAO=0)
+            gravador_debug: Gravador dos arquivos de debug em segundo plano
+                (padrão: gravador compartilhado do processo)
+            login_url: Página de login do portal (GEG_LOGIN_URL)
+            relatorio_url: Página do relatório (GEG_RELATORIO_URL); host, origin
+                e referer dos headers são derivados dela
+            coletor_metricas: Destino das métricas por etapa de cada execução
+                (padrão: coletor compartilhado do processo, GEG_METRICAS)
+            transporte: Pool de conexões, timeouts e codificações das
+                requisições (padrão: transporte compartilhado do processo)
+            checkpoints: Saída da última etapa concluída por credencial, para
+                retomar sem logar e baixar a grid de novo (padrão: desligado)
+            orcamento_retentativas: Orçamento de novas tentativas da execução
+                (padrão: o compartilhado do processo)
+            credencial_log: Credencial com logger próprio (AutomacaoGEG.<slug>),
+                gravado em <output_dir>/automacao.log, para credenciais em
+                paralelo não misturarem o log (padrão: o logger AutomacaoGEG)
+            execucao_metricas: Execução a que as métricas pertencem, exportadas
+                juntas (padrão: o timestamp de cada execução da automação)
         """
         self.output_dir = output_dir
-        self.session = requests.Session()
-        self.logger = self._setup_logger()
+        self.paginar = (
+            paginar if paginar is not None else os.getenv("GEG_PAGINAR", "0") == "1"
+        )
+        self.tamanho_pagina = tamanho_pagina or int(
+            os.getenv("GEG_TAMANHO_PAGINA", "500")
+        )
+        self.max_paginas_simultaneas = max(
+            1,
+            max_paginas_simultaneas
+            or int(os.getenv("GEG_MAX_PAGINAS_SIMULTANEAS", "4")),
+        )
+        self.parametro_callback_pagina = os.getenv(
+            "GEG_CALLBACK_PARAM_PAGINA", PARAMETRO_CALLBACK_PAGINA
+        )
+        self.tentativas_pagina = max(1, tentativas_pagina)
+        # Só falhas transitórias (timeout, conexão, HTTP 5xx/429) são repetidas,
+        # dentro do orçamento de novas tentativas da execução
+        self._politica_login = PoliticaRetentativa(
+            "login", base_segundos=1, orcamento=orcamento_retentativas
+        )
+        self._politica_navegacao = PoliticaRetentativa(
+            "navegacao", base_segundos=1, orcamento=orcamento_retentativas
+        )
+        self._politica_callback = PoliticaRetentativa(
+            "callback", base_segundos=1, orcamento=orcamento_retentativas
+        )
+        self._politica_pagina = PoliticaRetentativa(
+            "pagina",
+            tentativas=self.tentativas_pagina,
+            base_segundos=1,
+            orcamento=orcamento_retentativas,
+        )
+        self.cache_sessao = cache_sessao or obter_cache_sessao()
+        self.gravador_debug = gravador_debug or obter_gravador_debug()
+        self.coletor_metricas = coletor_metricas or obter_coletor_metricas()
+        self.checkpoints = checkpoints
+        self.execucao_metricas = execucao_metricas
+        self._credencial_atual: Optional[str] = None
+        # Métricas da execução em andamento (nulas fora de uma execução)
+        self.metricas = METRICAS_DESLIGADAS
+        self._cronometro_csv: Optional[Cronometro] = None
+        # Execução e credencial em andamento: pastas dos arquivos de debug
+        self._execucao_debug: Optional[str] = None
+        self._credencial_debug: Optional[str] = None
+        self._ultimo_callback_devexpress = False
+        # Resposta do último callback arquivada em debug (referência do checkpoint)
+        self._ultima_resposta_arquivada: Optional[str] = None
+        # CSV da execução em andamento, alimentado pela limpeza linha a linha
+        self._exportador_csv: Optional[ExportadorCSV] = None
+        self.estado_pagina: Optional[EstadoPagina] = None
+        # Sessão própria (cookies) sobre o pool de conexões compartilhado
+        self.transporte = transporte or obter_transporte_http()
+        self.session = self.transporte.criar_sessao()
+        self.logger = self._setup_logger(credencial_log)
 
         # URLs do sistema
-        self.login_url = "https://www.genteegestao.com.br/portal/index.aspx"
-        self.relatorio_url = "https://www.genteegestao.com.br/GEG/Paginas/Relatorios/Prontuario/SituacaoCondutorAnalitico.aspx"
+        self.login_url = login_url or os.getenv("GEG_LOGIN_URL", URL_LOGIN_PADRAO)
+        self.relatorio_url = relatorio_url or os.getenv(
+            "GEG_RELATORIO_URL", URL_RELATORIO_PADRAO
+        )
+        url_relatorio = urlsplit(self.relatorio_url)
+        self.host_portal = url_relatorio.netloc
+        self.origem_portal = f"{url_relatorio.scheme}://{url_relatorio.netloc}"
 
         # Headers padrão para simular navegador
         self.headers_navegador = {
             "accept": "*/*",
-            "accept-encoding": "gzip, deflate, br, zstd",
+            "accept-encoding": self.transporte.accept_encoding,
             "accept-language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
             "connection": "keep-alive",
             "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "host": "www.genteegestao.com.br",
-            "origin": "https://www.genteegestao.com.br",
-            "referer": "https://www.genteegestao.com.br/GEG/Paginas/Relatorios/Prontuario/SituacaoCondutorAnalitico.aspx",
+            "host": self.host_portal,
+            "origin": self.origem_portal,
+            "referer": self.relatorio_url,
             "sec-ch-ua": '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
             "sec-ch-ua-mobile": "?0",
             "sec-ch-ua-platform": '"Windows"',
@@ -64,9 +233,16 @@ class AutomacaoGEG:
         # Cria diretório de saída se não existir
         os.makedirs(self.output_dir, exist_ok=True)
 
-    def _setup_logger(self) -> logging.Logger:
+    def _setup_logger(self, credencial: Optional[str] = None) -> logging.Logger:
         """Configura o logger para a automação"""
-        logger = logging.getLogger("AutomacaoGEG")
+        if credencial:
+            # Sem pontos no slug: o logger fica direto abaixo de AutomacaoGEG e
+            # não propaga para os handlers dele (o arquivo é o do diretório próprio)
+            nome = slug_credencial(credencial).replace(".", "_")
+            logger = logging.getLogger(f"AutomacaoGEG.{nome}")
+            logger.propagate = False
+        else:
+            logger = logging.getLogger("AutomacaoGEG")
         logger.setLevel(logging.INFO)
 
         if not logger.handlers:
@@ -113,54 +289,237 @@ class AutomacaoGEG:
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.logger.info(f"=== INICIANDO AUTOMAÇÃO GEG - {timestamp} ===")
+        self._execucao_debug = timestamp
+        self._credencial_debug = email
+        self.metricas = self.coletor_metricas.iniciar(
+            email, self.execucao_metricas or timestamp
+        )
+        self.session.contadores.zerar()
+        self._credencial_atual = email
+        sucesso = False
+        retomada = None
+        html_retomado = None
 
         try:
-            # Passo 1: Login
-            self.logger.info("Passo 1: Realizando login...")
-            sucesso_login = self._realizar_login(email, senha, salvar_intermediarios)
-            if not sucesso_login:
-                return False, None, None
-
-            # Passo 2: Navegar para relatório
-            self.logger.info("Passo 2: Navegando para página de relatório...")
-            sucesso_navegacao = self._navegar_para_relatorio(salvar_intermediarios)
-            if not sucesso_navegacao:
-                return False, None, None
+            retomada = self._carregar_checkpoint(email)
+            if retomada and retomada.etapa != ETAPA_BUSCA:
+                # Extração concluída em uma tentativa anterior: nada a buscar
+                self.logger.info(
+                    f"Retomando do checkpoint '{retomada.etapa}': "
+                    f"{len(retomada.dados['colaboradores'])} colaboradores"
+                )
+                sucesso = True
+                return (
+                    True,
+                    retomada.dados["arquivo_csv"],
+                    retomada.dados["colaboradores"],
+                )
+            if retomada:
+                html_retomado = self._ler_checkpoint_busca(retomada)
+            if html_retomado is not None:
+                self.logger.info(
+                    "Retomando do checkpoint 'busca': login e download dispensados"
+                )
+            else:
+                # Passo 1: Login
+                self.logger.info("Passo 1: Realizando login...")
+                with self.metricas.medir("login"):
+                    sucesso_login = self._realizar_login(
+                        email, senha, salvar_intermediarios
+                    )
+                if not sucesso_login:
+                    return False, None, None
+
+                # Passo 2: Navegar para relatório
+                self.logger.info("Passo 2: Navegando para página de relatório...")
+                with self.metricas.medir("navegacao"):
+                    sucesso_navegacao = self._navegar_para_relatorio(
+                        salvar_intermediarios
+                    )
+                if not sucesso_navegacao:
+                    return False, None, None
 
-            # Passo 3: Extrair dados
+            # Passo 3: Extrair dados (o CSV é escrito à medida que as linhas saem)
             self.logger.info("Passo 3: Extraindo dados dos colaboradores...")
-            colaboradores = self._extrair_dados_colaboradores(salvar_intermediarios)
+            self._iniciar_exportacao_csv(timestamp)
+            colaboradores = self._extrair_dados_colaboradores(
+                salvar_intermediarios, html_retomado
+            )
             if not colaboradores:
                 self.logger.error("Nenhum colaborador encontrado")
                 return False, None, None
 
             # Passo 4: Salvar CSV
             self.logger.info("Passo 4: Salvando dados em CSV...")
-            arquivo_csv = self._salvar_csv_final(colaboradores, timestamp)
+            with self.metricas.medir("csv") as medicao:
+                arquivo_csv = self._concluir_exportacao_csv(colaboradores, timestamp)
+                medicao.linhas = len(colaboradores)
+                if arquivo_csv and self.metricas.habilitado:
+                    medicao.bytes_saida = os.path.getsize(arquivo_csv)
+
+            self._salvar_checkpoint(
+                ETAPA_EXTRACAO,
+                {"arquivo_csv": arquivo_csv, "colaboradores": colaboradores},
+            )
 
             self.logger.info(f"=== AUTOMAÇÃO CONCLUÍDA COM SUCESSO ===")
             self.logger.info(f"Colaboradores extraídos: {len(colaboradores)}")
             self.logger.info(f"Arquivo CSV: {arquivo_csv}")
 
+            sucesso = True
             return True, arquivo_csv, colaboradores
 
         except Exception as e:
             self.logger.error(f"Erro durante automação: {str(e)}", exc_info=True)
             return False, None, None
 
+        finally:
+            # Execução sem sucesso: o CSV parcial não é publicado
+            self._descartar_exportacao_csv()
+            if retomada and retomada.etapa == ETAPA_BUSCA and not sucesso:
+                # A grid arquivada não serviu: a próxima tentativa baixa de novo
+                self._remover_checkpoint()
+            self.metricas.finalizar(sucesso)
+            self.logger.info(f"Transferência HTTP: {self.session.contadores.resumo()}")
+
+    def reprocessar_arquivo(
+        self, caminho: str, timestamp: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[List[Dict]]]:
+        """Refaz a extração de uma resposta de callback salva (ver reprocessar_respostas)"""
+        return self.reprocessar_respostas([caminho], timestamp)
+
+    def reprocessar_respostas(
+        self, caminhos: Sequence[str], timestamp: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[List[Dict]]]:
+        """
+        Refaz a extração a partir de respostas de callback salvas, sem acessar
+        o portal
+
+        Aceita os arquivos de debug resposta_ajax_dados.html (comprimidos em .gz
+        ou não) ou o HTML da grid já decodificado, e segue os passos 3 e 4 da
+        execução completa: decodificação em blocos, extração, limpeza e CSV.
+        Mais de um caminho são as páginas da grid paginada, em ordem: como na
+        busca paginada, a deduplicação por CPF vale entre as páginas, e o total
+        do pager da primeira página precisa bater com a quantidade de arquivos.
+
+        Args:
+            caminhos: Arquivo da resposta ou das páginas
+            timestamp: Sufixo do CSV (padrão: data e hora atuais)
+
+        Returns:
+            Tuple com (arquivo_csv, lista_colaboradores)
+        """
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._iniciar_exportacao_csv(timestamp)
+            if len(caminhos) == 1:
+                colaboradores = self._extrair_dados_melhorado(
+                    self._ler_resposta(caminhos[0])
+                )
+            else:
+                colaboradores = []
+                cpfs_vistos: Set[str] = set()
+                for indice, caminho in enumerate(caminhos):
+                    html_pagina = self._ler_resposta(caminho)
+                    if indice == 0:
+                        match_total = PADRAO_TOTAL_PAGINAS.search(html_pagina)
+                        total_paginas = int(match_total.group(1)) if match_total else 1
+                        if total_paginas != len(caminhos):
+                            raise ValueError(
+                                f"grid com {total_paginas} página(s), "
+                                f"{len(caminhos)} arquivo(s) salvo(s)"
+                            )
+                    with self.metricas.medir("extracao") as medicao:
+                        linhas = list(self._extrair_linhas(html_pagina))
+                        medicao.linhas = len(linhas)
+                    colaboradores.extend(
+                        self._limpar_dados_colaboradores(linhas, cpfs_vistos, False)
+                    )
+
+            if not colaboradores:
+                self.logger.error(f"Nenhum colaborador encontrado em {caminhos[0]}")
+                return None, None
+
+            arquivo_csv = self._concluir_exportacao_csv(colaboradores, timestamp)
+            return arquivo_csv, colaboradores
+
+        except Exception as e:
+            self.logger.error(f"Erro ao reprocessar {caminhos[0]}: {str(e)}")
+            return None, None
+
+        finally:
+            self._descartar_exportacao_csv()
+
+    @staticmethod
+    def _ler_resposta(caminho: str) -> str:
+        """HTML decodificado de uma resposta salva (envelope DevExpress ou não)"""
+        abrir = gzip.open if caminho.endswith(".gz") else open
+        with abrir(caminho, "rt", encoding="utf-8", errors="replace") as arquivo:
+            decoder = DevExpressDecoder()
+            return "".join(
+                decoder.decodificar_stream(
+                    iter(lambda: arquivo.read(TAMANHO_BLOCO_PADRAO), "")
+                )
+            )
+
+    def _carregar_checkpoint(self, email: str) -> Optional[Checkpoint]:
+        if not self.checkpoints:
+            return None
+        try:
+            return self.checkpoints.carregar(email)
+        except Exception as e:
+            self.logger.warning(f"Checkpoint ignorado: {str(e)}")
+            return None
+
+    def _ler_checkpoint_busca(self, retomada: Checkpoint) -> Optional[str]:
+        """HTML da grid da resposta arquivada no checkpoint "busca" (None se sumiu)"""
+        try:
+            return self._ler_resposta(retomada.dados["resposta"])
+        except Exception as e:
+            self.logger.warning(f"Checkpoint 'busca' ignorado: {str(e)}")
+            return None
+
+    def _salvar_checkpoint(self, etapa: str, dados) -> None:
+        # Checkpoint é só atalho para a próxima tentativa: falha não interrompe
+        if not self.checkpoints:
+            return
+        try:
+            self.checkpoints.salvar(self._credencial_atual, etapa, dados)
+            self.logger.info(f"Checkpoint '{etapa}' salvo")
+        except Exception as e:
+            self.logger.warning(f"Erro ao salvar checkpoint '{etapa}': {str(e)}")
+
+    def _remover_checkpoint(self) -> None:
+        if not self.checkpoints:
+            return
+        try:
+            self.checkpoints.remover(self._credencial_atual)
+        except Exception as e:
+            self.logger.warning(f"Erro ao remover checkpoint: {str(e)}")
+
     def _realizar_login(
         self, email: str, senha: str, salvar_intermediario: bool = True
     ) -> bool:
         """Realiza o login no sistema"""
         try:
+            # Reaproveita a sessão em cache se o cookie de autenticação ainda vale
+            self.estado_pagina = None
+            if self._restaurar_sessao_em_cache(email, salvar_intermediario):
+                return True
+
             # Obter página de login
             self.logger.info("Obtendo página de login...")
-            response_text = LoginService.obter_pagina_login(
-                self.session, self.login_url
+            response_text = self._politica_login.executar(
+                LoginService.obter_pagina_login, self.session, self.login_url
             )
 
             if salvar_intermediario:
                 self._salvar_arquivo_debug("pagina_login.html", response_text)
+            if self.metricas.habilitado:
+                self.metricas.registrar(
+                    "login", bytes_entrada=len(response_text.encode()), chamadas=0
+                )
 
             # Capturar campos ocultos
             self.logger.info("Capturando campos ocultos...")
@@ -171,7 +530,10 @@ class AutomacaoGEG:
 
             # Realizar login
             self.logger.info("Enviando requisição de login...")
-            response = LoginService.logar(self.session, self.login_url, login_data)
+            response = self._politica_login.executar(
+                LoginService.logar, self.session, self.login_url, login_data
+            )
+            self._registrar_bytes("login", response)
 
             if salvar_intermediario:
                 self._salvar_arquivo_debug("resposta_login.html", response.text)
@@ -184,31 +546,121 @@ class AutomacaoGEG:
                 return False
 
             self.logger.info("Login realizado com sucesso")
+
+            if self.cache_sessao:
+                try:
+                    self.cache_sessao.salvar(email, self.session)
+                except Exception as e:
+                    self.logger.warning(f"Erro ao salvar sessão em cache: {str(e)}")
+
             return True
 
         except Exception as e:
             self.logger.error(f"Erro durante login: {str(e)}")
             return False
 
+    def _restaurar_sessao_em_cache(
+        self, email: str, salvar_intermediario: bool = True
+    ) -> bool:
+        """
+        Restaura a sessão em cache e confirma com um GET no relatório.
+
+        A página obtida na validação já serve como navegação para o relatório.
+        """
+        if not self.cache_sessao:
+            return False
+
+        if not self.cache_sessao.restaurar(email, self.session):
+            self.cache_sessao.registrar_falha()
+            return False
+
+        self.logger.info("Validando sessão em cache...")
+        response = self._politica_navegacao.executar(
+            self._obter_relatorio, self._headers_navegacao()
+        )
+        self._registrar_bytes("login", response)
+        if self._sessao_autenticada(response):
+            self.cache_sessao.registrar_acerto()
+            self.logger.info("Sessão em cache válida, login dispensado")
+            if salvar_intermediario:
+                self._salvar_arquivo_debug("pagina_relatorio.html", response.text)
+            self.estado_pagina = EstadoPagina.de_html(response.text, response.url)
+            return True
+
+        self.logger.info("Sessão em cache expirada, realizando login")
+        self.cache_sessao.invalidar(email)
+        self.cache_sessao.registrar_falha()
+        self.session.cookies.clear()
+        return False
+
+    def _obter_relatorio(
+        self, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """GET da página do relatório (HTTP 5xx/429 viram erro, para a política)"""
+        return levantar_status_transitorio(
+            self.session.get(self.relatorio_url, headers=headers)
+        )
+
+    def _sessao_autenticada(self, response: requests.Response) -> bool:
+        """Verifica se a resposta do relatório não foi redirecionada para o login"""
+        if response.status_code != 200:
+            return False
+        caminho_login = urlsplit(self.login_url).path.lower()
+        if urlsplit(response.url).path.lower() == caminho_login:
+            return False
+        return "ctl00$txtSenha" not in response.text
+
+    def _registrar_bytes(self, etapa: str, response: requests.Response) -> None:
+        """
+        Soma à etapa os corpos recebidos (descomprimidos) e enviados, incluindo
+        os redirecionamentos (o POST do login termina em um GET)
+        """
+        if not self.metricas.habilitado:
+            return
+        # Medição nunca interrompe a automação
+        try:
+            respostas = [*response.history, response]
+            self.metricas.registrar(
+                etapa,
+                bytes_entrada=sum(len(resposta.content) for resposta in respostas),
+                bytes_saida=sum(
+                    len(resposta.request.body or b"") for resposta in respostas
+                ),
+                chamadas=0,
+            )
+        except Exception as e:
+            self.logger.debug(f"Bytes da etapa {etapa} não medidos: {str(e)}")
+
+    def _headers_navegacao(self) -> Dict[str, str]:
+        """Headers para requisições GET de navegação"""
+        return {
+            "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+            "accept-encoding": self.transporte.accept_encoding,
+            "accept-language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+            "connection": "keep-alive",
+            "host": self.host_portal,
+            "sec-fetch-dest": "document",
+            "sec-fetch-mode": "navigate",
+            "sec-fetch-site": "same-origin",
+            "user-agent": self.headers_navegador["user-agent"],
+        }
+
     def _navegar_para_relatorio(self, salvar_intermediario: bool = True) -> bool:
         """Navega para a página de relatório e prepara dados"""
         try:
+            if self.estado_pagina and self.estado_pagina.valido:
+                self.logger.info("Página do relatório já carregada na validação")
+                return True
+
             # Headers para requisição GET
-            headers_get = {
-                "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                "accept-encoding": "gzip, deflate, br, zstd",
-                "accept-language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-                "connection": "keep-alive",
-                "host": "www.genteegestao.com.br",
-                "sec-fetch-dest": "document",
-                "sec-fetch-mode": "navigate",
-                "sec-fetch-site": "same-origin",
-                "user-agent": self.headers_navegador["user-agent"],
-            }
+            headers_get = self._headers_navegacao()
 
             # Acessar página do relatório
             self.logger.info("Acessando página do relatório...")
-            response = self.session.get(self.relatorio_url, headers=headers_get)
+            response = self._politica_navegacao.executar(
+                self._obter_relatorio, headers_get
+            )
+            self._registrar_bytes("navegacao", response)
 
             if salvar_intermediario:
                 self._salvar_arquivo_debug("pagina_relatorio.html", response.text)
@@ -219,6 +671,9 @@ class AutomacaoGEG:
                 )
                 return False
 
+            # Campos ocultos seguem direto para o payload do callback
+            self.estado_pagina = EstadoPagina.de_html(response.text, response.url)
+
             self.logger.info("Página do relatório acessada com sucesso")
             return True
 
@@ -227,45 +682,63 @@ class AutomacaoGEG:
             return False
 
     def _extrair_dados_colaboradores(
-        self, salvar_intermediario: bool = True
+        self, salvar_intermediario: bool = True, html_dados: Optional[str] = None
     ) -> Optional[List[Dict]]:
-        """Extrai os dados dos colaboradores fazendo requisição AJAX"""
-        try:
-            # Preparar payload para requisição AJAX
-            payload = self._preparar_payload_relatorio()
+        """
+        Extrai os dados dos colaboradores fazendo requisição AJAX
 
-            # Capturar campos ocultos da página atual
-            response_pagina = self.session.get(self.relatorio_url)
-            data_campos = LoginService.capturar_campos_ocultos(response_pagina.text)
+        Com `html_dados` (grid da resposta arquivada no checkpoint "busca"), só
+        refaz a extração, sem requisições ao portal.
+        """
+        try:
+            if html_dados is None:
+                # Preparar payload para requisição AJAX
+                payload = self._preparar_payload_relatorio()
+
+                # Campos ocultos da página carregada na navegação
+                estado = self.estado_pagina
+                if not (estado and estado.valido):
+                    self.logger.info(
+                        "Campos ocultos ausentes, recarregando relatório..."
+                    )
+                    response_pagina = self._politica_navegacao.executar(
+                        self._obter_relatorio
+                    )
+                    estado = EstadoPagina.de_html(
+                        response_pagina.text, response_pagina.url
+                    )
+                    self.estado_pagina = estado
 
-            # Combinar dados
-            data_final = data_campos | payload
+                # Combinar dados
+                data_final = estado.mesclar(payload)
 
-            # Headers para AJAX (sem cookie manual, usa sessão)
-            headers_ajax = self.headers_navegador.copy()
-            if "cookie" in headers_ajax:
-                del headers_ajax["cookie"]
+                # Headers para AJAX (sem cookie manual, usa sessão)
+                headers_ajax = self.headers_navegador.copy()
+                if "cookie" in headers_ajax:
+                    del headers_ajax["cookie"]
 
-            # Fazer requisição AJAX
-            self.logger.info("Enviando requisição AJAX para carregar dados...")
-            response_dados = self.session.post(
-                self.relatorio_url, headers=headers_ajax, data=data_final
-            )
+                if self.paginar:
+                    return self._extrair_dados_paginados(
+                        data_final, headers_ajax, salvar_intermediario
+                    )
 
-            if salvar_intermediario:
-                self._salvar_arquivo_debug(
-                    "resposta_ajax_dados.html", response_dados.text
+                # Fazer requisição AJAX (lida em blocos direto do stream HTTP)
+                self.logger.info("Enviando requisição AJAX para carregar dados...")
+                html_dados = self._politica_callback.executar(
+                    self._enviar_callback,
+                    data_final,
+                    headers_ajax,
+                    "resposta_ajax_dados.html" if salvar_intermediario else None,
                 )
 
-            self.logger.info(
-                f"Resposta AJAX recebida: {len(response_dados.text)} caracteres"
-            )
-
-            # Processar resposta DevExpress se necessário
-            html_dados = self._processar_resposta_devexpress(response_dados.text)
+                if self._ultima_resposta_arquivada:
+                    # Só a referência à resposta arquivada: a grid não é duplicada
+                    self._salvar_checkpoint(
+                        ETAPA_BUSCA, {"resposta": self._ultima_resposta_arquivada}
+                    )
 
-            if salvar_intermediario and html_dados != response_dados.text:
-                self._salvar_arquivo_debug("html_processado.html", html_dados)
+                if salvar_intermediario and self._ultimo_callback_devexpress:
+                    self._salvar_arquivo_debug("html_processado.html", html_dados)
 
             # Extrair dados usando método melhorado
             colaboradores = self._extrair_dados_melhorado(html_dados)
@@ -277,6 +750,184 @@ class AutomacaoGEG:
             self.logger.error(f"Erro ao extrair dados: {str(e)}")
             return None
 
+    def _enviar_callback(
+        self,
+        data: Dict[str, str],
+        headers: Dict[str, str],
+        nome_debug: Optional[str] = None,
+    ) -> str:
+        """
+        Envia o callback do relatório e devolve o HTML decodificado do stream
+
+        Com métricas, a espera pela resposta e a leitura dos blocos contam como
+        etapa "callback"; o restante (decodificação do envelope) como
+        "decodificacao".
+        """
+        medir = self.metricas.habilitado
+        if medir:
+            inicio, inicio_cpu = time.perf_counter(), time.thread_time()
+        response_dados = self.session.post(
+            self.relatorio_url, headers=headers, data=data, stream=True
+        )
+        response_dados.raise_for_status()
+
+        rede = None
+        if medir:
+            rede = Etapa()
+            rede.segundos = time.perf_counter() - inicio
+            rede.cpu_segundos = time.thread_time() - inicio_cpu
+
+        arquivo_debug = self._abrir_arquivo_debug(nome_debug) if nome_debug else None
+        try:
+            decoder = DevExpressDecoder()
+            html_dados = "".join(
+                decoder.decodificar_stream(
+                    self._iterar_resposta(response_dados, arquivo_debug, rede)
+                )
+            )
+        finally:
+            response_dados.close()
+            if arquivo_debug:
+                arquivo_debug.close()
+
+        if medir:
+            corpo_enviado = getattr(response_dados.request, "body", None) or b""
+            self.metricas.registrar(
+                "callback",
+                segundos=rede.segundos,
+                cpu_segundos=rede.cpu_segundos,
+                bytes_entrada=rede.bytes_entrada,
+                bytes_saida=len(corpo_enviado),
+            )
+            self.metricas.registrar(
+                "decodificacao",
+                segundos=time.perf_counter() - inicio - rede.segundos,
+                cpu_segundos=time.thread_time() - inicio_cpu - rede.cpu_segundos,
+                bytes_entrada=rede.bytes_entrada,
+                # Tamanho do HTML extraído (em caracteres)
+                bytes_saida=len(html_dados),
+            )
+
+        self.logger.info(
+            f"Resposta AJAX recebida: {decoder.caracteres_lidos} caracteres"
+        )
+        if decoder.envelope_encontrado:
+            self.logger.info(
+                f"HTML extraído do DevExpress: {len(html_dados)} caracteres"
+            )
+
+        self._ultimo_callback_devexpress = decoder.envelope_encontrado
+        self._ultima_resposta_arquivada = (
+            arquivo_debug.caminho
+            if arquivo_debug is not None and not arquivo_debug.falhou
+            else None
+        )
+        return html_dados
+
+    def _extrair_dados_paginados(
+        self,
+        data_base: Dict[str, str],
+        headers: Dict[str, str],
+        salvar_intermediario: bool = True,
+    ) -> Optional[List[Dict]]:
+        """
+        Busca a grid página por página pelo callback do PanelGrid.
+
+        A primeira página informa o total de páginas; as demais são buscadas em
+        paralelo (limitado por max_paginas_simultaneas) e cada uma é processada
+        assim que chega. Uma página que falha é repetida isoladamente. As páginas
+        seguem para a limpeza (e o CSV) na ordem da grid, assim que todas as
+        anteriores chegaram.
+        """
+        self.logger.info(
+            f"Buscando grid paginada ({self.tamanho_pagina} linhas por página)..."
+        )
+        linhas_por_pagina: Dict[int, List[Dict]] = {}
+        colaboradores: List[Dict] = []
+        cpfs_vistos: Set[str] = set()
+        proxima_pagina = 0
+
+        def limpar_paginas_prontas():
+            # Mantém a deduplicação determinística: sempre na ordem das páginas
+            nonlocal proxima_pagina
+            while proxima_pagina in linhas_por_pagina:
+                colaboradores.extend(
+                    self._limpar_dados_colaboradores(
+                        linhas_por_pagina.pop(proxima_pagina), cpfs_vistos, False
+                    )
+                )
+                proxima_pagina += 1
+
+        html_primeira, linhas_por_pagina[0] = self._buscar_pagina(
+            0, data_base, headers, salvar_intermediario
+        )
+        match_total = PADRAO_TOTAL_PAGINAS.search(html_primeira)
+        total_paginas = int(match_total.group(1)) if match_total else 1
+        del html_primeira
+        limpar_paginas_prontas()
+
+        self.logger.info(f"Grid com {total_paginas} página(s)")
+
+        if total_paginas > 1:
+            with ThreadPoolExecutor(
+                max_workers=self.max_paginas_simultaneas,
+                thread_name_prefix="geg-pagina",
+            ) as executor:
+                futuros = {
+                    executor.submit(
+                        self._buscar_pagina,
+                        pagina,
+                        data_base,
+                        headers,
+                        salvar_intermediario,
+                    ): pagina
+                    for pagina in range(1, total_paginas)
+                }
+                for futuro in as_completed(futuros):
+                    pagina = futuros[futuro]
+                    _, linhas_por_pagina[pagina] = futuro.result()
+                    self.logger.info(
+                        f"Página {pagina + 1}/{total_paginas} processada: "
+                        f"{len(linhas_por_pagina[pagina])} linhas"
+                    )
+                    limpar_paginas_prontas()
+
+        self.logger.info(f"Dados limpos: {len(colaboradores)} colaboradores únicos")
+        self.logger.info(f"Dados extraídos: {len(colaboradores)} colaboradores")
+        return colaboradores
+
+    def _buscar_pagina(
+        self,
+        pagina: int,
+        data_base: Dict[str, str],
+        headers: Dict[str, str],
+        salvar_intermediario: bool = True,
+    ) -> Tuple[str, List[Dict]]:
+        """Busca e extrai uma página da grid, repetindo apenas ela em caso de falha"""
+        data_pagina = data_base | {
+            "__CALLBACKPARAM": self.parametro_callback_pagina.format(
+                pagina=pagina, tamanho=self.tamanho_pagina
+            )
+        }
+        nome_debug = (
+            f"resposta_ajax_dados_p{pagina + 1:04d}.html"
+            if salvar_intermediario
+            else None
+        )
+
+        def buscar() -> Tuple[str, List[Dict]]:
+            html_pagina = self._enviar_callback(data_pagina, headers, nome_debug)
+            with self.metricas.medir("extracao") as medicao:
+                linhas = list(self._extrair_linhas(html_pagina))
+                medicao.linhas = len(linhas)
+            return html_pagina, linhas
+
+        try:
+            return self._politica_pagina.executar(buscar)
+        except Exception as e:
+            self.logger.warning(f"Falha na página {pagina + 1}: {str(e)}")
+            raise
+
     def _preparar_payload_relatorio(self) -> Dict[str, str]:
         """Prepara o payload para requisição do relatório"""
         return {
@@ -320,41 +971,70 @@ class AutomacaoGEG:
             "__CALLBACKPARAM": "c0:",
         }
 
+    def _iterar_resposta(
+        self,
+        response: requests.Response,
+        arquivo_debug: Optional[TextIO] = None,
+        rede: Optional[Etapa] = None,
+    ) -> Iterator[str]:
+        """
+        Lê a resposta HTTP em blocos de texto, copiando-os para o arquivo de debug
+
+        Com `rede`, soma nela o tempo (parede e CPU) de leitura dos blocos e os
+        bytes recebidos.
+        """
+        if response.encoding is None:
+            response.encoding = "utf-8"
+
+        if rede is None:
+            blocos = response.iter_content(
+                chunk_size=TAMANHO_BLOCO_PADRAO, decode_unicode=True
+            )
+        else:
+            blocos = self._medir_blocos(response, rede)
+
+        for bloco in blocos:
+            if arquivo_debug:
+                arquivo_debug.write(bloco)
+            yield bloco
+
+    @staticmethod
+    def _medir_blocos(response: requests.Response, rede: Etapa) -> Iterator[str]:
+        """iter_content(decode_unicode=True) cronometrado, contando os bytes"""
+        decodificador = codecs.getincrementaldecoder(response.encoding)(
+            errors="replace"
+        )
+        blocos = response.iter_content(
+            chunk_size=TAMANHO_BLOCO_PADRAO, decode_unicode=False
+        )
+        while True:
+            inicio, inicio_cpu = time.perf_counter(), time.thread_time()
+            bloco = next(blocos, None)
+            rede.segundos += time.perf_counter() - inicio
+            rede.cpu_segundos += time.thread_time() - inicio_cpu
+            if bloco is None:
+                break
+            rede.bytes_entrada += len(bloco)
+            texto = decodificador.decode(bloco)
+            if texto:
+                yield texto
+
+        texto = decodificador.decode(b"", final=True)
+        if texto:
+            yield texto
+
     def _processar_resposta_devexpress(self, response_text: str) -> str:
         """Processa resposta AJAX do DevExpress para extrair HTML"""
         try:
-            if "s/*DX*/" in response_text and "result" in response_text:
-                self.logger.info("Processando resposta DevExpress...")
-
-                # Extrai HTML da resposta AJAX
-                start_marker = "s/*DX*/"
-                start_pos = response_text.find(start_marker) + len(start_marker)
-                ajax_data = response_text[start_pos:]
-
-                # Procura pelo conteúdo HTML
-                result_start = ajax_data.find("'result':'") + 10
-                if result_start > 9:
-                    content_part = ajax_data[result_start:]
-                    result_end = content_part.find("','id':")
-                    if result_end > 0:
-                        html_result = content_part[:result_end]
-
-                        # Decodifica escapes
-                        html_result = html_result.replace("\\r\\n", "\n")
-                        html_result = html_result.replace("\\n", "\n")
-                        html_result = html_result.replace('\\"', '"')
-                        html_result = html_result.replace("\\'", "'")
-                        html_result = html_result.replace("\\/", "/")
-
-                        # Decodifica HTML entities
-                        html_result = html.unescape(html_result)
-
-                        self.logger.info(
-                            f"HTML extraído do DevExpress: {len(html_result)} caracteres"
-                        )
-                        return html_result
+            decoder = DevExpressDecoder()
+            html_result = decoder.decodificar(response_text)
 
-            return response_text
+            if html_result is not response_text:
+                self.logger.info("Processando resposta DevExpress...")
+                self.logger.info(
+                    f"HTML extraído do DevExpress: {len(html_result)} caracteres"
+                )
+            return html_result
 
         except Exception as e:
             self.logger.error(f"Erro ao processar resposta DevExpress: {str(e)}")
@@ -365,20 +1045,12 @@ class AutomacaoGEG:
         colaboradores = []
 
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # Procura pela tabela principal do DevExpress
-            tabela_principal = soup.find(
-                "table", {"id": "GridRelatorio_PanelGrid_grid_DXMainTable"}
-            )
-
-            if tabela_principal:
-                self.logger.info("Encontrou tabela DevExpress principal")
-                colaboradores = self._extrair_dados_tabela_devexpress(tabela_principal)
-            else:
-                # Estratégia alternativa: procurar por linhas de dados
-                self.logger.info("Tentando estratégia alternativa de extração...")
-                colaboradores = self._extrair_dados_alternativo(soup)
+            # No caminho rápido só localiza a tabela; as linhas são lidas (e
+            # cronometradas) durante a limpeza
+            with self.metricas.medir("extracao") as medicao:
+                colaboradores = self._extrair_linhas(html_content)
+                if isinstance(colaboradores, list):
+                    medicao.linhas = len(colaboradores)
 
             # Limpar e validar dados
             colaboradores = self._limpar_dados_colaboradores(colaboradores)
@@ -388,6 +1060,57 @@ class AutomacaoGEG:
 
         return colaboradores
 
+    def _extrair_linhas(self, html_content: str) -> Iterable[Dict]:
+        """
+        Extrai as linhas de colaboradores do HTML, sem limpeza.
+
+        A tabela principal é percorrida sob demanda (cada linha segue para a
+        limpeza assim que é lida); os caminhos com BeautifulSoup devolvem listas.
+        """
+        # Caminho rápido: extrator direcionado da tabela principal
+        extrator = ExtratorGridDevExpress()
+        corpo_tabela = extrator.localizar_tabela(html_content)
+
+        if corpo_tabela is not None:
+            self.logger.info("Encontrou tabela DevExpress principal")
+            return self._iterar_tabela_principal(extrator, corpo_tabela)
+
+        if extrator.tabela_encontrada:
+            self.logger.info(
+                "Estrutura da tabela não suportada pelo extrator rápido, "
+                "usando BeautifulSoup"
+            )
+
+        # Carregado só aqui: o caminho rápido não depende do BeautifulSoup
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html_content, "html.parser")
+
+        # Procura pela tabela principal do DevExpress
+        tabela_principal = soup.find("table", {"id": ID_TABELA_PRINCIPAL})
+
+        if tabela_principal:
+            self.logger.info("Encontrou tabela DevExpress principal")
+            return self._extrair_dados_tabela_devexpress(tabela_principal)
+
+        # Estratégia alternativa: procurar por linhas de dados
+        self.logger.info("Tentando estratégia alternativa de extração...")
+        return self._extrair_dados_alternativo(soup)
+
+    def _iterar_tabela_principal(
+        self, extrator: ExtratorGridDevExpress, corpo_tabela: str
+    ) -> Iterator[Colaborador]:
+        """Colaboradores da tabela principal, um a um, com o resumo ao final"""
+        extraidos = 0
+        for colaborador in extrator.iterar_colaboradores(corpo_tabela):
+            extraidos += 1
+            yield colaborador
+
+        self.logger.info(
+            f"Analisando {extrator.linhas_analisadas} linhas da tabela DevExpress"
+        )
+        self.logger.info(f"Extraídos {extraidos} colaboradores da tabela DevExpress")
+
     def _extrair_dados_tabela_devexpress(self, tabela) -> List[Dict]:
         """Extrai dados da tabela DevExpress com mapeamento correto das colunas baseado no HTML real"""
         colaboradores = []
@@ -396,128 +1119,21 @@ class AutomacaoGEG:
             # Encontra todas as linhas de dados (pula cabeçalhos)
             linhas_dados = tabela.find_all("tr")
 
-            # Mapeamento correto baseado na análise do HTML real
-            # CPF está na coluna 2, Nome na coluna 1, etc.
-            mapeamento_colunas = {
-                # Colaborador (baseado na análise real das colunas)
-                0: "situacao_empregado",  # Coluna 0: 'FÉRIAS' (situação empregado)
-                1: "nome",  # Coluna 1: 'ADAIL VIANA TEIXEIRA JUNIOR' (nome)
-                2: "cpf",  # Coluna 2: '086.533.907-40' (CPF)
-                3: "cargo",  # Coluna 3: 'Motorista Carreta' (cargo)
-                # Situação
-                4: "status",  # Coluna 4: 'LIBERADO' (status)
-                # CNH (baseado na posição observada)
-                7: "pontuacao",  # Coluna 7: '0' (pontuação)
-                8: "vencimento",  # Coluna 8: '06/02/2032' (vencimento)
-                # Para os campos de Gerenciamento de Fadigas e Telemetria
-                # Como a tabela tem 70 colunas, vou mapear baseado nas posições prováveis
-                # Estes índices serão ajustados conforme a estrutura real
-                34: "celular",  # Estimativa para GERENCIAMENTO DE FADIGAS/CELULAR
-                35: "alimento",  # GERENCIAMENTO DE FADIGAS/CONSUMO ALIMENTO
-                36: "fumando",  # GERENCIAMENTO DE FADIGAS/FUMANDO
-                37: "oclusao",  # GERENCIAMENTO DE FADIGAS/OCLUSÃO
-                38: "cinto",  # GERENCIAMENTO DE FADIGAS/SEM CINTO
-                # Telemetria (estimativa baseada na estrutura)
-                49: "velo1",  # TELEMETRIA/EXCESSO VELOCIDADE 1
-                50: "velo2",  # TELEMETRIA/EXCESSO VELOCIDADE 2
-                51: "velo3",  # TELEMETRIA/EXCESSO VELOCIDADE 3
-                52: "via1",  # TELEMETRIA/EXCESSO VELOCIDADE POR VIA 1
-                53: "via2",  # TELEMETRIA/EXCESSO VELOCIDADE POR VIA 2
-                54: "via3",  # TELEMETRIA/EXCESSO VELOCIDADE POR VIA 3
-                55: "forcag",  # TELEMETRIA/FORÇA G
-                56: "frenagem",  # TELEMETRIA/FRENAGEM BRUSCA
-                57: "power",  # TELEMETRIA/POWER ON
-                # Localização (última coluna disponível)
-                69: "operacao",  # Última coluna - Operação
-            }
-
             self.logger.info(
                 f"Analisando {len(linhas_dados)} linhas da tabela DevExpress"
             )
 
             for linha in linhas_dados:
                 # Pula linhas de cabeçalho (que têm ID contendo "Header")
-                linha_id = linha.get("id", "")
-                if "Header" in linha_id or "DXHeadersRow" in linha_id:
+                if linha_de_cabecalho(linha.get("id", "")):
                     continue
 
                 colunas = linha.find_all("td")
-                if len(colunas) < 5:  # Linha deve ter pelo menos as colunas básicas
-                    continue
-
-                # Verifica se é linha de dados válida procurando por CPF na coluna 2 (baseado na análise real)
-                cpf_text = ""
-                if len(colunas) > 2:
-                    cpf_text = colunas[2].get_text(strip=True)
-                    # Verifica padrão de CPF
-                    if not re.search(r"\d{3}\.\d{3}\.\d{3}-\d{2}|\b\d{11}\b", cpf_text):
-                        continue
-
-                # Extrai dados conforme mapeamento
-                colaborador = {}
-
-                for indice, campo in mapeamento_colunas.items():
-                    if indice < len(colunas):
-                        valor = colunas[indice].get_text(strip=True)
-                        # Limpa valor e define padrão
-                        if valor and valor != "&nbsp;":
-                            colaborador[campo] = valor
-                        else:
-                            colaborador[campo] = (
-                                "0"
-                                if campo
-                                not in [
-                                    "nome",
-                                    "cpf",
-                                    "cargo",
-                                    "situacao_empregado",
-                                    "status",
-                                    "operacao",
-                                    "vencimento",
-                                ]
-                                else ""
-                            )
-                    else:
-                        colaborador[campo] = (
-                            "0"
-                            if campo
-                            not in [
-                                "nome",
-                                "cpf",
-                                "cargo",
-                                "situacao_empregado",
-                                "status",
-                                "operacao",
-                                "vencimento",
-                            ]
-                            else ""
-                        )
-
-                # Validações básicas - nome e CPF devem estar presentes
-                if colaborador.get("nome") and colaborador.get("cpf"):
-                    # Formata campos numéricos
-                    for campo_numerico in [
-                        "pontuacao",
-                        "celular",
-                        "alimento",
-                        "fumando",
-                        "oclusao",
-                        "cinto",
-                        "velo1",
-                        "velo2",
-                        "velo3",
-                        "via1",
-                        "via2",
-                        "via3",
-                        "forcag",
-                        "frenagem",
-                        "power",
-                    ]:
-                        if campo_numerico in colaborador:
-                            colaborador[campo_numerico] = self._formatar_numero(
-                                colaborador[campo_numerico]
-                            )
+                colaborador = montar_colaborador(
+                    lambda indice: colunas[indice].get_text(strip=True), len(colunas)
+                )
 
+                if colaborador:
                     colaboradores.append(colaborador)
                     self.logger.debug(
                         f"Colaborador extraído: {colaborador.get('nome')} - CPF: {colaborador.get('cpf')}"
@@ -551,16 +1167,16 @@ class AutomacaoGEG:
                     texto_linha = linha.get_text()
 
                     # Verifica se a linha contém CPF
-                    cpf_match = re.search(r"(\d{3}\.\d{3}\.\d{3}-\d{2})", texto_linha)
+                    cpf_match = BUSCA_CPF.search(texto_linha)
                     if cpf_match and len(colunas) > 3:
-                        cpf = cpf_match.group(1)
+                        cpf = cpf_match.group(0)
 
                         # Extrai nome (assume que está próximo ao CPF)
                         nome = ""
                         for col in colunas:
                             texto_col = col.get_text(strip=True)
-                            if len(texto_col) > 10 and not re.match(
-                                r"[\d\.\-]", texto_col
+                            if len(texto_col) > 10 and not PADRAO_INICIO_NUMERICO.match(
+                                texto_col
                             ):
                                 nome = texto_col
                                 break
@@ -615,33 +1231,23 @@ class AutomacaoGEG:
                 if not line:
                     continue
 
-                # Procura por CPF na linha
-                cpf_match = re.search(r"(\d{3}\.\d{3}\.\d{3}-\d{2})", line)
-                if not cpf_match:
+                # CPF, status, função e situação da CNH com as regras compiladas
+                campos = REGRAS_COLABORADOR.extrair(line)
+                if not campos:
                     continue
-
-                cpf = cpf_match.group(1)
-
-                # Extrai outros dados da linha
-                status_match = re.search(
-                    r"(ATIVO|LIBERADO|BLOQUEADO|AFASTADO|FÉRIAS|INATIVO)", line
-                )
-                funcao_match = re.search(r"(Motorista\s+\w+|Manobrista)", line)
-                situacao_cnh_match = re.search(r"(LIBERADO|BLOQUEADO)", line)
+                cpf = campos["cpf"]
 
                 # Extrai nome (remove elementos conhecidos)
                 nome = self._extrair_nome_da_linha(
-                    line, cpf, status_match, funcao_match
+                    line, cpf, campos["status"], campos["funcao"]
                 )
 
                 colaborador = {
-                    "status": status_match.group(1) if status_match else "N/A",
+                    "status": campos["status"] or "N/A",
                     "nome": nome,
                     "cpf": cpf,
-                    "funcao": funcao_match.group(1) if funcao_match else "N/A",
-                    "situacao_cnh": (
-                        situacao_cnh_match.group(1) if situacao_cnh_match else "N/A"
-                    ),
+                    "funcao": campos["funcao"] or "N/A",
+                    "situacao_cnh": campos["situacao_cnh"] or "N/A",
                     "data_vencimento_cnh": "N/A",
                     "regiao": "N/A",
                     "empresa": "FADEL",
@@ -656,164 +1262,184 @@ class AutomacaoGEG:
         return colaboradores
 
     def _extrair_nome_da_linha(
-        self, linha: str, cpf: str, status_match, funcao_match
+        self, linha: str, cpf: str, status: Optional[str], funcao: Optional[str]
     ) -> str:
         """Extrai o nome do colaborador da linha"""
         try:
-            # Remove elementos conhecidos
-            linha_limpa = linha
-            linha_limpa = linha_limpa.replace(cpf, "")
-
-            if status_match:
-                linha_limpa = linha_limpa.replace(status_match.group(1), "")
-
-            if funcao_match:
-                linha_limpa = linha_limpa.replace(funcao_match.group(1), "")
-
-            # Remove padrões adicionais
-            linha_limpa = re.sub(r"(LIBERADO|BLOQUEADO)", "", linha_limpa)
-            linha_limpa = re.sub(r"\d+", "", linha_limpa)  # Remove números
-            linha_limpa = re.sub(
-                r"[^\w\s]", " ", linha_limpa
-            )  # Remove caracteres especiais
-
-            # Limpa espaços e pega palavras que parecem nome
-            palavras = linha_limpa.split()
-            nome_palavras = []
-
-            for palavra in palavras:
-                if len(palavra) > 2 and palavra.isalpha():
-                    nome_palavras.append(palavra.capitalize())
-
-            nome = " ".join(nome_palavras[:4])  # Limita a 4 palavras
+            nome = extrair_nome(linha, (cpf, status, funcao))
             return nome if nome else "NOME_NAO_IDENTIFICADO"
 
         except:
             return "ERRO_EXTRACAO_NOME"
 
-    def _limpar_dados_colaboradores(self, colaboradores: List[Dict]) -> List[Dict]:
-        """Limpa e melhora os dados dos colaboradores"""
+    def _limpar_dados_colaboradores(
+        self,
+        colaboradores: Iterable[Dict],
+        cpfs_vistos: Optional[Set[str]] = None,
+        registrar: bool = True,
+    ) -> List[Dict]:
+        """
+        Limpa e melhora os dados dos colaboradores
+
+        Consome as linhas à medida que são extraídas e repassa cada colaborador
+        único ao CSV em andamento. `cpfs_vistos` mantém a deduplicação entre
+        chamadas (páginas da grid); erros da própria extração são propagados.
+        """
+        metricas = self.metricas
+        if not metricas.habilitado:
+            return self._limpar_linhas(colaboradores, cpfs_vistos, registrar)
+
+        # Linhas de um gerador são extraídas e gravadas no CSV dentro do laço da
+        # limpeza: as duas partes são cronometradas e o resto fica com a limpeza.
+        # A CPU do bloco é dividida na proporção do tempo de parede.
+        extracao = Cronometro()
+        if not isinstance(colaboradores, list):
+            colaboradores = extracao.iterar(colaboradores)
+        csv = self._cronometro_csv = Cronometro()
+        inicio, inicio_cpu = time.perf_counter(), time.thread_time()
         try:
-            # Remove duplicatas por CPF
+            colaboradores_limpos = self._limpar_linhas(
+                colaboradores, cpfs_vistos, registrar
+            )
+        finally:
+            self._cronometro_csv = None
+            total = time.perf_counter() - inicio
+            cpu = time.thread_time() - inicio_cpu
+
+        limpeza = max(0.0, total - extracao.segundos - csv.segundos)
+        for nome, segundos, linhas, chamadas in (
+            ("extracao", extracao.segundos, extracao.itens, 0),
+            ("csv", csv.segundos, 0, 0),
+            ("limpeza", limpeza, len(colaboradores_limpos), 1),
+        ):
+            metricas.registrar(
+                nome,
+                segundos=segundos,
+                cpu_segundos=cpu * segundos / total if total else 0.0,
+                linhas=linhas,
+                chamadas=chamadas,
+            )
+        return colaboradores_limpos
+
+    def _limpar_linhas(
+        self,
+        colaboradores: Iterable[Dict],
+        cpfs_vistos: Optional[Set[str]] = None,
+        registrar: bool = True,
+    ) -> List[Dict]:
+        """Laço da limpeza (ver _limpar_dados_colaboradores)"""
+        # Remove duplicatas por CPF
+        if cpfs_vistos is None:
             cpfs_vistos = set()
-            colaboradores_limpos = []
+        colaboradores_limpos = []
+        linhas = iter(colaboradores)
 
-            for colaborador in colaboradores:
+        for colaborador in linhas:
+            try:
                 cpf = colaborador.get("cpf")
-                if cpf and cpf not in cpfs_vistos:
-                    cpfs_vistos.add(cpf)
-
-                    # Limpa nome
-                    nome = colaborador.get("nome", "")
-                    if nome:
-                        # Remove status duplicado no nome
-                        for status in [
-                            "ATIVO",
-                            "LIBERADO",
-                            "BLOQUEADO",
-                            "AFASTADO",
-                            "FÉRIAS",
-                        ]:
-                            if nome.startswith(status):
-                                nome = nome[len(status) :].strip()
-
-                        # Capitaliza corretamente
-                        nome = " ".join(word.capitalize() for word in nome.split())
-                        colaborador["nome"] = nome
-
-                    colaboradores_limpos.append(colaborador)
-
+                if not cpf or cpf in cpfs_vistos:
+                    continue
+                cpfs_vistos.add(cpf)
+
+                # Limpa nome
+                nome = colaborador.get("nome", "")
+                if nome:
+                    # Remove status duplicado no nome
+                    for status in [
+                        "ATIVO",
+                        "LIBERADO",
+                        "BLOQUEADO",
+                        "AFASTADO",
+                        "FÉRIAS",
+                    ]:
+                        if nome.startswith(status):
+                            nome = nome[len(status) :].strip()
+
+                    # Capitaliza corretamente
+                    nome = " ".join(word.capitalize() for word in nome.split())
+                    colaborador["nome"] = nome
+
+            except Exception as e:
+                self.logger.error(f"Erro ao limpar dados: {str(e)}")
+                # Segue sem limpeza; o CSV em fluxo já não corresponde à lista
+                self._descartar_exportacao_csv()
+                if isinstance(colaboradores, list):
+                    return colaboradores
+                return colaboradores_limpos + [colaborador] + list(linhas)
+
+            colaboradores_limpos.append(colaborador)
+            if self._exportador_csv is not None:
+                self._exportar_linha_csv(colaborador)
+
+        if registrar:
             self.logger.info(
                 f"Dados limpos: {len(colaboradores_limpos)} colaboradores únicos"
             )
-            return colaboradores_limpos
+        return colaboradores_limpos
 
+    def _caminho_csv(self, timestamp: str) -> str:
+        return os.path.join(self.output_dir, f"log_prontuario_{timestamp}.csv")
+
+    def _iniciar_exportacao_csv(self, timestamp: str) -> None:
+        """Abre o CSV da execução para receber as linhas durante a extração"""
+        self._descartar_exportacao_csv()
+        try:
+            self._exportador_csv = ExportadorCSV(self._caminho_csv(timestamp))
         except Exception as e:
-            self.logger.error(f"Erro ao limpar dados: {str(e)}")
-            return colaboradores
+            self.logger.warning(
+                f"CSV em fluxo indisponível, será gravado ao final: {str(e)}"
+            )
+
+    def _exportar_linha_csv(self, colaborador: Dict) -> None:
+        try:
+            if self._cronometro_csv is None:
+                self._exportador_csv.escrever(colaborador)
+            else:
+                self._cronometro_csv.chamar(self._exportador_csv.escrever, colaborador)
+        except Exception as e:
+            self.logger.warning(
+                f"Erro no CSV em fluxo, será gravado ao final: {str(e)}"
+            )
+            self._descartar_exportacao_csv()
+
+    def _concluir_exportacao_csv(
+        self, colaboradores: List[Dict], timestamp: str
+    ) -> str:
+        """
+        Publica o CSV escrito durante a extração. Se ele não corresponde à lista
+        final (fluxo interrompido ou linhas que não passaram pela limpeza), o CSV
+        é gravado de uma vez com _salvar_csv_final.
+        """
+        exportador, self._exportador_csv = self._exportador_csv, None
+        if exportador is not None and exportador.linhas == len(colaboradores):
+            try:
+                arquivo_csv = exportador.concluir()
+                self.logger.info(f"CSV salvo no formato padrão: {arquivo_csv}")
+                return arquivo_csv
+            except Exception as e:
+                self.logger.warning(f"Erro ao concluir CSV em fluxo: {str(e)}")
+
+        if exportador is not None:
+            self._exportador_csv = exportador
+            self._descartar_exportacao_csv()
+        return self._salvar_csv_final(colaboradores, timestamp)
+
+    def _descartar_exportacao_csv(self) -> None:
+        exportador, self._exportador_csv = self._exportador_csv, None
+        if exportador is not None and exportador.aberto:
+            try:
+                exportador.descartar()
+            except Exception as e:
+                self.logger.debug(f"Erro ao descartar CSV parcial: {str(e)}")
 
     def _salvar_csv_final(self, colaboradores: List[Dict], timestamp: str) -> str:
         """Salva o CSV final com os dados dos colaboradores no formato padrão do sistema"""
         try:
-            arquivo_csv = os.path.join(
-                self.output_dir, f"log_prontuario_{timestamp}.csv"
-            )
+            with ExportadorCSV(self._caminho_csv(timestamp)) as exportador:
+                exportador.escrever_todos(colaboradores)
 
-            # Colunas conforme formato do exemplo fornecido (sem id pois é gerado pelo banco)
-            fieldnames = [
-                "situacao_log_prontuarios_gente_gestao",
-                "nome_log_prontuarios_gente_gestao",
-                "cpf_log_prontuarios_gente_gestao",
-                "cargo_log_prontuarios_gente_gestao",
-                "status_log_prontuarios_gente_gestao",
-                "pontuacao_log_prontuarios_gente_gestao",
-                "vencimento_log_prontuarios_gente_gestao",
-                "celular_log_prontuarios_gente_gestao",
-                "alimento_log_prontuarios_gente_gestao",
-                "fumando_log_prontuarios_gente_gestao",
-                "oclusao_log_prontuarios_gente_gestao",
-                "cinto_log_prontuarios_gente_gestao",
-                "velo1_log_prontuarios_gente_gestao",
-                "velo2_log_prontuarios_gente_gestao",
-                "velo3_log_prontuarios_gente_gestao",
-                "via1_log_prontuarios_gente_gestao",
-                "via2_log_prontuarios_gente_gestao",
-                "via3_log_prontuarios_gente_gestao",
-                "forcag_log_prontuarios_gente_gestao",
-                "frenagem_log_prontuarios_gente_gestao",
-                "power_log_prontuarios_gente_gestao",
-                "operacao_log_prontuarios_gente_gestao",
-            ]
-
-            import csv
-
-            with open(arquivo_csv, "w", newline="", encoding="utf-8-sig") as csvfile:
-                # Escreve manualmente para corresponder exatamente ao formato do exemplo
-
-                # Cabeçalho com aspas apenas nos nomes das colunas
-                header_line = ";".join([f'"{col}"' for col in fieldnames])
-                csvfile.write(header_line + "\n")
-
-                for colaborador in colaboradores:
-                    # Valores formatados conforme exemplo (aspas apenas onde necessário)
-                    values = [
-                        colaborador.get(
-                            "situacao_empregado", "ATIVO"
-                        ),  # situacao sem aspas
-                        colaborador.get("nome", "").upper(),  # nome sem aspas
-                        f'"{self._formatar_cpf_sem_pontos(colaborador.get("cpf", ""))}"',  # cpf com aspas
-                        colaborador.get(
-                            "cargo", "Motorista Caminhão Distribuição"
-                        ),  # cargo sem aspas
-                        colaborador.get("status", "LIBERADO"),  # status sem aspas
-                        f'"{colaborador.get("pontuacao", "0")}"',  # pontuacao com aspas
-                        f'"{self._formatar_data_vencimento(colaborador.get("vencimento", ""))}"',  # vencimento com aspas
-                        f'"{colaborador.get("celular", "0")}"',  # celular com aspas
-                        self._formatar_numero(
-                            colaborador.get("alimento", "0")
-                        ),  # valores numéricos sem aspas
-                        self._formatar_numero(colaborador.get("fumando", "0")),
-                        self._formatar_numero(colaborador.get("oclusao", "0")),
-                        self._formatar_numero(colaborador.get("cinto", "0")),
-                        self._formatar_numero(colaborador.get("velo1", "0")),
-                        self._formatar_numero(colaborador.get("velo2", "0")),
-                        self._formatar_numero(colaborador.get("velo3", "0")),
-                        self._formatar_numero(colaborador.get("via1", "0")),
-                        self._formatar_numero(colaborador.get("via2", "0")),
-                        self._formatar_numero(colaborador.get("via3", "0")),
-                        self._formatar_numero(colaborador.get("forcag", "0")),
-                        self._formatar_numero(colaborador.get("frenagem", "0")),
-                        self._formatar_numero(colaborador.get("power", "0")),
-                        colaborador.get(
-                            "operacao", "CD FORTALEZA"
-                        ),  # operacao sem aspas
-                    ]
-
-                    line = ";".join(values)
-                    csvfile.write(line + "\n")
-
-            self.logger.info(f"CSV salvo no formato padrão: {arquivo_csv}")
-            return arquivo_csv
+            self.logger.info(f"CSV salvo no formato padrão: {exportador.caminho}")
+            return exportador.caminho
 
         except Exception as e:
             self.logger.error(f"Erro ao salvar CSV: {str(e)}")
@@ -821,19 +1447,11 @@ class AutomacaoGEG:
 
     def _formatar_cpf_sem_pontos(self, cpf: str) -> str:
         """Remove pontos e traços do CPF para deixar apenas números"""
-        if not cpf:
-            return ""
-        return re.sub(r"[.\-]", "", cpf)
+        return formatar_cpf_sem_pontos(cpf)
 
     def _formatar_data_vencimento(self, data: str) -> str:
         """Formata data de vencimento no padrão YYYY-MM-DD"""
-        if not data or data == "N/A":
-            # Data padrão futura (exemplo do CSV usa datas futuras)
-            return "2031-12-31"
-
-        # Aqui você pode implementar lógica para converter formatos de data
-        # Por enquanto retorna data padrão
-        return "2031-12-31"
+        return formatar_data_vencimento(data)
 
     def _formatar_pontuacao(self, colaborador: Dict) -> str:
         """Formata pontuação do colaborador (valor padrão)"""
@@ -847,22 +1465,31 @@ class AutomacaoGEG:
 
     def _formatar_numero(self, valor: str) -> str:
         """Formata valores numéricos para o padrão do CSV (ex: 0.00)"""
-        try:
-            # Converte para float e formata com 2 casas decimais
-            num = float(valor.replace(",", ".")) if valor else 0.0
-            return f"{num:.2f}"
-        except:
-            return "0.00"
+        return formatar_numero(valor)
 
     def _salvar_arquivo_debug(self, nome_arquivo: str, conteudo: str):
-        """Salva arquivo para debug"""
+        """Enfileira arquivo para debug (gravado comprimido em segundo plano)"""
         try:
-            caminho = os.path.join(self.output_dir, f"debug_{nome_arquivo}")
-            with open(caminho, "w", encoding="utf-8") as f:
-                f.write(conteudo)
+            if not self.gravador_debug.salvar(
+                nome_arquivo, conteudo, self._execucao_debug, self._credencial_debug
+            ):
+                self.logger.debug(f"Arquivo debug {nome_arquivo} descartado (carga)")
         except Exception as e:
             self.logger.error(f"Erro ao salvar arquivo debug {nome_arquivo}: {str(e)}")
 
+    def _abrir_arquivo_debug(self, nome_arquivo: str) -> Optional[TextIO]:
+        """Abre arquivo de debug para escrita incremental (comprimido direto no disco)"""
+        try:
+            arquivo = self.gravador_debug.abrir(
+                nome_arquivo, self._execucao_debug, self._credencial_debug
+            )
+            if arquivo is None:
+                self.logger.debug(f"Arquivo debug {nome_arquivo} descartado (carga)")
+            return arquivo
+        except Exception as e:
+            self.logger.error(f"Erro ao abrir arquivo debug {nome_arquivo}: {str(e)}")
+            return None
+
     def obter_estatisticas(self, colaboradores: List[Dict]) -> Dict:
         """Gera estatísticas dos dados extraídos"""
         if not colaboradores:
@@ -899,7 +1526,7 @@ class AutomacaoGEG:
 
 
 def executar_automacao_geg(
-    email: str, senha: str, output_dir: str = "output"
+    email: str, senha: str, output_dir: str = "output", **opcoes
 ) -> Tuple[bool, Optional[str], Optional[List[Dict]]]:
     """
     Função principal para executar a automação completa
@@ -908,9 +1535,10 @@ def executar_automacao_geg(
         email: Email de login
         senha: Senha de login
         output_dir: Diretório para salvar arquivos
+        **opcoes: Opções repassadas para AutomacaoGEG (ex: paginar=True)
 
     Returns:
         Tuple com (sucesso, arquivo_csv, lista_colaboradores)
     """
-    automacao = AutomacaoGEG(output_dir)
+    automacao = AutomacaoGEG(output_dir, **opcoes)
     return automacao.executar_automacao_completa(email, senha)
@@ -0,0 +1,78 @@
+"""
+Benchmark da leitura de campos ocultos do ASP.NET
+Compara o BeautifulSoup (árvore completa + find) com o extrair_campos_ocultos na
+página do relatório salva nos arquivos de debug (ou numa página sintética, sem
+--arquivo ou se o arquivo não existir) e confere que os campos são idênticos.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_campos_ocultos --arquivo ../output/debug/<execução>/<credencial>/pagina_relatorio.html.gz
+"""
+
+import argparse
+import gc
+import gzip
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.payloads import gerar_pagina_relatorio
+from utils.html_util import CAMPOS_OCULTOS_ASPNET, extrair_campos_ocultos
+
+
+def capturar_legado(response_text: str) -> dict:
+    """Cópia do LoginService.capturar_campos_ocultos original, usada como referência"""
+    data = {}
+    soup = BeautifulSoup(response_text, "html.parser")
+    for nome in CAMPOS_OCULTOS_ASPNET:
+        elemento = soup.find("input", {"name": nome})
+        if value := elemento.get("value") if elemento else None:  # type: ignore
+            data[nome] = value
+    return data
+
+
+def _medir(funcao, repeticoes: int):
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--arquivo", help="pagina_relatorio.html(.gz) salva em output/debug/"
+    )
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.arquivo and os.path.exists(args.arquivo):
+        abrir = gzip.open if args.arquivo.endswith(".gz") else open
+        with abrir(args.arquivo, "rt", encoding="utf-8") as arquivo:
+            pagina = arquivo.read()
+        origem = args.arquivo
+    else:
+        pagina = gerar_pagina_relatorio()
+        origem = "página sintética"
+
+    t_bs, campos_bs = _medir(lambda: capturar_legado(pagina), args.repeticoes)
+    t_scanner, campos_scanner = _medir(
+        lambda: extrair_campos_ocultos(pagina), args.repeticoes
+    )
+
+    if campos_bs != campos_scanner:
+        raise AssertionError("Scanner difere do caminho com BeautifulSoup")
+
+    print(f"{origem}: {len(pagina) / 1024:.0f} KB, campos {sorted(campos_scanner)}")
+    print(
+        f"BeautifulSoup {t_bs * 1000:8.2f} ms | scanner {t_scanner * 1000:8.3f} ms | "
+        f"{t_bs / t_scanner:6.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
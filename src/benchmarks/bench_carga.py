@@ -0,0 +1,182 @@
+"""
+Teste de carga ponta a ponta contra o portal falso
+Executa a automação completa (login, relatório, callback, limpeza e CSV) para
+várias credenciais ao mesmo tempo, em threads ou processos, contra o portal de
+benchmarks.portal_fake (iniciado aqui ou já rodando em --url): vazão, latência
+por credencial (p50/p95) e contadores do servidor.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_carga --credenciais 32 --simultaneas 8 --linhas 5000
+    python -m benchmarks.bench_carga --processos --paginar --latencia-ms 200
+    python -m benchmarks.bench_carga --url http://127.0.0.1:8080 --credenciais 64
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from automacao_geg import AutomacaoGEG
+from benchmarks.portal_fake import (
+    CAMINHO_ESTATISTICAS,
+    CAMINHO_LOGIN,
+    CAMINHO_RELATORIO,
+    ServidorPortalFake,
+    adicionar_argumentos,
+    configuracao_de_argumentos,
+)
+from services.debug_writer import GravadorDebug
+from services.session_cache import SessionCache
+
+
+def executar_credencial(
+    url_base: str,
+    email: str,
+    senha: str,
+    diretorio: str,
+    paginar: bool,
+    tamanho_pagina: Optional[int],
+) -> Dict:
+    """Uma execução completa da automação; saídas isoladas em `diretorio`"""
+    automacao = AutomacaoGEG(
+        diretorio,
+        paginar=paginar,
+        tamanho_pagina=tamanho_pagina,
+        cache_sessao=SessionCache(os.path.join(diretorio, "sessoes")),
+        gravador_debug=GravadorDebug(os.path.join(diretorio, "debug")),
+        login_url=url_base + CAMINHO_LOGIN,
+        relatorio_url=url_base + CAMINHO_RELATORIO,
+    )
+    automacao.logger.setLevel(logging.CRITICAL)
+
+    inicio = time.perf_counter()
+    sucesso, _, colaboradores = automacao.executar_automacao_completa(
+        email, senha, salvar_intermediarios=False
+    )
+    return {
+        "email": email,
+        "sucesso": sucesso,
+        "segundos": time.perf_counter() - inicio,
+        "linhas": len(colaboradores or []),
+    }
+
+
+def _percentil(valores: List[float], fracao: float) -> float:
+    """Percentil pelo posto mais próximo"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = max(0, math.ceil(fracao * len(ordenados)) - 1)
+    return ordenados[posicao]
+
+
+def executar_carga(
+    url_base: str,
+    credenciais: int,
+    simultaneas: int,
+    processos: bool,
+    paginar: bool,
+    tamanho_pagina: Optional[int],
+) -> Dict:
+    """Dispara as credenciais com no máximo `simultaneas` ao mesmo tempo"""
+    executor_cls = ProcessPoolExecutor if processos else ThreadPoolExecutor
+    with tempfile.TemporaryDirectory() as diretorio:
+        inicio = time.perf_counter()
+        with executor_cls(max_workers=simultaneas) as executor:
+            futuros = [
+                executor.submit(
+                    executar_credencial,
+                    url_base,
+                    f"carga{indice:04d}@teste.local",
+                    "carga",
+                    os.path.join(diretorio, f"credencial_{indice:04d}"),
+                    paginar,
+                    tamanho_pagina,
+                )
+                for indice in range(credenciais)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+        total = time.perf_counter() - inicio
+
+    tempos = [resultado["segundos"] for resultado in resultados]
+    sucessos = [resultado for resultado in resultados if resultado["sucesso"]]
+    linhas = sum(resultado["linhas"] for resultado in sucessos)
+    return {
+        "credenciais": credenciais,
+        "simultaneas": simultaneas,
+        "modo": "processos" if processos else "threads",
+        "paginar": paginar,
+        "sucessos": len(sucessos),
+        "falhas": credenciais - len(sucessos),
+        "total_s": total,
+        "credenciais_por_minuto": credenciais / total * 60,
+        "linhas_por_segundo": linhas / total,
+        "p50_s": _percentil(tempos, 0.50),
+        "p95_s": _percentil(tempos, 0.95),
+        "max_s": max(tempos, default=0.0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--url", help="Portal falso já em execução (padrão: inicia um aqui)"
+    )
+    parser.add_argument("--credenciais", type=int, default=16)
+    parser.add_argument("--simultaneas", type=int, default=os.cpu_count() or 4)
+    parser.add_argument(
+        "--processos",
+        action="store_true",
+        help="Uma credencial por processo (sem disputa pelo GIL na extração)",
+    )
+    parser.add_argument("--paginar", action="store_true")
+    parser.add_argument("--tamanho-pagina", type=int)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    servidor = None
+    url_base = args.url
+    if not url_base:
+        servidor = ServidorPortalFake(configuracao_de_argumentos(args)).iniciar()
+        url_base = servidor.url_base
+    url_base = url_base.rstrip("/")
+
+    try:
+        resultado = executar_carga(
+            url_base,
+            args.credenciais,
+            args.simultaneas,
+            args.processos,
+            args.paginar,
+            args.tamanho_pagina,
+        )
+        resultado["servidor"] = requests.get(
+            url_base + CAMINHO_ESTATISTICAS, timeout=10
+        ).json()
+    finally:
+        if servidor:
+            servidor.parar()
+
+    print(
+        f"{resultado['credenciais']} credenciais ({resultado['simultaneas']} "
+        f"simultâneas, {resultado['modo']}) | {resultado['sucessos']} ok, "
+        f"{resultado['falhas']} falhas | {resultado['total_s']:.1f} s"
+    )
+    print(
+        f"{resultado['credenciais_por_minuto']:.1f} credenciais/min | "
+        f"{resultado['linhas_por_segundo']:.0f} linhas/s | "
+        f"p50 {resultado['p50_s']:.2f} s | p95 {resultado['p95_s']:.2f} s | "
+        f"máx {resultado['max_s']:.2f} s"
+    )
+    print(json.dumps(resultado["servidor"], ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
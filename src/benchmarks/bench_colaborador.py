@@ -0,0 +1,141 @@
+"""
+Benchmark do registro tipado de colaborador
+Compara os dicionários de strings originais com o Colaborador (__slots__, números
+convertidos uma vez, categorias internadas): memória por registro e CPU do
+pipeline extração -> limpeza -> CSV -> DataFrame -> registros do banco.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_colaborador --linhas 50000
+"""
+
+import argparse
+import filecmp
+import gc
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from automacao_geg import AutomacaoGEG
+from benchmarks.payloads import gerar_html_grid
+from services import devexpress_grid
+from services.colaborador import CAMPOS_NUMERICOS
+from services.data_service import DataService
+from utils.format_util import formatar_numero
+
+
+def montar_colaborador_legado(obter_texto, total_colunas):
+    """Cópia do montar_colaborador original (dicionário de strings)"""
+    if total_colunas < 5:
+        return None
+    if not devexpress_grid.PADRAO_CPF_CELULA.search(obter_texto(2)):
+        return None
+
+    colaborador = {}
+    for indice, campo in devexpress_grid.MAPEAMENTO_COLUNAS.items():
+        valor = obter_texto(indice) if indice < total_colunas else ""
+        if valor and valor != "&nbsp;":
+            colaborador[campo] = valor
+        else:
+            colaborador[campo] = "" if campo in devexpress_grid.CAMPOS_TEXTO else "0"
+
+    if not (colaborador.get("nome") and colaborador.get("cpf")):
+        return None
+
+    for campo_numerico in CAMPOS_NUMERICOS:
+        if campo_numerico in colaborador:
+            colaborador[campo_numerico] = formatar_numero(colaborador[campo_numerico])
+
+    return colaborador
+
+
+@contextmanager
+def _representacao(legado: bool):
+    original = devexpress_grid.montar_colaborador
+    if legado:
+        devexpress_grid.montar_colaborador = montar_colaborador_legado
+    try:
+        yield
+    finally:
+        devexpress_grid.montar_colaborador = original
+
+
+def _memoria_por_registro(html_grid: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    colaboradores = devexpress_grid.ExtratorGridDevExpress().extrair(html_grid)
+    gc.collect()
+    retido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (retido - inicio) / len(colaboradores)
+
+
+def _pipeline(automacao: AutomacaoGEG, html_grid: str, nome: str) -> dict:
+    tempos = {}
+
+    def etapa(rotulo, funcao, *args):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos[rotulo] = time.perf_counter() - inicio
+        return resultado
+
+    gc.collect()
+    colaboradores = etapa(
+        "extracao", devexpress_grid.ExtratorGridDevExpress().extrair, html_grid
+    )
+    colaboradores = etapa(
+        "limpeza", automacao._limpar_dados_colaboradores, colaboradores
+    )
+    tempos["arquivo_csv"] = etapa(
+        "csv", automacao._salvar_csv_final, colaboradores, nome
+    )
+    etapa("dataframe", DataService.converter_dados_para_df, colaboradores)
+    etapa("registros", DataService.converter_dados_para_registros, colaboradores)
+    return tempos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=50000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    html_grid = gerar_html_grid(args.linhas)
+    etapas = ("extracao", "limpeza", "csv", "dataframe", "registros")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        automacao = AutomacaoGEG(diretorio)
+        automacao.logger.setLevel(logging.WARNING)
+
+        arquivos = {}
+        for nome, legado in (("legado", True), ("tipado", False)):
+            with _representacao(legado):
+                memoria = _memoria_por_registro(html_grid)
+                execucoes = [
+                    _pipeline(automacao, html_grid, f"{nome}_{repeticao}")
+                    for repeticao in range(args.repeticoes)
+                ]
+
+            melhores = {
+                etapa: min(execucao[etapa] for execucao in execucoes)
+                for etapa in etapas
+            }
+            arquivos[nome] = execucoes[-1]["arquivo_csv"]
+            detalhes = " | ".join(
+                f"{etapa} {melhores[etapa] * 1000:7.1f} ms" for etapa in etapas
+            )
+            print(
+                f"{nome:>6} | {memoria:6.0f} B/registro | "
+                f"total {sum(melhores.values()) * 1000:8.1f} ms | {detalhes}"
+            )
+
+        if not filecmp.cmp(arquivos["legado"], arquivos["tipado"], shallow=False):
+            raise AssertionError("CSV gerado com o Colaborador difere do original")
+        print(f"CSV idêntico ({os.path.getsize(arquivos['tipado'])} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark da exportação do CSV final
+Compara o caminho original (lista completa -> limpeza -> _salvar_csv_final
+montando cada linha à mão) com o CSV em fluxo, alimentado linha a linha pela
+limpeza enquanto a grid é lida: tempo, pico de memória e bytes do arquivo.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_csv --linhas 50000
+"""
+
+import argparse
+import filecmp
+import gc
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from automacao_geg import AutomacaoGEG
+from benchmarks.payloads import gerar_html_grid
+from services.csv_export import COLUNAS_CSV, ExportadorCSV
+from utils.format_util import formatar_numero
+
+
+def salvar_csv_legado(colaboradores, arquivo_csv):
+    """Cópia do laço do _salvar_csv_final original"""
+    with open(arquivo_csv, "w", newline="", encoding="utf-8-sig") as csvfile:
+        header_line = ";".join([f'"{col}"' for col in COLUNAS_CSV])
+        csvfile.write(header_line + "\n")
+        for colaborador in colaboradores:
+            values = [
+                colaborador.get("situacao_empregado", "ATIVO"),
+                colaborador.get("nome", "").upper(),
+                f'"{colaborador.get("cpf", "").replace(".", "").replace("-", "")}"',
+                colaborador.get("cargo", "Motorista Caminhão Distribuição"),
+                colaborador.get("status", "LIBERADO"),
+                f'"{colaborador.get("pontuacao", "0")}"',
+                '"2031-12-31"',
+                f'"{colaborador.get("celular", "0")}"',
+            ]
+            for campo in (
+                "alimento",
+                "fumando",
+                "oclusao",
+                "cinto",
+                "velo1",
+                "velo2",
+                "velo3",
+                "via1",
+                "via2",
+                "via3",
+                "forcag",
+                "frenagem",
+                "power",
+            ):
+                values.append(formatar_numero(colaborador.get(campo, "0")))
+            values.append(colaborador.get("operacao", "CD FORTALEZA"))
+            csvfile.write(";".join(values) + "\n")
+
+
+def exportar_legado(automacao: AutomacaoGEG, html_grid: str, arquivo_csv: str):
+    colaboradores = automacao._limpar_dados_colaboradores(
+        list(automacao._extrair_linhas(html_grid))
+    )
+    salvar_csv_legado(colaboradores, arquivo_csv)
+    return colaboradores
+
+
+def exportar_em_fluxo(automacao: AutomacaoGEG, html_grid: str, arquivo_csv: str):
+    automacao._exportador_csv = ExportadorCSV(arquivo_csv)
+    colaboradores = automacao._extrair_dados_melhorado(html_grid)
+    automacao._exportador_csv.concluir()
+    automacao._exportador_csv = None
+    return colaboradores
+
+
+def escrever_em_fluxo(colaboradores, arquivo_csv):
+    with ExportadorCSV(arquivo_csv) as exportador:
+        exportador.escrever_todos(colaboradores)
+
+
+def _tempo(funcao, *args) -> float:
+    gc.collect()
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def _pico_memoria(funcao, *args) -> int:
+    """Pico acima do início, com a lista de colaboradores ainda viva"""
+    gc.collect()
+    tracemalloc.start()
+    funcao(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=50000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    html_grid = gerar_html_grid(args.linhas)
+    mb = 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        automacao = AutomacaoGEG(diretorio)
+        automacao.logger.setLevel(logging.WARNING)
+
+        arquivos = {}
+        for nome, funcao in (
+            ("original", exportar_legado),
+            ("fluxo", exportar_em_fluxo),
+        ):
+            arquivos[nome] = os.path.join(diretorio, f"{nome}.csv")
+            tempo = min(
+                _tempo(funcao, automacao, html_grid, arquivos[nome])
+                for _ in range(args.repeticoes)
+            )
+            pico = _pico_memoria(funcao, automacao, html_grid, arquivos[nome])
+            print(
+                f"{nome:8s} | {args.linhas} linhas | extração+limpeza+CSV "
+                f"{tempo:6.3f} s | pico {pico / mb:7.1f} MB | "
+                f"CSV {os.path.getsize(arquivos[nome]) / mb:5.1f} MB"
+            )
+
+        if not filecmp.cmp(arquivos["original"], arquivos["fluxo"], shallow=False):
+            raise AssertionError("CSV em fluxo difere do original")
+
+        # Só a etapa do CSV, sobre a mesma lista já extraída e limpa
+        colaboradores = automacao._extrair_dados_melhorado(html_grid)
+        for nome, funcao in (
+            ("original", salvar_csv_legado),
+            ("fluxo", escrever_em_fluxo),
+        ):
+            arquivo = os.path.join(diretorio, f"so_csv_{nome}.csv")
+            tempo = min(
+                _tempo(funcao, colaboradores, arquivo) for _ in range(args.repeticoes)
+            )
+            pico = _pico_memoria(funcao, colaboradores, arquivo)
+            print(f"{nome:8s} | só CSV {tempo:6.3f} s | pico {pico / 1024:7.1f} KB")
+        print("CSVs idênticos byte a byte")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark da montagem do DataFrame de prontuários
+Compara o converter_dados_para_df original (colunas object + map com lambda) com
+a montagem tipada por coluna, medindo tempo e memória ocupada pelo DataFrame.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_dataframe --linhas 100000
+"""
+
+import argparse
+import gc
+import time
+
+import pandas as pd
+
+from benchmarks.payloads import gerar_html_grid
+from services.data_service import OPERACOES_MAP, DataService
+from services.devexpress_grid import ExtratorGridDevExpress
+
+
+def converter_legado(colaboradores):
+    """Cópia do converter_dados_para_df original, usada como referência"""
+    df = pd.DataFrame(colaboradores)
+    df["vencimento"] = pd.to_datetime(
+        df["vencimento"],
+        errors="coerce",
+        format="%d/%m/%Y",
+    )
+    df["data_atualizacao"] = pd.Timestamp.now()
+    df.columns = [f"{col}_log_prontuarios_gente_gestao" for col in df.columns]
+    df["id_cad_filiais"] = df["operacao_log_prontuarios_gente_gestao"].map(
+        lambda op: OPERACOES_MAP.get(op, {}).get("id_cad_filiais", 0)
+    )
+    df["id_cad_operacoes"] = df["operacao_log_prontuarios_gente_gestao"].map(
+        lambda op: OPERACOES_MAP.get(op, {}).get("id_cad_operacoes", 0)
+    )
+    return df
+
+
+def _medir(funcao, colaboradores, repeticoes: int):
+    tempos = []
+    df = None
+    for _ in range(repeticoes):
+        df = None
+        gc.collect()
+        inicio = time.perf_counter()
+        df = funcao(colaboradores)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), df.memory_usage(deep=True).sum()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    colaboradores = ExtratorGridDevExpress().extrair(gerar_html_grid(args.linhas))
+
+    mb = 1024 * 1024
+    for nome, funcao in (
+        ("legado", converter_legado),
+        ("tipado", DataService.converter_dados_para_df),
+    ):
+        tempo, memoria = _medir(funcao, colaboradores, args.repeticoes)
+        print(
+            f"{nome:>6} | {len(colaboradores)} linhas | {tempo * 1000:8.1f} ms | "
+            f"DataFrame {memoria / mb:8.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
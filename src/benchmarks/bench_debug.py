@@ -0,0 +1,111 @@
+"""
+Benchmark da gravação dos arquivos de debug
+Compara a gravação síncrona original (HTML puro no caminho das requisições) com o
+GravadorDebug: tempo que a automação fica parada por execução, tempo até a fila
+esvaziar e espaço ocupado em disco.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_debug --linhas 20000 --execucoes 5
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.payloads import (
+    gerar_html_grid,
+    gerar_pagina_relatorio,
+    gerar_resposta_callback,
+)
+from services.debug_writer import GravadorDebug
+
+
+def _artefatos(linhas: int):
+    """Os cinco arquivos de debug de uma execução, com tamanhos realistas"""
+    pagina = gerar_pagina_relatorio()
+    return [
+        ("pagina_login.html", pagina),
+        ("resposta_login.html", pagina),
+        ("pagina_relatorio.html", pagina),
+        ("resposta_ajax_dados.html", gerar_resposta_callback(linhas)),
+        ("html_processado.html", gerar_html_grid(linhas)),
+    ]
+
+
+def _tamanho_diretorio(diretorio: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(raiz, nome))
+        for raiz, _, nomes in os.walk(diretorio)
+        for nome in nomes
+    )
+
+
+def gravar_sincrono(diretorio: str, artefatos, execucoes: int) -> float:
+    """Como o _salvar_arquivo_debug original: open/write no caminho da requisição"""
+    parado = 0.0
+    for _ in range(execucoes):
+        for nome, conteudo in artefatos:
+            inicio = time.perf_counter()
+            with open(
+                os.path.join(diretorio, f"debug_{nome}"), "w", encoding="utf-8"
+            ) as arquivo:
+                arquivo.write(conteudo)
+            parado += time.perf_counter() - inicio
+    return parado
+
+
+def gravar_em_fila(gravador: GravadorDebug, artefatos, execucoes: int) -> float:
+    parado = 0.0
+    for execucao in range(execucoes):
+        for nome, conteudo in artefatos:
+            inicio = time.perf_counter()
+            gravador.salvar(nome, conteudo, f"execucao_{execucao}", "bench@geg")
+            parado += time.perf_counter() - inicio
+    return parado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=20000)
+    parser.add_argument("--execucoes", type=int, default=5)
+    args = parser.parse_args()
+
+    artefatos = _artefatos(args.linhas)
+    mb = 1024 * 1024
+    total_execucao = sum(len(conteudo) for _, conteudo in artefatos)
+    print(f"{len(artefatos)} arquivos por execução, {total_execucao / mb:.1f} MB")
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        sincrono = os.path.join(diretorio, "sincrono")
+        os.makedirs(sincrono)
+        parado = gravar_sincrono(sincrono, artefatos, args.execucoes)
+        print(
+            f"síncrono | parado {parado / args.execucoes * 1000:8.1f} ms/execução | "
+            f"disco {_tamanho_diretorio(sincrono) / mb:7.1f} MB (só a última execução)"
+        )
+
+        gravador = GravadorDebug(
+            os.path.join(diretorio, "fila"),
+            max_arquivos_fila=args.execucoes * len(artefatos),
+            max_mb_fila=args.execucoes * total_execucao / mb + 1,
+        )
+        inicio = time.perf_counter()
+        parado = gravar_em_fila(gravador, artefatos, args.execucoes)
+        gravador.aguardar()
+        drenagem = time.perf_counter() - inicio
+        estatisticas = gravador.estatisticas()
+        print(
+            f"fila     | parado {parado / args.execucoes * 1000:8.1f} ms/execução | "
+            f"disco {_tamanho_diretorio(gravador.diretorio) / mb:7.1f} MB "
+            f"({args.execucoes} execuções) | fila vazia em {drenagem:5.2f} s | "
+            f"compressão {estatisticas['bytes_originais'] / estatisticas['bytes_gravados']:4.1f}x"
+        )
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
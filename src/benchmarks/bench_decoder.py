@@ -0,0 +1,104 @@
+"""
+Micro-benchmark do decodificador de callbacks DevExpress
+Compara o processamento original (replace + html.unescape sobre o texto inteiro)
+com o DevExpressDecoder alimentado em blocos, medindo tempo e pico de memória.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_decoder --linhas 1000 10000 50000
+"""
+
+import argparse
+import codecs
+import gc
+import html
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from benchmarks.payloads import gerar_resposta_callback
+from services.devexpress_decoder import DevExpressDecoder, TAMANHO_BLOCO_PADRAO
+
+
+def decodificar_legado(response_text: str) -> str:
+    """Cópia do _processar_resposta_devexpress original, usada como referência"""
+    if "s/*DX*/" in response_text and "result" in response_text:
+        start_marker = "s/*DX*/"
+        start_pos = response_text.find(start_marker) + len(start_marker)
+        ajax_data = response_text[start_pos:]
+
+        result_start = ajax_data.find("'result':'") + 10
+        if result_start > 9:
+            content_part = ajax_data[result_start:]
+            result_end = content_part.find("','id':")
+            if result_end > 0:
+                html_result = content_part[:result_end]
+                html_result = html_result.replace("\\r\\n", "\n")
+                html_result = html_result.replace("\\n", "\n")
+                html_result = html_result.replace('\\"', '"')
+                html_result = html_result.replace("\\'", "'")
+                html_result = html_result.replace("\\/", "/")
+                return html.unescape(html_result)
+
+    return response_text
+
+
+def _blocos_http(corpo: bytes, tamanho: int = TAMANHO_BLOCO_PADRAO) -> Iterator[str]:
+    """Simula o iter_content(decode_unicode=True) de uma resposta em stream"""
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    for inicio in range(0, len(corpo), tamanho):
+        bloco = decodificador.decode(corpo[inicio : inicio + tamanho])
+        if bloco:
+            yield bloco
+
+
+def _medir(funcao: Callable[[], object], repeticoes: int):
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tempos), pico, resultado
+
+
+def executar(linhas: int, repeticoes: int) -> None:
+    texto = gerar_resposta_callback(linhas)
+    corpo = texto.encode("utf-8")
+
+    t_legado, pico_legado, html_legado = _medir(
+        lambda: decodificar_legado(corpo.decode("utf-8")), repeticoes
+    )
+    t_stream, pico_stream, html_stream = _medir(
+        lambda: "".join(DevExpressDecoder().decodificar_stream(_blocos_http(corpo))),
+        repeticoes,
+    )
+
+    if html_legado != html_stream:
+        raise AssertionError("Saída do decodificador difere do processamento original")
+
+    mb = 1024 * 1024
+    print(
+        f"{linhas:>7} linhas | resposta {len(corpo) / mb:7.2f} MB | "
+        f"legado {t_legado * 1000:8.1f} ms, pico {pico_legado / mb:7.2f} MB | "
+        f"stream {t_stream * 1000:8.1f} ms, pico {pico_stream / mb:7.2f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    for linhas in args.linhas:
+        executar(linhas, args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark do extrator rápido da grid DXMainTable
+Compara o caminho com BeautifulSoup (html.parser + find_all + get_text) com o
+ExtratorGridDevExpress e confere que os dicionários gerados são idênticos.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_grid --linhas 1000 10000 50000
+"""
+
+import argparse
+import gc
+import logging
+import time
+
+from bs4 import BeautifulSoup
+
+from automacao_geg import AutomacaoGEG
+from benchmarks.payloads import gerar_html_grid
+from services.devexpress_grid import ID_TABELA_PRINCIPAL, ExtratorGridDevExpress
+
+
+def _cronometrar(funcao):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def executar(automacao: AutomacaoGEG, linhas: int) -> None:
+    html_grid = gerar_html_grid(linhas)
+
+    def caminho_beautifulsoup():
+        soup = BeautifulSoup(html_grid, "html.parser")
+        tabela = soup.find("table", {"id": ID_TABELA_PRINCIPAL})
+        return automacao._extrair_dados_tabela_devexpress(tabela)
+
+    t_bs, colaboradores_bs = _cronometrar(caminho_beautifulsoup)
+    t_rapido, colaboradores_rapido = _cronometrar(
+        lambda: ExtratorGridDevExpress().extrair(html_grid)
+    )
+
+    if colaboradores_bs != colaboradores_rapido:
+        raise AssertionError("Extrator rápido difere do caminho com BeautifulSoup")
+
+    print(
+        f"{linhas:>7} linhas | BeautifulSoup {t_bs:8.2f} s ({linhas / t_bs:9.0f} linhas/s) | "
+        f"extrator {t_rapido:8.3f} s ({linhas / t_rapido:9.0f} linhas/s) | "
+        f"{t_bs / t_rapido:5.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--output-dir", default="output")
+    args = parser.parse_args()
+
+    automacao = AutomacaoGEG(args.output_dir)
+    automacao.logger.setLevel(logging.WARNING)
+
+    for linhas in args.linhas:
+        executar(automacao, linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark do histórico de prontuários
+Compara a busca da evolução de um CPF varrendo os CSVs de cada execução
+(log_prontuario_*.csv) com a consulta ao histórico em Parquet particionado:
+tempo da consulta, tempo de gravação e espaço em disco.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_historico --linhas 20000 --execucoes 30
+"""
+
+import argparse
+import gc
+import glob
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from benchmarks.payloads import gerar_html_grid
+from services.csv_export import ExportadorCSV
+from services.data_service import DataService
+from services.devexpress_grid import ExtratorGridDevExpress
+from services.historico_prontuarios import HistoricoProntuarios
+
+COLUNAS = ["velo1", "velo2", "velo3", "frenagem", "power"]
+
+
+def _tamanho(caminhos) -> int:
+    return sum(os.path.getsize(caminho) for caminho in caminhos)
+
+
+def consultar_csvs(diretorio: str, cpf: str) -> pd.DataFrame:
+    """Como hoje: abrir cada CSV e filtrar o CPF"""
+    cpf_sem_pontos = cpf.replace(".", "").replace("-", "")
+    partes = []
+    for arquivo in sorted(glob.glob(os.path.join(diretorio, "log_prontuario_*.csv"))):
+        df = pd.read_csv(arquivo, sep=";", dtype=str, encoding="utf-8-sig")
+        linhas = df[df["cpf_log_prontuarios_gente_gestao"] == cpf_sem_pontos]
+        partes.append(
+            linhas[[f"{campo}_log_prontuarios_gente_gestao" for campo in COLUNAS]]
+        )
+    return pd.concat(partes, ignore_index=True)
+
+
+def _medir(funcao, *args):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=20000)
+    parser.add_argument("--execucoes", type=int, default=30)
+    args = parser.parse_args()
+
+    mb = 1024 * 1024
+    with tempfile.TemporaryDirectory() as diretorio:
+        historico = HistoricoProntuarios(os.path.join(diretorio, "historico"))
+        inicio = datetime.now() - timedelta(days=args.execucoes)
+        gravacao = 0.0
+        for execucao in range(args.execucoes):
+            executado_em = inicio + timedelta(days=execucao)
+            colaboradores = ExtratorGridDevExpress().extrair(
+                gerar_html_grid(args.linhas, execucao)
+            )
+            caminho_csv = os.path.join(
+                diretorio, f"log_prontuario_{executado_em:%Y%m%d_%H%M%S}.csv"
+            )
+            with ExportadorCSV(caminho_csv) as exportador:
+                exportador.escrever_todos(colaboradores)
+
+            df = DataService.converter_dados_para_df(colaboradores, executado_em)
+            inicio_gravacao = time.perf_counter()
+            historico.gravar(df, executado_em)
+            gravacao += time.perf_counter() - inicio_gravacao
+
+        csvs = glob.glob(os.path.join(diretorio, "log_prontuario_*.csv"))
+        parquets = glob.glob(
+            os.path.join(historico.diretorio, "**", "*.parquet"), recursive=True
+        )
+        print(
+            f"{args.execucoes} execuções de {args.linhas} linhas | "
+            f"CSV {_tamanho(csvs) / mb:6.1f} MB em {len(csvs)} arquivos | "
+            f"Parquet {_tamanho(parquets) / mb:6.1f} MB em {len(parquets)} arquivos | "
+            f"gravação {gravacao / args.execucoes * 1000:6.1f} ms/execução"
+        )
+
+        cpf = "000.000.000-42"
+        t_csv, por_csv = _medir(consultar_csvs, diretorio, cpf)
+        t_hist, por_historico = _medir(
+            historico.historico_cpf, cpf, args.execucoes + 1, COLUNAS
+        )
+        if len(por_csv) != len(por_historico):
+            raise AssertionError("Histórico e CSVs devolveram quantidades diferentes")
+        print(
+            f"CPF em {len(por_csv)} execuções | "
+            f"CSVs {t_csv * 1000:8.1f} ms | histórico {t_hist * 1000:8.1f} ms"
+        )
+
+        recorte = args.execucoes // 3
+        t_recorte, ultimos = _medir(
+            historico.consultar,
+            COLUNAS,
+            [cpf],
+            (datetime.now() - timedelta(days=recorte)).date(),
+        )
+        print(
+            f"últimos {recorte} dias (partições podadas): {len(ultimos)} linhas "
+            f"em {t_recorte * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
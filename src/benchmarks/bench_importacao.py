@@ -0,0 +1,164 @@
+"""
+Benchmark do tempo de inicialização
+Para cada subcomando do cli.py, mede em processos novos (python -X importtime) o
+tempo de importação dos módulos que ele carrega, o tempo de parede do processo
+e os pacotes mais pesados. `--src` mede outra cópia da árvore (ex.: um checkout
+anterior), e `--comparar` confronta com o JSON de uma execução anterior.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_importacao --repeticoes 5 --saida base.json
+    python -m benchmarks.bench_importacao --comparar base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# Código importado por cada subcomando antes de começar a trabalhar
+ALVOS = {
+    "cli --help": "import cli",
+    "parse-file": "import cli, automacao_geg",
+    "run-once": "import cli, main",
+    "schedule": (
+        "import cli, main, apscheduler.schedulers.blocking, "
+        "apscheduler.jobstores.sqlalchemy, apscheduler.executors.pool"
+    ),
+    # Pontos de entrada antigos, para comparação com árvores sem o cli.py
+    "main (legado)": "import main",
+}
+
+
+def medir_importacao(
+    codigo: str, diretorio: str
+) -> Optional[Tuple[float, float, Dict]]:
+    """
+    (importação em s, parede do processo em s, segundos próprios por pacote) de
+    um processo novo que executa `codigo`; None se o código falhar
+    """
+    ambiente = dict(os.environ, PYTHONPATH=diretorio)
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=diretorio,
+        env=ambiente,
+        capture_output=True,
+        text=True,
+    )
+    parede = time.perf_counter() - inicio
+    if processo.returncode != 0:
+        return None
+
+    total_us = 0
+    pacotes: Dict[str, int] = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        proprio, _, nome = linha[len("import time:") :].split("|")
+        if not proprio.strip().isdigit():
+            continue  # cabeçalho
+        pacote = nome.strip().split(".")[0]
+        pacotes[pacote] = pacotes.get(pacote, 0) + int(proprio)
+        total_us += int(proprio)
+    return total_us / 1e6, parede, {p: us / 1e6 for p, us in pacotes.items()}
+
+
+def medir_alvos(diretorio: str, repeticoes: int, top: int) -> Dict[str, Dict]:
+    resultados = {}
+    for nome, codigo in ALVOS.items():
+        melhor = None
+        for _ in range(repeticoes):
+            medida = medir_importacao(codigo, diretorio)
+            if medida is None:
+                break
+            if melhor is None or medida[0] < melhor[0]:
+                melhor = medida
+        if melhor is None:
+            resultados[nome] = None
+            continue
+        importacao, parede, pacotes = melhor
+        resultados[nome] = {
+            "importacao_s": round(importacao, 4),
+            "parede_s": round(parede, 4),
+            "pacotes": dict(
+                sorted(pacotes.items(), key=lambda item: item[1], reverse=True)[:top]
+            ),
+        }
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Pacotes listados")
+    parser.add_argument(
+        "--src",
+        default=os.getcwd(),
+        help="Diretório src/ da árvore medida (padrão: o atual)",
+    )
+    parser.add_argument(
+        "--saida",
+        help="Arquivo JSON do resultado "
+        "(padrão: output/benchmarks/importacao_<data>.json)",
+    )
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    diretorio = os.path.abspath(args.src)
+    resultado = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "src": diretorio,
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "repeticoes": args.repeticoes,
+        "alvos": medir_alvos(diretorio, args.repeticoes, args.top),
+    }
+
+    for nome, medida in resultado["alvos"].items():
+        if medida is None:
+            print(f"{nome:15s} | indisponível nesta árvore")
+            continue
+        pacotes = ", ".join(
+            f"{pacote} {segundos * 1000:.0f}"
+            for pacote, segundos in medida["pacotes"].items()
+        )
+        print(
+            f"{nome:15s} | importação {medida['importacao_s'] * 1000:7.1f} ms | "
+            f"processo {medida['parede_s'] * 1000:7.1f} ms | ms por pacote: {pacotes}"
+        )
+
+    saida = args.saida or os.path.join(
+        "output", "benchmarks", f"importacao_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultado salvo em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        print(f"Comparando com {args.comparar} ({anterior.get('src')})")
+        for nome, medida in resultado["alvos"].items():
+            # Árvores sem o cli.py carregavam tudo pelo main em qualquer caso
+            base = anterior["alvos"].get(nome) or anterior["alvos"].get("main (legado)")
+            if not (medida and base):
+                continue
+            for chave, rotulo in (
+                ("importacao_s", "importação"),
+                ("parede_s", "processo"),
+            ):
+                print(
+                    f"{nome:15s} | {rotulo:10s} {base[chave] * 1000:7.1f} ms -> "
+                    f"{medida[chave] * 1000:7.1f} ms "
+                    f"({medida[chave] / base[chave] - 1:+.0%})"
+                )
+
+
+if __name__ == "__main__":
+    main()
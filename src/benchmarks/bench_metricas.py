@@ -0,0 +1,85 @@
+"""
+Benchmark do custo das métricas por etapa
+Roda extração + limpeza + CSV em fluxo sobre a mesma grid com as métricas
+desligadas e ligadas e mostra a diferença de tempo; os CSVs devem ser idênticos.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_metricas --linhas 50000
+"""
+
+import argparse
+import filecmp
+import gc
+import logging
+import os
+import tempfile
+import time
+
+from automacao_geg import AutomacaoGEG
+from benchmarks.payloads import gerar_html_grid
+from services.csv_export import ExportadorCSV
+from services.metricas import METRICAS_DESLIGADAS, MetricasExecucao
+
+
+def executar(automacao: AutomacaoGEG, html_grid: str, arquivo_csv: str):
+    """Tempo de parede e de CPU de extração + limpeza + CSV"""
+    gc.collect()
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    automacao._exportador_csv = ExportadorCSV(arquivo_csv)
+    automacao._extrair_dados_melhorado(html_grid)
+    automacao._exportador_csv.concluir()
+    automacao._exportador_csv = None
+    return time.perf_counter() - inicio, time.process_time() - inicio_cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=50000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    html_grid = gerar_html_grid(args.linhas)
+    with tempfile.TemporaryDirectory() as diretorio:
+        automacao = AutomacaoGEG(diretorio)
+        automacao.logger.setLevel(logging.WARNING)
+
+        tempos = {}
+        arquivos = {}
+        etapas = {}
+        variantes = [
+            ("desligadas", lambda: METRICAS_DESLIGADAS),
+            ("ligadas", lambda: MetricasExecucao("bench", "bench")),
+        ]
+        # Ordem alternada a cada repetição: o ruído da máquina afeta as duas
+        for repeticao in range(args.repeticoes):
+            for nome, criar_metricas in variantes[:: 1 if repeticao % 2 else -1]:
+                automacao.metricas = criar_metricas()
+                arquivos[nome] = os.path.join(diretorio, f"{nome}.csv")
+                tempo = executar(automacao, html_grid, arquivos[nome])
+                anterior = tempos.get(nome, tempo)
+                tempos[nome] = (min(anterior[0], tempo[0]), min(anterior[1], tempo[1]))
+                if nome == "ligadas":
+                    etapas = automacao.metricas.etapas
+
+        if not filecmp.cmp(arquivos["desligadas"], arquivos["ligadas"], shallow=False):
+            raise AssertionError("CSV difere com as métricas ligadas")
+
+        for nome, (tempo, cpu) in tempos.items():
+            print(
+                f"métricas {nome:10s} | {args.linhas} linhas | {tempo:6.3f} s | "
+                f"CPU {cpu:6.3f} s"
+            )
+        # A CPU é a medida mais estável em máquinas compartilhadas
+        for indice, rotulo in ((0, "tempo"), (1, "CPU")):
+            custo = tempos["ligadas"][indice] / tempos["desligadas"][indice] - 1
+            print(f"custo das métricas ligadas ({rotulo}): {custo:+.1%}")
+        print("Etapas medidas (última repetição):")
+        for nome, etapa in etapas.items():
+            print(
+                f"  {nome:10s} {etapa.segundos * 1000:8.1f} ms | "
+                f"CPU {etapa.cpu_segundos * 1000:8.1f} ms | {etapa.linhas} linhas"
+            )
+
+
+if __name__ == "__main__":
+    main()
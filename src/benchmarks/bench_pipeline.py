@@ -0,0 +1,258 @@
+"""
+Suíte de benchmark do pipeline de extração
+Para cada tamanho de grid (callbacks DXMainTable sintéticos de 70 colunas),
+mede tempo e pico de memória de cada etapa: decodificação do callback,
+extração, limpeza, CSV final, DataFrame e gravação no banco (SQLite). O
+resultado vai para um JSON que pode ser comparado com o de outra versão.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_pipeline --linhas 100 1000 10000 100000
+    python -m benchmarks.bench_pipeline --comparar output/benchmarks/anterior.json
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+
+from automacao_geg import AutomacaoGEG
+from benchmarks.payloads import TOTAL_COLUNAS, gerar_resposta_callback
+from repositories.bulk_upsert import BulkUpsert
+from services.data_service import SUFIXO_COLUNAS, DataService
+
+TABELA = "log_prontuarios_gente_gestao"
+CHAVE = f"cpf{SUFIXO_COLUNAS}"
+
+# Variação acima desta fração (tempo ou memória) é apontada como regressão
+LIMITE_REGRESSAO = 0.20
+
+# Diferenças de tempo menores que isto são ruído de medição, não regressão
+DIFERENCA_MINIMA_S = 0.005
+
+
+class Contexto:
+    """Entradas e saídas das etapas de um tamanho de grid"""
+
+    def __init__(self, automacao: AutomacaoGEG, diretorio: str, resposta: str):
+        self.automacao = automacao
+        self.diretorio = diretorio
+        self.resposta = resposta
+        self.html = ""
+        self.linhas: List = []
+        self.colaboradores: List = []
+
+
+def _gravar_banco(contexto: Contexto) -> int:
+    """converter_dados_para_registros + upsert em um SQLite novo"""
+    registros = DataService.converter_dados_para_registros(contexto.colaboradores)
+    caminho = os.path.join(contexto.diretorio, "pipeline.sqlite3")
+    engine = create_engine(f"sqlite:///{caminho}")
+    definicoes = ", ".join(
+        f"{coluna} TEXT PRIMARY KEY" if coluna == CHAVE else coluna
+        for coluna in registros[0]
+    )
+    with engine.begin() as conexao:
+        conexao.execute(text(f"DROP TABLE IF EXISTS {TABELA}"))
+        conexao.execute(text(f"CREATE TABLE {TABELA} ({definicoes})"))
+        BulkUpsert(TABELA, [CHAVE]).executar(conexao, registros)
+    engine.dispose()
+    return len(registros)
+
+
+def _etapa_decodificar(contexto: Contexto) -> int:
+    contexto.html = contexto.automacao._processar_resposta_devexpress(contexto.resposta)
+    return len(contexto.html)
+
+
+def _etapa_extrair(contexto: Contexto) -> int:
+    # Extração + limpeza, como no fluxo da automação
+    contexto.colaboradores = contexto.automacao._extrair_dados_melhorado(contexto.html)
+    return len(contexto.colaboradores)
+
+
+def _etapa_limpar(contexto: Contexto) -> int:
+    if not contexto.linhas:
+        contexto.linhas = list(contexto.automacao._extrair_linhas(contexto.html))
+    return len(contexto.automacao._limpar_dados_colaboradores(contexto.linhas))
+
+
+def _etapa_csv(contexto: Contexto) -> int:
+    arquivo = contexto.automacao._salvar_csv_final(contexto.colaboradores, "bench")
+    return os.path.getsize(arquivo)
+
+
+def _etapa_dataframe(contexto: Contexto) -> int:
+    return len(DataService.converter_dados_para_df(contexto.colaboradores))
+
+
+# (nome, função): a função devolve o tamanho da saída (linhas ou bytes)
+ETAPAS: Tuple[Tuple[str, Callable[[Contexto], int]], ...] = (
+    ("processar_resposta_devexpress", _etapa_decodificar),
+    ("extrair_dados_melhorado", _etapa_extrair),
+    ("limpar_dados_colaboradores", _etapa_limpar),
+    ("salvar_csv_final", _etapa_csv),
+    ("converter_dados_para_df", _etapa_dataframe),
+    ("gravar_banco_sqlite", _gravar_banco),
+)
+
+
+def medir_tamanho(linhas: int, repeticoes: int, diretorio: str) -> Dict:
+    """Tempo (melhor de N) e pico de memória de cada etapa para uma grid"""
+    automacao = AutomacaoGEG(diretorio)
+    automacao.logger.setLevel(logging.WARNING)
+    resposta = gerar_resposta_callback(linhas)
+    contexto = Contexto(automacao, diretorio, resposta)
+
+    etapas = {}
+    for nome, funcao in ETAPAS:
+        tempos = []
+        for _ in range(repeticoes):
+            gc.collect()
+            inicio = time.perf_counter()
+            saida = funcao(contexto)
+            tempos.append(time.perf_counter() - inicio)
+
+        # Memória numa passada à parte: o tracemalloc deixa o código mais lento
+        gc.collect()
+        tracemalloc.start()
+        funcao(contexto)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        etapas[nome] = {
+            "tempo_s": min(tempos),
+            "tempos_s": tempos,
+            "pico_memoria_bytes": pico,
+            "saida": saida,
+        }
+
+    return {
+        "linhas": linhas,
+        "bytes_resposta": len(resposta.encode("utf-8")),
+        "etapas": etapas,
+    }
+
+
+def _commit_atual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(
+    anterior: Dict, atual: Dict, limite: float = LIMITE_REGRESSAO
+) -> List[str]:
+    """Etapas que pioraram mais que `limite` em tempo ou memória"""
+    regressoes = []
+    tamanhos_anteriores = {
+        resultado["linhas"]: resultado for resultado in anterior["resultados"]
+    }
+    for resultado in atual["resultados"]:
+        base = tamanhos_anteriores.get(resultado["linhas"])
+        if base is None:
+            continue
+        for nome, medida in resultado["etapas"].items():
+            medida_base = base["etapas"].get(nome)
+            if medida_base is None:
+                continue
+            for chave, rotulo in (
+                ("tempo_s", "tempo"),
+                ("pico_memoria_bytes", "memória"),
+            ):
+                if not medida_base[chave]:
+                    continue
+                variacao = medida[chave] / medida_base[chave] - 1
+                ruido = (
+                    chave == "tempo_s"
+                    and medida[chave] - medida_base[chave] < DIFERENCA_MINIMA_S
+                )
+                marcador = ""
+                if variacao > limite and not ruido:
+                    marcador = "  <-- regressão"
+                    regressoes.append(f"{resultado['linhas']} linhas {nome} {rotulo}")
+                print(
+                    f"{resultado['linhas']:>7} | {nome:30s} | {rotulo:7s} "
+                    f"{variacao:+7.1%}{marcador}"
+                )
+    return regressoes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--linhas", type=int, nargs="+", default=[100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument(
+        "--saida",
+        help="Arquivo JSON do resultado "
+        "(padrão: output/benchmarks/pipeline_<data>.json)",
+    )
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument(
+        "--limite",
+        type=float,
+        default=LIMITE_REGRESSAO,
+        help="Piora (fração) a partir da qual a etapa é uma regressão",
+    )
+    args = parser.parse_args()
+
+    resultado = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_atual(),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "colunas_grid": TOTAL_COLUNAS,
+        "repeticoes": args.repeticoes,
+        "resultados": [],
+    }
+
+    for linhas in args.linhas:
+        with tempfile.TemporaryDirectory() as diretorio:
+            medida = medir_tamanho(linhas, args.repeticoes, diretorio)
+        resultado["resultados"].append(medida)
+        for nome, etapa in medida["etapas"].items():
+            print(
+                f"{linhas:>7} linhas | {nome:30s} | {etapa['tempo_s'] * 1000:10.1f} ms"
+                f" | pico {etapa['pico_memoria_bytes'] / 1024 / 1024:8.1f} MB"
+            )
+
+    saida = args.saida or os.path.join(
+        "output",
+        "benchmarks",
+        f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json",
+    )
+    os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultado salvo em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        print(f"Comparando com {args.comparar} (commit {anterior.get('commit')})")
+        regressoes = comparar(anterior, resultado, args.limite)
+        if regressoes:
+            print(f"{len(regressoes)} regressão(ões) acima de {args.limite:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
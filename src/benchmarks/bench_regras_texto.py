@@ -0,0 +1,237 @@
+"""
+Benchmark do motor de regras dos extratores alternativos
+Compara as buscas re.search/re.sub originais, linha a linha, com o scanner
+combinado de regras_texto sobre um texto corrido sintético, e confere que os
+colaboradores extraídos são idênticos. Mede também o MotorRegras.extrair contra
+uma única alternância de grupos nomeados percorrida com finditer, a forma que o
+motor não usa por ser mais lenta.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_regras_texto --linhas 100000
+"""
+
+import argparse
+import gc
+import logging
+import re
+import time
+
+from automacao_geg import AutomacaoGEG
+from benchmarks.payloads import gerar_texto_relatorio
+from services.data_service import DataService
+from services.regras_texto import REGRAS_COLABORADOR, MotorRegras
+
+
+def nome_legado(linha, cpf, status_match, funcao_match):
+    """Cópia do _extrair_nome_da_linha original"""
+    linha_limpa = linha.replace(cpf, "")
+    if status_match:
+        linha_limpa = linha_limpa.replace(status_match.group(1), "")
+    if funcao_match:
+        linha_limpa = linha_limpa.replace(funcao_match.group(1), "")
+    linha_limpa = re.sub(r"(LIBERADO|BLOQUEADO)", "", linha_limpa)
+    linha_limpa = re.sub(r"\d+", "", linha_limpa)
+    linha_limpa = re.sub(r"[^\w\s]", " ", linha_limpa)
+    nome_palavras = [
+        palavra.capitalize()
+        for palavra in linha_limpa.split()
+        if len(palavra) > 2 and palavra.isalpha()
+    ]
+    return " ".join(nome_palavras[:4]) or "NOME_NAO_IDENTIFICADO"
+
+
+def processar_texto_legado(texto):
+    """Cópia do _processar_dados_texto original"""
+    colaboradores = []
+    for line in texto.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        cpf_match = re.search(r"(\d{3}\.\d{3}\.\d{3}-\d{2})", line)
+        if not cpf_match:
+            continue
+        cpf = cpf_match.group(1)
+        status_match = re.search(
+            r"(ATIVO|LIBERADO|BLOQUEADO|AFASTADO|FÉRIAS|INATIVO)", line
+        )
+        funcao_match = re.search(r"(Motorista\s+\w+|Manobrista)", line)
+        situacao_cnh_match = re.search(r"(LIBERADO|BLOQUEADO)", line)
+        colaboradores.append(
+            {
+                "status": status_match.group(1) if status_match else "N/A",
+                "nome": nome_legado(line, cpf, status_match, funcao_match),
+                "cpf": cpf,
+                "funcao": funcao_match.group(1) if funcao_match else "N/A",
+                "situacao_cnh": (
+                    situacao_cnh_match.group(1) if situacao_cnh_match else "N/A"
+                ),
+                "data_vencimento_cnh": "N/A",
+                "regiao": "N/A",
+                "empresa": "FADEL",
+                "linha_original": line,
+            }
+        )
+    return colaboradores
+
+
+def extrair_linha_legado(linha_elemento):
+    """Cópia do DataService._extrair_dados_linha original"""
+    texto_linha = linha_elemento.get_text(separator=" ", strip=True)
+    cpf_match = re.search(r"(\d{3}\.\d{3}\.\d{3}-\d{2})", texto_linha)
+    status_match = re.search(
+        r"(ATIVO|INATIVO|LIBERADO|BLOQUEADO|AFASTADO|FÉRIAS)", texto_linha
+    )
+    categoria_match = re.search(r"(Manobrista|Motorista\s+\w+)", texto_linha)
+    if not cpf_match:
+        return None
+    colaborador = {
+        "linha_completa": texto_linha,
+        "cpf": cpf_match.group(1),
+        "status": status_match.group(1) if status_match else None,
+        "categoria": categoria_match.group(1) if categoria_match else None,
+    }
+    colaborador["nome"] = DataService._extrair_nome(texto_linha.split(), colaborador)
+    return colaborador
+
+
+def alternancia_unica(motor: MotorRegras):
+    """
+    MotorRegras.extrair com uma só expressão para as regras sem origem:
+    lookaheads com grupos nomeados (campos sobrepostos não se escondem) e, na
+    mesma posição, os campos seguintes conferidos com match
+    """
+    raizes = [regra for regra in motor.regras if not regra.origem]
+    buscar = re.compile(
+        "|".join(f"(?=(?P<{regra.campo}>{regra.padrao}))" for regra in raizes)
+    ).finditer
+    seguintes = {
+        regra.campo: [(s.campo, re.compile(s.padrao).match) for s in raizes[i + 1 :]]
+        for i, regra in enumerate(raizes)
+    }
+    obrigatorias = {regra.campo for regra in raizes if regra.obrigatoria}
+    derivadas = [
+        (regra, re.compile(regra.padrao).search)
+        for regra in motor.regras
+        if regra.origem
+    ]
+
+    def extrair(linha):
+        encontrados, posicoes = {}, {}
+        for match in buscar(linha):
+            campo, inicio = match.lastgroup, match.start()
+            if campo not in posicoes:
+                encontrados[campo], posicoes[campo] = match.group(campo), inicio
+            for seguinte, casar in seguintes[campo]:
+                if seguinte not in posicoes:
+                    outro = casar(linha, inicio)
+                    if outro is not None:
+                        encontrados[seguinte], posicoes[seguinte] = (
+                            outro.group(),
+                            inicio,
+                        )
+            if len(posicoes) == len(raizes):
+                break
+        if not obrigatorias <= posicoes.keys():
+            return None
+        resultado = {regra.campo: encontrados.get(regra.campo) for regra in raizes}
+        for regra, procurar in derivadas:
+            inicio = posicoes.get(regra.origem)
+            if inicio is None:
+                resultado[regra.campo] = None
+            elif resultado[regra.origem] in regra.valores:
+                resultado[regra.campo] = resultado[regra.origem]
+                posicoes[regra.campo] = inicio
+            else:
+                match = procurar(linha, inicio + 1)
+                if match is None and regra.obrigatoria:
+                    return None
+                resultado[regra.campo] = match.group() if match else None
+                if match:
+                    posicoes[regra.campo] = match.start()
+        return {campo: resultado[campo] for campo in motor.campos}
+
+    return extrair
+
+
+class _Linha:
+    """Elemento mínimo com get_text, como as linhas que o DataService recebe"""
+
+    def __init__(self, texto):
+        self.texto = texto
+
+    def get_text(self, separator="", strip=False):
+        return self.texto
+
+
+def _cronometrar(funcao, repeticoes):
+    melhor, resultado = None, None
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempo = time.perf_counter() - inicio
+        melhor = tempo if melhor is None else min(melhor, tempo)
+    return melhor, resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--output-dir", default="output")
+    args = parser.parse_args()
+
+    texto = gerar_texto_relatorio(args.linhas)
+    automacao = AutomacaoGEG(args.output_dir)
+    automacao.logger.setLevel(logging.WARNING)
+
+    t_legado, legado = _cronometrar(
+        lambda: processar_texto_legado(texto), args.repeticoes
+    )
+    t_motor, motor = _cronometrar(
+        lambda: automacao._processar_dados_texto(texto), args.repeticoes
+    )
+    if legado != motor:
+        raise AssertionError("_processar_dados_texto difere da versão original")
+    print(
+        f"_processar_dados_texto | {len(motor)} colaboradores | "
+        f"original {t_legado:6.3f} s | motor {t_motor:6.3f} s | "
+        f"{t_legado / t_motor:4.1f}x"
+    )
+
+    linhas = [_Linha(linha) for linha in texto.split("\n")]
+    t_legado, legado = _cronometrar(
+        lambda: [extrair_linha_legado(linha) for linha in linhas], args.repeticoes
+    )
+    t_motor, motor = _cronometrar(
+        lambda: [DataService._extrair_dados_linha(linha) for linha in linhas],
+        args.repeticoes,
+    )
+    if legado != motor:
+        raise AssertionError("_extrair_dados_linha difere da versão original")
+    print(
+        f"_extrair_dados_linha   | {len(linhas)} linhas | "
+        f"original {t_legado:6.3f} s | motor {t_motor:6.3f} s | "
+        f"{t_legado / t_motor:4.1f}x"
+    )
+
+    textos = [linha.texto for linha in linhas]
+    alternancia = alternancia_unica(REGRAS_COLABORADOR)
+    t_motor, motor = _cronometrar(
+        lambda: [REGRAS_COLABORADOR.extrair(texto) for texto in textos],
+        args.repeticoes,
+    )
+    t_alternancia, resultado = _cronometrar(
+        lambda: [alternancia(texto) for texto in textos], args.repeticoes
+    )
+    if motor != resultado:
+        raise AssertionError("A alternância única difere do MotorRegras")
+    print(
+        f"MotorRegras.extrair    | {len(textos)} linhas | "
+        f"buscas {t_motor:6.3f} s | alternância {t_alternancia:6.3f} s | "
+        f"{t_alternancia / t_motor:4.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark do reprocessamento offline de respostas arquivadas
+Grava N respostas de callback sintéticas no formato do output/debug/
+(<execução>/<credencial>/resposta_ajax_dados.html.gz) e as reprocessa com 1 e
+com vários processos, mostrando linhas por segundo; os CSVs das variantes devem
+ser idênticos.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_reprocessamento --respostas 16 --linhas 5000 --workers 1 4
+"""
+
+import argparse
+import filecmp
+import gzip
+import os
+import tempfile
+from typing import Dict
+
+from benchmarks.payloads import gerar_resposta_callback
+from services.reprocessamento import Reprocessamento, localizar_respostas
+
+
+def gravar_arquivo(diretorio: str, respostas: int, linhas: int) -> None:
+    """Arquivo de debug sintético: uma execução por resposta, grids diferentes"""
+    for indice in range(respostas):
+        pasta = os.path.join(
+            diretorio, f"20250101_{indice // 60:04d}{indice % 60:02d}", "bench_x.com"
+        )
+        os.makedirs(pasta, exist_ok=True)
+        caminho = os.path.join(pasta, "resposta_ajax_dados.html.gz")
+        with gzip.open(caminho, "wt", encoding="utf-8", compresslevel=6) as arquivo:
+            arquivo.write(gerar_resposta_callback(linhas, semente=indice))
+
+
+def listar_csvs(diretorio: str) -> Dict[str, str]:
+    """CSVs gerados, pelo caminho relativo ao diretório de saída"""
+    return {
+        os.path.relpath(os.path.join(raiz, nome), diretorio): os.path.join(raiz, nome)
+        for raiz, _, nomes in os.walk(diretorio)
+        for nome in nomes
+        if nome.endswith(".csv")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--respostas", type=int, default=16)
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        origem = os.path.join(diretorio, "debug")
+        gravar_arquivo(origem, args.respostas, args.linhas)
+        respostas, _ = localizar_respostas(origem)
+
+        saidas = {}
+        for workers in args.workers:
+            saidas[workers] = os.path.join(diretorio, f"workers_{workers}")
+            resumo = Reprocessamento(saidas[workers], workers).executar(respostas)
+            if resumo["falhas"]:
+                raise AssertionError(f"Respostas com falha: {resumo['falhas']}")
+            print(
+                f"{resumo['workers']:3d} processo(s) | {resumo['respostas']} respostas"
+                f" | {resumo['linhas']} linhas | {resumo['segundos']:7.2f} s | "
+                f"{resumo['linhas_por_segundo']:10,.0f} linhas/s"
+            )
+
+        referencia = listar_csvs(saidas[args.workers[0]])
+        for workers, saida in saidas.items():
+            csvs = listar_csvs(saida)
+            if csvs.keys() != referencia.keys() or not all(
+                filecmp.cmp(referencia[nome], caminho, shallow=False)
+                for nome, caminho in csvs.items()
+            ):
+                raise AssertionError(f"CSV difere com {workers} processo(s)")
+        print("CSVs idênticos entre as variantes")
+
+
+if __name__ == "__main__":
+    main()
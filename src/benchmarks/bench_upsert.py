@@ -0,0 +1,87 @@
+"""
+Benchmark do upsert em lotes da log_prontuarios_gente_gestao
+Grava registros sintéticos em um SQLite (ON CONFLICT DO UPDATE) com diferentes
+tamanhos de lote, numa passada de inserção e outra de atualização.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_upsert --linhas 10000 --lotes 1 100 1000 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.payloads import gerar_html_grid
+from repositories.bulk_upsert import BulkUpsert
+from services.data_service import SUFIXO_COLUNAS, DataService
+from services.devexpress_grid import ExtratorGridDevExpress
+
+TABELA = "log_prontuarios_gente_gestao"
+CHAVE = f"cpf{SUFIXO_COLUNAS}"
+
+
+def _criar_tabela(engine, colunas) -> None:
+    definicoes = ", ".join(
+        f"{coluna} TEXT PRIMARY KEY" if coluna == CHAVE else f"{coluna}"
+        for coluna in colunas
+    )
+    with engine.begin() as conexao:
+        conexao.execute(text(f"DROP TABLE IF EXISTS {TABELA}"))
+        conexao.execute(text(f"CREATE TABLE {TABELA} ({definicoes})"))
+
+
+def executar(registros, tamanho_lote: int, diretorio: str) -> None:
+    engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.sqlite3')}")
+    _criar_tabela(engine, registros[0].keys())
+
+    tempos = []
+    upsert = BulkUpsert(TABELA, [CHAVE], tamanho_lote=tamanho_lote)
+    for passada in ("inserção", "atualização"):
+        if passada == "atualização":
+            for registro in registros:
+                registro[f"status{SUFIXO_COLUNAS}"] = "BLOQUEADO"
+        inicio = time.perf_counter()
+        with engine.begin() as conexao:
+            upsert.executar(conexao, registros)
+        tempos.append(time.perf_counter() - inicio)
+
+    with engine.connect() as conexao:
+        total = conexao.execute(text(f"SELECT COUNT(*) FROM {TABELA}")).scalar()
+        bloqueados = conexao.execute(
+            text(
+                f"SELECT COUNT(*) FROM {TABELA} "
+                f"WHERE status{SUFIXO_COLUNAS} = 'BLOQUEADO'"
+            )
+        ).scalar()
+    engine.dispose()
+
+    if total != len(registros) or bloqueados != len(registros):
+        raise AssertionError("Upsert não gravou/atualizou todas as linhas")
+
+    print(
+        f"lote {tamanho_lote:>5} | {upsert.lotes:>6} execuções | "
+        f"inserção {tempos[0]:6.2f} s ({len(registros) / tempos[0]:8.0f} linhas/s) | "
+        f"atualização {tempos[1]:6.2f} s ({len(registros) / tempos[1]:8.0f} linhas/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    colaboradores = ExtratorGridDevExpress().extrair(gerar_html_grid(args.linhas))
+    print(f"{len(colaboradores)} registros")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for tamanho_lote in args.lotes:
+            registros = DataService.converter_dados_para_registros(colaboradores)
+            executar(registros, tamanho_lote, diretorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Geração de respostas sintéticas do portal Gente e Gestão para benchmarks
+Monta a grid DXMainTable de 70 colunas, o envelope de callback do DevExpress e o
+texto corrido usado pelos extratores alternativos
+"""
+
+import random
+from typing import List
+
+ID_TABELA = "GridRelatorio_PanelGrid_grid_DXMainTable"
+TOTAL_COLUNAS = 70
+
+_SITUACOES = ["ATIVO", "FÉRIAS", "AFASTADO", "ATIVO", "ATIVO"]
+_STATUS = ["LIBERADO", "LIBERADO", "BLOQUEADO"]
+_CARGOS = ["Motorista Carreta", "Motorista Caminhão Distribuição", "Manobrista"]
+_OPERACOES = ["NOVA RIO", "NOVA MINAS", "CD FORTALEZA"]
+_NOMES = ["ADAIL", "MARIA", "JOSÉ", "ANA", "CARLOS", "JOÃO", "PAULA", "LUÍS"]
+_SOBRENOMES = ["VIANA", "TEIXEIRA", "SILVA", "SOUZA", "D'ÁVILA", "CONCEIÇÃO"]
+
+
+def _cpf(indice: int) -> str:
+    digitos = f"{indice:011d}"
+    return f"{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}"
+
+
+def _valores_linha(indice: int, rnd: random.Random) -> List[str]:
+    valores = ["&nbsp;"] * TOTAL_COLUNAS
+    valores[0] = rnd.choice(_SITUACOES)
+    valores[1] = " ".join(
+        [rnd.choice(_NOMES), rnd.choice(_SOBRENOMES), rnd.choice(_SOBRENOMES)]
+    )
+    valores[2] = _cpf(indice)
+    valores[3] = rnd.choice(_CARGOS)
+    valores[4] = rnd.choice(_STATUS)
+    valores[7] = str(rnd.randint(0, 20))
+    valores[8] = (
+        f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(2025, 2034)}"
+    )
+    for coluna in list(range(34, 39)) + list(range(49, 58)):
+        if rnd.random() < 0.6:
+            valores[coluna] = f"{rnd.randint(0, 40)},{rnd.randint(0, 99):02d}"
+    for coluna in range(9, 34):
+        if rnd.random() < 0.3:
+            valores[coluna] = str(rnd.randint(0, 9))
+    valores[TOTAL_COLUNAS - 1] = rnd.choice(_OPERACOES)
+    return valores
+
+
+def gerar_html_grid(n_linhas: int, semente: int = 42, inicio: int = 0) -> str:
+    """
+    Gera o HTML da grid DevExpress com cabeçalho e n_linhas de dados.
+
+    `inicio` é o índice da primeira linha (páginas da grid têm CPFs distintos).
+    """
+    rnd = random.Random(semente)
+    partes = [
+        f'<table id="{ID_TABELA}" class="dxgvTable_Office2010Blue" cellspacing="0" '
+        'cellpadding="0" style="width:100%;border-collapse:collapse;">\n',
+        '<tr id="GridRelatorio_PanelGrid_grid_DXHeadersRow0">',
+    ]
+    partes.extend(
+        f'<td class="dxgvHeader" style="cursor:pointer;">Coluna {coluna}</td>'
+        for coluna in range(TOTAL_COLUNAS)
+    )
+    partes.append("</tr>\n")
+
+    for indice in range(inicio, inicio + n_linhas):
+        partes.append(
+            f'<tr id="GridRelatorio_PanelGrid_grid_DXDataRow{indice}" '
+            'class="dxgvDataRow_Office2010Blue">'
+        )
+        partes.extend(
+            f'<td class="dxgv">{valor}</td>'
+            for valor in _valores_linha(indice + 1, rnd)
+        )
+        partes.append("</tr>\n")
+
+    partes.append("</table>")
+    return "".join(partes)
+
+
+def gerar_texto_relatorio(n_linhas: int, semente: int = 42) -> str:
+    """
+    Texto corrido do relatório (como o get_text da página), uma linha por
+    colaborador entremeada com cabeçalhos, linhas em branco e rodapés
+    """
+    rnd = random.Random(semente)
+    ruido = [
+        "Situação Nome CPF Função Status Pontuação Vencimento",
+        "",
+        "Página 1 de 120 (60.000 itens)",
+        "Gerado em 01/08/2025 08:00 - Gente e Gestão",
+    ]
+    linhas = []
+    for indice in range(1, n_linhas + 1):
+        if rnd.random() < 0.1:
+            linhas.append(rnd.choice(ruido))
+        valores = _valores_linha(indice, rnd)
+        linhas.append(" ".join(valor for valor in valores if valor != "&nbsp;"))
+    return "\n".join(linhas)
+
+
+def escapar_js(texto: str) -> str:
+    """Aplica os escapes JavaScript usados pelo DevExpress no campo result"""
+    return (
+        texto.replace("'", "\\'")
+        .replace('"', '\\"')
+        .replace("/", "\\/")
+        .replace("\n", "\\r\\n")
+    )
+
+
+def gerar_resposta_callback(n_linhas: int, semente: int = 42) -> str:
+    """Gera a resposta completa do callback (envelope s/*DX*/) com a grid"""
+    html_grid = gerar_html_grid(n_linhas, semente)
+    return envelope_callback(html_grid)
+
+
+def envelope_callback(html_content: str) -> str:
+    """Envelope s/*DX*/ do callback do PanelGrid com o HTML no campo result"""
+    return "0|s/*DX*/({'result':'" + escapar_js(html_content) + "','id':0});"
+
+
+def gerar_pagina_grid(
+    pagina: int, tamanho_pagina: int, total_linhas: int, semente: int = 42
+) -> str:
+    """HTML de uma página da grid com o resumo do pager ("Página 1 de 12 (...)")"""
+    total_paginas = max(1, -(-total_linhas // tamanho_pagina))
+    inicio = pagina * tamanho_pagina
+    linhas = max(0, min(tamanho_pagina, total_linhas - inicio))
+    return (
+        gerar_html_grid(linhas, semente + pagina, inicio)
+        + '<table class="dxpControl"><tr><td class="dxpSummary">'
+        f"Página {pagina + 1} de {total_paginas} ({total_linhas} itens)"
+        "</td></tr></table>"
+    )
+
+
+def gerar_pagina_relatorio(
+    tamanho_viewstate: int = 200_000, n_linhas: int = 200, semente: int = 42
+) -> str:
+    """Gera a página do relatório (WebForms) com campos ocultos e a grid inicial"""
+    rnd = random.Random(semente)
+    alfabeto = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+    viewstate = "".join(rnd.choice(alfabeto) for _ in range(tamanho_viewstate))
+    validacao = "".join(rnd.choice(alfabeto) for _ in range(tamanho_viewstate // 20))
+
+    opcoes = "".join(
+        f'<option value="{valor}">Opção {valor}</option>' for valor in range(300)
+    )
+    return (
+        "<!DOCTYPE html>\n<html><head><title>Relatório Diário</title>"
+        '<script type="text/javascript">var aspxGrid = "<input name=x>";</script>'
+        "</head><body>"
+        '<form method="post" action="./Relatorio.aspx" id="form1">'
+        '<div class="aspNetHidden">'
+        '<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />'
+        '<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="" />'
+        f'<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />'
+        "</div>"
+        + "".join(
+            f'<div class="filtro"><label>Filtro {i}</label>'
+            f'<select name="ctl00$Principal$FiltroPadraoDiario$ddl{i}">{opcoes}</select>'
+            f'<input type="text" name="txtFiltro{i}" value="" /></div>'
+            for i in range(10)
+        )
+        + gerar_html_grid(n_linhas, semente)
+        + '<div class="aspNetHidden">'
+        '<input type="hidden" name="__VIEWSTATEGENERATOR" '
+        'id="__VIEWSTATEGENERATOR" value="C2EE9ABB" />'
+        f'<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" '
+        f'value="{validacao}" />'
+        "</div></form></body></html>"
+    )
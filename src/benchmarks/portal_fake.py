@@ -0,0 +1,511 @@
+"""
+Portal Gente e Gestão falso para testes de carga locais
+Servidor HTTP que imita o login WebForms (portal/index.aspx, com __VIEWSTATE e
+__EVENTVALIDATION validados) e o relatório SituacaoCondutorAnalitico.aspx (GET
+da página e POST do callback do PanelGrid, completo ou paginado), devolvendo
+grids sintéticas de tamanho configurável, com latência, taxa de erro e
+expiração de sessão ajustáveis.
+
+Uso (a partir de src/):
+    python -m benchmarks.portal_fake --porta 8080 --linhas 20000 --latencia-ms 150
+
+    GEG_LOGIN_URL=http://127.0.0.1:8080/portal/index.aspx \\
+    GEG_RELATORIO_URL=http://127.0.0.1:8080/GEG/Paginas/Relatorios/Prontuario/SituacaoCondutorAnalitico.aspx \\
+    python main.py
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+from benchmarks.payloads import (
+    envelope_callback,
+    gerar_pagina_grid,
+    gerar_pagina_relatorio,
+    gerar_resposta_callback,
+)
+from utils.html_util import extrair_campos_ocultos
+
+CAMINHO_LOGIN = "/portal/index.aspx"
+CAMINHO_HOME = "/portal/Home.aspx"
+CAMINHO_RELATORIO = "/GEG/Paginas/Relatorios/Prontuario/SituacaoCondutorAnalitico.aspx"
+CAMINHO_ESTATISTICAS = "/__estatisticas"
+
+COOKIE_AUTENTICACAO = ".ASPXAUTH"
+ID_CALLBACK = "ctl00$GridRelatorio$PanelGrid"
+
+_PADRAO_PAGINA = re.compile(r"PAGERONCLICK\|PN(\d+)\|PSP(\d+)")
+
+# Respostas geradas mantidas em memória (callbacks por página e tamanho)
+MAX_RESPOSTAS_EM_CACHE = 64
+
+
+class ConfiguracaoPortal(NamedTuple):
+    """Comportamento do portal falso"""
+
+    linhas: int = 5000
+    latencia_ms: float = 0.0
+    variacao_latencia_ms: float = 0.0
+    taxa_erro: float = 0.0
+    expiracao_sessao_s: float = 1200.0
+    senha: Optional[str] = None
+    gzip: bool = True
+    tamanho_viewstate: int = 200_000
+    semente: int = 42
+
+
+class PortalFake:
+    """Estado do portal: tokens do formulário, sessões, respostas e contadores"""
+
+    def __init__(self, configuracao: ConfiguracaoPortal):
+        self.configuracao = configuracao
+        self._aleatorio = random.Random(configuracao.semente)
+        self._trava = threading.Lock()
+        # Reentrante: a versão gzip é gerada a partir da original
+        self._trava_geracao = threading.RLock()
+        # token -> instante em que a sessão expira (renovado a cada acesso)
+        self._sessoes: Dict[str, float] = {}
+        self._respostas: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self.contadores: Dict[str, int] = dict.fromkeys(
+            (
+                "requisicoes",
+                "logins",
+                "logins_recusados",
+                "paginas_relatorio",
+                "callbacks",
+                "callbacks_invalidos",
+                "erros_injetados",
+                "sessoes_expiradas",
+                "bytes_enviados",
+            ),
+            0,
+        )
+
+        self.viewstate_login = secrets.token_urlsafe(96)
+        self.validacao_login = secrets.token_urlsafe(48)
+        self.pagina_relatorio = gerar_pagina_relatorio(
+            configuracao.tamanho_viewstate,
+            min(200, configuracao.linhas),
+            configuracao.semente,
+        ).encode("utf-8")
+        self.campos_relatorio = extrair_campos_ocultos(
+            self.pagina_relatorio.decode("utf-8")
+        )
+
+    def contar(self, contador: str, quantidade: int = 1) -> None:
+        with self._trava:
+            self.contadores[contador] += quantidade
+
+    def estatisticas(self) -> Dict[str, int]:
+        with self._trava:
+            agora = time.monotonic()
+            ativas = sum(1 for expira in self._sessoes.values() if expira > agora)
+            return {**self.contadores, "sessoes_ativas": ativas}
+
+    def aguardar_latencia(self) -> None:
+        configuracao = self.configuracao
+        atraso = configuracao.latencia_ms
+        if configuracao.variacao_latencia_ms:
+            with self._trava:
+                atraso += self._aleatorio.uniform(0, configuracao.variacao_latencia_ms)
+        if atraso > 0:
+            time.sleep(atraso / 1000)
+
+    def sortear_erro(self) -> bool:
+        if self.configuracao.taxa_erro <= 0:
+            return False
+        with self._trava:
+            falhou = self._aleatorio.random() < self.configuracao.taxa_erro
+        if falhou:
+            self.contar("erros_injetados")
+        return falhou
+
+    def pagina_login(self, mensagem: str = "") -> bytes:
+        return (
+            "<!DOCTYPE html>\n<html><head><title>Gente e Gestão</title></head><body>"
+            f'<form method="post" action="./index.aspx" id="form1">'
+            '<div class="aspNetHidden">'
+            '<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />'
+            '<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="" />'
+            '<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" '
+            f'value="{self.viewstate_login}" />'
+            "</div>"
+            '<input name="ctl00$txtEmail" type="text" id="txtEmail" />'
+            '<input name="ctl00$txtSenha" type="password" id="txtSenha" />'
+            '<input type="submit" name="ctl00$btnEntrar" value="ENTRAR NO SISTEMA" />'
+            f'<span class="erro">{mensagem}</span>'
+            '<div class="aspNetHidden">'
+            '<input type="hidden" name="__VIEWSTATEGENERATOR" '
+            'id="__VIEWSTATEGENERATOR" value="D0F1A6F4" />'
+            '<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" '
+            f'value="{self.validacao_login}" />'
+            "</div></form></body></html>"
+        ).encode("utf-8")
+
+    def autenticar(self, formulario: Dict[str, str]) -> Optional[str]:
+        """Valida o POST do login; devolve o token da nova sessão"""
+        senha_esperada = self.configuracao.senha
+        valido = (
+            formulario.get("__VIEWSTATE") == self.viewstate_login
+            and formulario.get("__EVENTVALIDATION") == self.validacao_login
+            and formulario.get("ctl00$txtEmail")
+            and formulario.get("ctl00$txtSenha")
+            and (
+                senha_esperada is None
+                or formulario.get("ctl00$txtSenha") == senha_esperada
+            )
+        )
+        if not valido:
+            self.contar("logins_recusados")
+            return None
+
+        token = secrets.token_hex(32)
+        with self._trava:
+            self._sessoes[token] = (
+                time.monotonic() + self.configuracao.expiracao_sessao_s
+            )
+            self.contadores["logins"] += 1
+        return token
+
+    def sessao_valida(self, token: Optional[str]) -> bool:
+        """Confere a sessão e renova a expiração (expiração deslizante)"""
+        if not token:
+            return False
+        agora = time.monotonic()
+        with self._trava:
+            expira = self._sessoes.get(token)
+            if expira is None:
+                return False
+            if expira <= agora:
+                del self._sessoes[token]
+                self.contadores["sessoes_expiradas"] += 1
+                return False
+            self._sessoes[token] = agora + self.configuracao.expiracao_sessao_s
+        return True
+
+    def resposta_callback(self, parametro: str, comprimida: bool = False) -> bytes:
+        """Envelope do callback: grid completa ("c0:") ou a página pedida"""
+        match_pagina = _PADRAO_PAGINA.search(parametro)
+        pagina, tamanho = (
+            (int(match_pagina.group(1)), max(1, int(match_pagina.group(2))))
+            if match_pagina
+            else (-1, 0)
+        )
+        return self.conteudo(
+            ("callback", pagina, tamanho),
+            lambda: self._gerar_callback(pagina, tamanho).encode("utf-8"),
+            comprimida,
+        )
+
+    def conteudo(
+        self, chave: Tuple, gerar: Callable[[], bytes], comprimido: bool = False
+    ) -> bytes:
+        """Conteúdo gerado uma vez e guardado (também na versão gzip)"""
+        chave = (*chave, comprimido)
+        with self._trava:
+            corpo = self._respostas.get(chave)
+            if corpo is not None:
+                self._respostas.move_to_end(chave)
+                return corpo
+
+        # Uma geração por vez: credenciais simultâneas pedem as mesmas páginas
+        with self._trava_geracao:
+            with self._trava:
+                corpo = self._respostas.get(chave)
+            if corpo is None:
+                if comprimido:
+                    original = self.conteudo(chave[:-1], gerar)
+                    corpo = gzip.compress(original, compresslevel=1)
+                else:
+                    corpo = gerar()
+            with self._trava:
+                self._respostas[chave] = corpo
+                self._respostas.move_to_end(chave)
+                while len(self._respostas) > MAX_RESPOSTAS_EM_CACHE:
+                    self._respostas.popitem(last=False)
+        return corpo
+
+    def _gerar_callback(self, pagina: int, tamanho: int) -> str:
+        configuracao = self.configuracao
+        if pagina < 0:
+            return gerar_resposta_callback(configuracao.linhas, configuracao.semente)
+        return envelope_callback(
+            gerar_pagina_grid(
+                pagina, tamanho, configuracao.linhas, configuracao.semente
+            )
+        )
+
+
+class ManipuladorPortal(BaseHTTPRequestHandler):
+    """Rotas do portal falso (o estado fica em self.server.portal)"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "Microsoft-IIS/10.0"
+    sys_version = ""
+
+    @property
+    def portal(self) -> PortalFake:
+        return self.server.portal
+
+    def do_GET(self) -> None:
+        caminho = urlsplit(self.path).path
+        if caminho == CAMINHO_ESTATISTICAS:
+            corpo = json.dumps(self.portal.estatisticas()).encode("utf-8")
+            self._responder(200, corpo, "application/json")
+            return
+
+        self.portal.contar("requisicoes")
+        self.portal.aguardar_latencia()
+        if caminho.lower() == CAMINHO_LOGIN.lower():
+            self._responder(200, self.portal.pagina_login())
+        elif caminho.lower() == CAMINHO_HOME.lower():
+            if self._exigir_sessao():
+                self._responder(200, b"<html><body>Bem-vindo</body></html>")
+        elif caminho.lower() == CAMINHO_RELATORIO.lower():
+            if not self._exigir_sessao():
+                return
+            if self.portal.sortear_erro():
+                self._erro_servidor()
+                return
+            self.portal.contar("paginas_relatorio")
+            comprimido = self._usar_gzip()
+            corpo = self.portal.conteudo(
+                ("relatorio",), lambda: self.portal.pagina_relatorio, comprimido
+            )
+            self._responder(200, corpo, comprimido=comprimido)
+        else:
+            self._responder(404, b"<html><body>404 - Not Found</body></html>")
+
+    def do_POST(self) -> None:
+        caminho = urlsplit(self.path).path
+        formulario = self._ler_formulario()
+        self.portal.contar("requisicoes")
+        self.portal.aguardar_latencia()
+
+        if caminho.lower() == CAMINHO_LOGIN.lower():
+            token = self.portal.autenticar(formulario)
+            if token is None:
+                self._responder(
+                    200, self.portal.pagina_login("E-mail ou senha inválidos")
+                )
+                return
+            self._redirecionar(
+                CAMINHO_HOME,
+                [
+                    f"ASP.NET_SessionId={secrets.token_hex(12)}; path=/; HttpOnly",
+                    f"{COOKIE_AUTENTICACAO}={token}; path=/; HttpOnly",
+                ],
+            )
+        elif caminho.lower() == CAMINHO_RELATORIO.lower():
+            if not self._exigir_sessao():
+                return
+            if self.portal.sortear_erro():
+                self._erro_servidor()
+                return
+            campos = self.portal.campos_relatorio
+            if formulario.get("__CALLBACKID") != ID_CALLBACK or any(
+                formulario.get(nome) != valor for nome, valor in campos.items()
+            ):
+                self.portal.contar("callbacks_invalidos")
+                self._erro_servidor("Invalid viewstate.")
+                return
+            self.portal.contar("callbacks")
+            comprimido = self._usar_gzip()
+            corpo = self.portal.resposta_callback(
+                formulario.get("__CALLBACKPARAM", ""), comprimido
+            )
+            self._responder(200, corpo, "text/plain", comprimido)
+        else:
+            self._responder(404, b"<html><body>404 - Not Found</body></html>")
+
+    def log_message(self, formato: str, *args) -> None:
+        if self.server.verboso:
+            super().log_message(formato, *args)
+
+    def _ler_formulario(self) -> Dict[str, str]:
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        corpo = self.rfile.read(tamanho).decode("utf-8") if tamanho else ""
+        return {
+            nome: valores[-1]
+            for nome, valores in parse_qs(corpo, keep_blank_values=True).items()
+        }
+
+    def _exigir_sessao(self) -> bool:
+        """Sem sessão válida, redireciona para o login como o forms auth"""
+        cookies = SimpleCookie(self.headers.get("Cookie") or "")
+        morsel = cookies.get(COOKIE_AUTENTICACAO)
+        if self.portal.sessao_valida(morsel.value if morsel else None):
+            return True
+        self._redirecionar(f"{CAMINHO_LOGIN}?ReturnUrl={quote(self.path, safe='')}")
+        return False
+
+    def _erro_servidor(self, mensagem: str = "Erro interno do servidor") -> None:
+        self._responder(500, f"<html><body>{mensagem}</body></html>".encode("utf-8"))
+
+    def _redirecionar(self, destino: str, cookies=()) -> None:
+        self.send_response(302)
+        self.send_header("Location", destino)
+        for cookie in cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _usar_gzip(self) -> bool:
+        aceita_gzip = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        return self.portal.configuracao.gzip and aceita_gzip
+
+    def _responder(
+        self,
+        status: int,
+        corpo: bytes,
+        tipo: str = "text/html",
+        comprimido: Optional[bool] = None,
+    ) -> None:
+        """Envia a resposta; `comprimido=None` comprime aqui se o cliente aceitar"""
+        if comprimido is None:
+            comprimido = self._usar_gzip()
+            if comprimido:
+                corpo = gzip.compress(corpo, compresslevel=1)
+
+        self.send_response(status)
+        self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+        self.send_header("Cache-Control", "private")
+        if comprimido:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+        self.portal.contar("bytes_enviados", len(corpo))
+
+
+class ServidorPortalFake(ThreadingHTTPServer):
+    """ThreadingHTTPServer com o portal falso; uma thread por conexão"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        configuracao: Optional[ConfiguracaoPortal] = None,
+        host: str = "127.0.0.1",
+        porta: int = 0,
+        verboso: bool = False,
+    ):
+        self.portal = PortalFake(configuracao or ConfiguracaoPortal())
+        self.verboso = verboso
+        super().__init__((host, porta), ManipuladorPortal)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url_base(self) -> str:
+        host, porta = self.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    @property
+    def login_url(self) -> str:
+        return self.url_base + CAMINHO_LOGIN
+
+    @property
+    def relatorio_url(self) -> str:
+        return self.url_base + CAMINHO_RELATORIO
+
+    def iniciar(self) -> "ServidorPortalFake":
+        """Atende em uma thread de fundo (para uso dentro de outro script)"""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="portal-fake", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def parar(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "ServidorPortalFake":
+        return self.iniciar()
+
+    def __exit__(self, tipo_excecao, excecao, traceback) -> None:
+        self.parar()
+
+
+def adicionar_argumentos(parser: argparse.ArgumentParser) -> None:
+    """Opções da ConfiguracaoPortal (compartilhadas com o bench de carga)"""
+    padrao = ConfiguracaoPortal()
+    parser.add_argument("--linhas", type=int, default=padrao.linhas)
+    parser.add_argument("--latencia-ms", type=float, default=padrao.latencia_ms)
+    parser.add_argument(
+        "--variacao-latencia-ms",
+        type=float,
+        default=padrao.variacao_latencia_ms,
+        help="Atraso extra aleatório (0 a N ms) somado à latência",
+    )
+    parser.add_argument(
+        "--taxa-erro",
+        type=float,
+        default=padrao.taxa_erro,
+        help="Fração das requisições do relatório respondidas com HTTP 500",
+    )
+    parser.add_argument(
+        "--expiracao-sessao-s",
+        type=float,
+        default=padrao.expiracao_sessao_s,
+        help="Inatividade até a sessão expirar e o relatório voltar ao login",
+    )
+    parser.add_argument("--senha", help="Única senha aceita (padrão: qualquer uma)")
+    parser.add_argument("--sem-gzip", action="store_true")
+    parser.add_argument(
+        "--tamanho-viewstate", type=int, default=padrao.tamanho_viewstate
+    )
+
+
+def configuracao_de_argumentos(args: argparse.Namespace) -> ConfiguracaoPortal:
+    return ConfiguracaoPortal(
+        linhas=args.linhas,
+        latencia_ms=args.latencia_ms,
+        variacao_latencia_ms=args.variacao_latencia_ms,
+        taxa_erro=args.taxa_erro,
+        expiracao_sessao_s=args.expiracao_sessao_s,
+        senha=args.senha,
+        gzip=not args.sem_gzip,
+        tamanho_viewstate=args.tamanho_viewstate,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--verboso", action="store_true")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    servidor = ServidorPortalFake(
+        configuracao_de_argumentos(args), args.host, args.porta, args.verboso
+    )
+    print(f"Portal falso em {servidor.url_base} ({args.linhas} linhas)")
+    print(f"GEG_LOGIN_URL={servidor.login_url}")
+    print(f"GEG_RELATORIO_URL={servidor.relatorio_url}")
+    print(f"Estatísticas: {servidor.url_base}{CAMINHO_ESTATISTICAS}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        print(json.dumps(servidor.portal.estatisticas(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Linha de comando do Robô GEG
+Subcomandos com importação sob demanda: cada um carrega só os módulos de que
+precisa (pandas, SQLAlchemy, APScheduler e driver do banco ficam fora do
+parse-file e do --help), para que verificações rápidas não paguem a
+inicialização completa.
+
+Uso (a partir de src/):
+    python cli.py run-once [--workers 4] [--perfil]
+    python cli.py schedule [--sem-execucao-inicial] [--perfil]
+    python cli.py parse-file ../output/debug/<execução>/<credencial>/resposta_ajax_dados.html.gz
+    python cli.py replay ../output/debug --saida ../output/reprocessamento --workers 8
+    python cli.py bench pipeline --linhas 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+
+def _run_once(args: argparse.Namespace) -> int:
+    import main
+
+    if args.perfil:
+        main.PERFILADOR.habilitado = True
+    main.executar_automacao(args.workers or main.MAX_WORKERS)
+    return 0
+
+
+def _schedule(args: argparse.Namespace) -> int:
+    import main
+
+    if args.perfil:
+        main.PERFILADOR.habilitado = True
+    if not args.sem_execucao_inicial:
+        main.executar_automacao()
+    main.agendar()
+    return 0
+
+
+def _parse_file(args: argparse.Namespace) -> int:
+    import logging
+
+    from automacao_geg import AutomacaoGEG
+
+    automacao = AutomacaoGEG(args.saida)
+    if not args.verboso:
+        automacao.logger.setLevel(logging.WARNING)
+
+    inicio = time.perf_counter()
+    arquivo_csv, colaboradores = automacao.reprocessar_arquivo(args.arquivo)
+    segundos = time.perf_counter() - inicio
+    if not colaboradores:
+        print(f"Nenhum colaborador encontrado em {args.arquivo}")
+        return 1
+
+    linhas_por_segundo = len(colaboradores) / segundos if segundos else 0.0
+    print(
+        f"{len(colaboradores)} colaboradores em {segundos:.2f} s "
+        f"({linhas_por_segundo:,.0f} linhas/s)"
+    )
+    print(f"Arquivo CSV: {arquivo_csv}")
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    from services.reprocessamento import Reprocessamento, localizar_respostas
+
+    respostas, avisos = localizar_respostas(args.diretorio)
+    for aviso in avisos:
+        print(f"Aviso: {aviso}")
+    if not respostas:
+        print(f"Nenhuma resposta de callback encontrada em {args.diretorio}")
+        return 1
+
+    reprocessamento = Reprocessamento(args.saida, args.workers)
+    print(
+        f"Reprocessando {len(respostas)} resposta(s) com "
+        f"{min(reprocessamento.workers, len(respostas))} processo(s)..."
+    )
+
+    def mostrar(resultado):
+        if args.verboso:
+            print(
+                f"  {resultado['resposta']}: {resultado['linhas']} linhas em "
+                f"{resultado['segundos']:.2f} s -> "
+                f"{resultado['arquivo_csv'] or 'falhou'}"
+            )
+
+    resumo = reprocessamento.executar(respostas, mostrar)
+    print(
+        f"{resumo['linhas']} linhas de {resumo['respostas']} resposta(s) "
+        f"({resumo['bytes'] / 1048576:.1f} MB) em {resumo['segundos']:.2f} s: "
+        f"{resumo['linhas_por_segundo']:,.0f} linhas/s "
+        f"(CPU somada {resumo['cpu_segundos']:.2f} s)"
+    )
+    print(f"CSVs em {args.saida}")
+    for falha in resumo["falhas"]:
+        print(f"Falhou: {falha}")
+    return 1 if resumo["falhas"] else 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    import importlib
+
+    nome = args.nome.removeprefix("bench_")
+    try:
+        modulo = importlib.import_module(f"benchmarks.bench_{nome}")
+    except ModuleNotFoundError as e:
+        if e.name != f"benchmarks.bench_{nome}":
+            raise
+        print(f"Benchmark desconhecido: {args.nome}")
+        return 2
+
+    # Cada benchmark lê os próprios argumentos
+    sys.argv = [f"bench_{nome}", *args.argumentos]
+    modulo.main()
+    return 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Robô de integração Gente e Gestão"
+    )
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    run_once = subcomandos.add_parser(
+        "run-once", help="Executa todas as credenciais uma vez e grava no banco"
+    )
+    run_once.add_argument(
+        "--workers", type=int, help="Credenciais em paralelo (padrão: GEG_MAX_WORKERS)"
+    )
+    run_once.add_argument(
+        "--perfil",
+        action="store_true",
+        help="Perfila cada credencial e a gravação (relatórios em output/perfis/)",
+    )
+    run_once.set_defaults(executar=_run_once)
+
+    schedule = subcomandos.add_parser(
+        "schedule", help="Executa uma vez e agenda os jobs diários por credencial"
+    )
+    schedule.add_argument(
+        "--sem-execucao-inicial",
+        action="store_true",
+        help="Só agenda, sem a execução imediata",
+    )
+    schedule.add_argument("--perfil", action="store_true")
+    schedule.set_defaults(executar=_schedule)
+
+    parse_file = subcomandos.add_parser(
+        "parse-file",
+        help="Extrai os colaboradores de uma resposta de callback salva (.gz ou não)",
+    )
+    parse_file.add_argument(
+        "arquivo", help="resposta_ajax_dados.html(.gz) ou HTML da grid"
+    )
+    parse_file.add_argument(
+        "--saida", default="output", help="Diretório do CSV (padrão: output)"
+    )
+    parse_file.add_argument(
+        "--verboso", action="store_true", help="Mostra o log da extração"
+    )
+    parse_file.set_defaults(executar=_parse_file)
+
+    replay = subcomandos.add_parser(
+        "replay",
+        help="Refaz extração e CSV de todas as respostas arquivadas em um diretório",
+    )
+    replay.add_argument(
+        "diretorio", help="Diretório com as respostas (ex.: ../output/debug)"
+    )
+    replay.add_argument(
+        "--saida",
+        default=os.path.join("output", "reprocessamento"),
+        help="Diretório dos CSVs, com a mesma estrutura de pastas da origem "
+        "(padrão: output/reprocessamento)",
+    )
+    replay.add_argument(
+        "--workers",
+        type=int,
+        help="Processos simultâneos (padrão: GEG_REPROCESSAMENTO_WORKERS ou núcleos)",
+    )
+    replay.add_argument(
+        "--verboso", action="store_true", help="Mostra cada resposta concluída"
+    )
+    replay.set_defaults(executar=_replay)
+
+    bench = subcomandos.add_parser(
+        "bench", help="Roda um benchmark de src/benchmarks (ex.: pipeline, importacao)"
+    )
+    bench.add_argument("nome", help="Nome do benchmark, sem o prefixo bench_")
+    bench.add_argument("argumentos", nargs=argparse.REMAINDER)
+    bench.set_defaults(executar=_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
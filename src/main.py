@@ -1,21 +1,52 @@
+import argparse
 import signal
 import threading
-from typing import List
-from automacao_geg import AutomacaoGEG, executar_automacao_geg
-from database.models import CadUsuariosGEG
-from services.data_service import DataService
-from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from repositories.database import get_session_context
-from automacao_geg import executar_automacao_geg  # Importa a função de automação
-from pymnz.database import update_table_from_dataframe
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from services.agendamento import EXECUTOR_INTERNO, AgendaCredenciais
+from services.checkpoints import ETAPA_GRAVACAO, CheckpointsPipeline
+from services.metricas import obter_coletor_metricas
+from services.perfilador import Perfilador
+from services.retentativas import (
+    OrcamentoRetentativas,
+    PoliticaRetentativa,
+    erro_transitorio,
+)
+from services.transporte_http import obter_transporte_http
+from repositories.database import estatisticas_pool, get_session_context
+from repositories.usuarios_geg_repository import buscar_credenciais
+from repositories.bulk_upsert import BulkUpsert
 from dotenv import load_dotenv
-from pymnz.utils import retry_on_failure
-import pandas as pd
+from utils.file_util import TravaArquivo, slug_credencial
 import os
 
 load_dotenv()
 
+OUTPUT_DIR = "output"
+
+# Número de credenciais processadas em paralelo (1 = execução sequencial)
+MAX_WORKERS = int(os.getenv("GEG_MAX_WORKERS", "1"))
+
+# A automação, o pandas (DataService, delta sync, histórico) e o pyarrow só são
+# importados por quem executa: importar o main (ex.: o cli.py ou um processo do
+# agendador) não paga a inicialização deles
+_delta_sync = None
+_historico = None
+_componentes_lock = threading.Lock()
+
+# Última etapa concluída por credencial, para retomar sem baixar a grid de novo
+# (GEG_CHECKPOINT=0 desliga)
+CHECKPOINTS = CheckpointsPipeline() if os.getenv("GEG_CHECKPOINT", "1") != "0" else None
+
+# cProfile + tracemalloc por credencial e na gravação (GEG_PERFIL=1 ou --perfil)
+PERFILADOR = Perfilador()
+
+# Jobs agendados de credenciais diferentes rodam ao mesmo tempo, em threads ou em
+# processos; o delta sync guarda os hashes pendentes entre o filtro e o commit,
+# então uma gravação (e atualização dos checkpoints) por vez, travada em arquivo
+_gravacao_lock = TravaArquivo(os.path.join(OUTPUT_DIR, "gravacao.lock"))
+
 # Variável de controle para parar o agendador
 stop_scheduler = threading.Event()
 
@@ -30,41 +61,220 @@ signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
 
-@retry_on_failure(5, retry_interval=10)
-def buscar_usuarios_geg():
-    with get_session_context() as session:
-        return session.query(CadUsuariosGEG)
+def obter_delta_sync():
+    """
+    Grava só os CPFs novos/alterados desde a última execução (GEG_DELTA_SYNC=0
+    desliga); None se desligado
+    """
+    global _delta_sync
+
+    with _componentes_lock:
+        if _delta_sync is None and os.getenv("GEG_DELTA_SYNC", "1") != "0":
+            from services.delta_sync import DeltaSync
+
+            _delta_sync = DeltaSync()
+        return _delta_sync
 
 
-@retry_on_failure(5, retry_interval=10)
-def salvar_prontuarios_geg(df: pd.DataFrame) -> None:
+def obter_historico():
+    """
+    Snapshots de cada execução em Parquet, para consultas históricas
+    (GEG_HISTORICO=0 desliga); None se desligado
+    """
+    global _historico
+
+    with _componentes_lock:
+        if _historico is None and os.getenv("GEG_HISTORICO", "1") != "0":
+            from services.historico_prontuarios import HistoricoProntuarios
+
+            _historico = HistoricoProntuarios()
+        return _historico
+
+
+def buscar_usuarios_geg(
+    orcamento: Optional[OrcamentoRetentativas] = None,
+) -> List[Tuple[str, str]]:
+    return PoliticaRetentativa("buscar_credenciais", orcamento=orcamento).executar(
+        buscar_credenciais
+    )
+
+
+def salvar_prontuarios_geg(
+    registros: List[Dict], orcamento: Optional[OrcamentoRetentativas] = None
+) -> bool:
+    return PoliticaRetentativa("salvar_prontuarios", orcamento=orcamento).executar(
+        _salvar_prontuarios, registros
+    )
+
+
+def _salvar_prontuarios(registros: List[Dict]) -> bool:
+    delta_sync = obter_delta_sync()
+    if delta_sync:
+        registros, resumo = delta_sync.filtrar_registros(registros)
+        print(f"Delta sync log_prontuarios_gente_gestao: {resumo}")
+        if not registros:
+            print("Nenhuma alteração para gravar em log_prontuarios_gente_gestao")
+            return True
+
+    upsert = BulkUpsert(
+        "log_prontuarios_gente_gestao",
+        chaves_primarias=["cpf_log_prontuarios_gente_gestao"],
+    )
     with get_session_context() as session:
         try:
-            update_table_from_dataframe(
-                df=df,
-                table_name="log_prontuarios_gente_gestao",
-                primary_keys=["cpf_log_prontuarios_gente_gestao"],
-                conn=session,
-            )
+            upsert.executar(session, registros)
+            print(f"Upsert log_prontuarios_gente_gestao: {upsert.estatisticas()}")
         except Exception as e:
             print(f"Erro ao atualizar tabela log_prontuarios_gente_gestao: {str(e)}")
+            session.rollback()
+            if delta_sync:
+                delta_sync.descartar()
+            # Conexão perdida, deadlock etc.: a política tenta de novo
+            if erro_transitorio(e):
+                raise
+            return False
+
+    # Hashes só são confirmados depois do commit da sessão
+    if delta_sync:
+        delta_sync.confirmar()
+    return True
+
+
+def salvar_historico_geg(colaboradores: List[Dict], data_atualizacao: datetime) -> None:
+    # O histórico é complementar: uma falha aqui não interrompe a execução
+    try:
+        from services.data_service import DataService
+
+        df = DataService.converter_dados_para_df(colaboradores, data_atualizacao)
+        arquivos = obter_historico().gravar(df, data_atualizacao)
+        print(
+            f"Histórico de prontuários: {len(df)} linhas em {len(arquivos)} arquivo(s)"
+        )
+    except Exception as e:
+        print(f"Erro ao gravar histórico de prontuários: {str(e)}")
+
+
+def exportar_metricas_geg(execucao: str) -> None:
+    # Métricas por etapa em output/metricas_<execução>.json e output/metricas.prom
+    try:
+        arquivos = obter_coletor_metricas().exportar(OUTPUT_DIR, execucao)
+        if arquivos:
+            print(f"Métricas por etapa: {', '.join(arquivos)}")
+    except Exception as e:
+        print(f"Erro ao exportar métricas: {str(e)}")
 
 
-@retry_on_failure(max_retries=5, retry_interval=10)
-def executar_automacao():
+def executar_credencial(
+    email: str,
+    senha: str,
+    output_dir: str = OUTPUT_DIR,
+    execucao: Optional[str] = None,
+    orcamento: Optional[OrcamentoRetentativas] = None,
+) -> Tuple[str, bool, Optional[str], Optional[List[Dict]]]:
+    """Executa a automação de uma credencial com sessão e AutomacaoGEG próprias."""
+    from automacao_geg import executar_automacao_geg
+
+    with PERFILADOR.perfilar(email, execucao) as perfil:
+        sucesso, arquivo_csv, colaboradores = executar_automacao_geg(
+            email,
+            senha,
+            output_dir,
+            checkpoints=CHECKPOINTS,
+            orcamento_retentativas=orcamento,
+            # Em diretório próprio (paralelo/agendado), o log também é separado
+            credencial_log=email if output_dir != OUTPUT_DIR else None,
+            execucao_metricas=execucao,
+        )
+    if perfil:
+        print(perfil.resumo())
+    return email, sucesso, arquivo_csv, colaboradores
+
+
+def executar_automacao(
+    max_workers: int = MAX_WORKERS, emails: Optional[List[str]] = None
+):
+    """
+    Executa as credenciais cadastradas e grava os prontuários de todas de uma vez.
+
+    Com `emails` (jobs agendados por credencial), só essas credenciais rodam,
+    cada uma no próprio diretório de saída.
+    """
+    from automacao_geg import AutomacaoGEG
+    from services.data_service import DataService
+
     print("Iniciando automação GEG...")
-    cad_usuarios_geg: List[CadUsuariosGEG] = buscar_usuarios_geg()  # type: ignore
-    if not cad_usuarios_geg:
+    execucao = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if emails:
+        execucao = f"{execucao}_{slug_credencial(emails[0])}"
+    # Novas tentativas de todas as operações da execução saem do mesmo orçamento,
+    # próprio de cada execução: jobs agendados simultâneos não zeram o dos outros
+    orcamento = OrcamentoRetentativas()
+    credenciais = buscar_usuarios_geg(orcamento)
+    if emails is not None:
+        selecionados = set(emails)
+        for email in selecionados - {email for email, _ in credenciais}:
+            print(f"Credencial {email} não está mais cadastrada, ignorada")
+        credenciais = [c for c in credenciais if c[0] in selecionados]
+    if not credenciais:
         print("Nenhuma credencial encontrada no banco de dados.")
         return
-    for cred in cad_usuarios_geg:
-        print(f"Usando credencial: {cred.email_cad_usuarios_geg}")
-        email = str(cred.email_cad_usuarios_geg)
-        senha = str(cred.senha_cad_usuarios_geg)
-        sucesso, arquivo_csv, colaboradores = executar_automacao_geg(email, senha)
-        df = DataService.converter_dados_para_df(colaboradores)
-        salvar_prontuarios_geg(df)
 
+    if CHECKPOINTS:
+        CHECKPOINTS.expirar()
+        # Credenciais gravadas por uma execução interrompida antes do fim, dentro
+        # da validade do checkpoint
+        gravadas = [c for c in credenciais if CHECKPOINTS.etapa(c[0]) == ETAPA_GRAVACAO]
+        for email, _ in gravadas:
+            print(f"Credencial {email} já gravada (checkpoint), ignorada")
+        credenciais = [c for c in credenciais if c not in gravadas]
+
+    # Configura o log em output/automacao.log e gera as estatísticas
+    automacao = AutomacaoGEG(OUTPUT_DIR)
+
+    if PERFILADOR.habilitado and max_workers > 1:
+        # cProfile e tracemalloc não separam credenciais simultâneas
+        print("Perfil ligado: credenciais executadas uma por vez")
+        max_workers = 1
+
+    resultados = []
+    if max_workers > 1 and len(credenciais) > 1:
+        print(f"Executando {len(credenciais)} credenciais com {max_workers} workers")
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="geg-credencial"
+        ) as executor:
+            futuros = [
+                executor.submit(
+                    executar_credencial,
+                    email,
+                    senha,
+                    # Diretório próprio para que os CSVs e logs não se misturem
+                    # (cada credencial com o próprio logger e automacao.log)
+                    os.path.join(OUTPUT_DIR, slug_credencial(email)),
+                    execucao,
+                    orcamento,
+                )
+                for email, senha in credenciais
+            ]
+            for futuro in as_completed(futuros):
+                resultados.append(futuro.result())
+    else:
+        for email, senha in credenciais:
+            print(f"Usando credencial: {email}")
+            # Jobs agendados rodam em paralelo: CSVs em diretórios separados
+            output_dir = (
+                os.path.join(OUTPUT_DIR, slug_credencial(email))
+                if emails
+                else OUTPUT_DIR
+            )
+            resultados.append(
+                executar_credencial(email, senha, output_dir, execucao, orcamento)
+            )
+
+    # Reúne os resultados de todas as credenciais para uma única persistência
+    todos_colaboradores = []
+    emails_extraidos = []
+    for email, sucesso, arquivo_csv, colaboradores in resultados:
+        print(f"Credencial: {email}")
         if sucesso:
             print(f"Automação concluída com sucesso!")
             print(f"Arquivo CSV: {arquivo_csv}")
@@ -72,39 +282,111 @@ def executar_automacao():
                 from pprint import pprint
 
                 print(f"Colaboradores extraídos: {len(colaboradores)}")
-                automacao = AutomacaoGEG()
                 stats = automacao.obter_estatisticas(colaboradores)
                 print("Estatísticas:")
                 pprint(stats)
+                todos_colaboradores.extend(colaboradores)
+                emails_extraidos.append(email)
 
             else:
                 print("Nenhum colaborador foi extraído")
         else:
             print("Erro na automação")
 
+    if automacao.cache_sessao:
+        print(f"Cache de sessões: {automacao.cache_sessao.estatisticas()}")
 
-if __name__ == "__main__":
+    # Os arquivos de debug são gravados em segundo plano; espera a fila esvaziar
+    automacao.gravador_debug.aguardar(timeout=30)
+    print(f"Arquivos de debug: {automacao.gravador_debug.estatisticas()}")
 
-    # Executa a automação imediatamente
-    executar_automacao()
+    try:
+        if todos_colaboradores:
+            data_atualizacao = datetime.now()
+            # Gravação única para todas as credenciais
+            # Jobs agendados gravam cada um a sua parte: série própria por job
+            metricas = obter_coletor_metricas().iniciar(
+                f"gravacao_{emails[0]}" if emails else "todas", execucao
+            )
+            with metricas.medir("banco") as medicao:
+                registros = DataService.converter_dados_para_registros(
+                    todos_colaboradores, data_atualizacao
+                )
+                medicao.linhas = len(registros)
+                with _gravacao_lock:
+                    with PERFILADOR.perfilar("salvar_prontuarios", execucao) as perfil:
+                        gravado = salvar_prontuarios_geg(registros, orcamento)
+                    if gravado and CHECKPOINTS:
+                        # Um reinício dentro da validade não busca essas credenciais
+                        CHECKPOINTS.avancar(emails_extraidos, ETAPA_GRAVACAO)
+            metricas.finalizar(gravado)
+            if perfil:
+                print(perfil.resumo())
+            if obter_historico():
+                salvar_historico_geg(todos_colaboradores, data_atualizacao)
+            if gravado and CHECKPOINTS:
+                # Execução concluída: o checkpoint de gravação só serve para
+                # retomar uma execução interrompida, não para pular a próxima
+                with _gravacao_lock:
+                    for email in emails_extraidos:
+                        CHECKPOINTS.remover(email)
+    finally:
+        exportar_metricas_geg(execucao)
+
+    print(f"Pool de conexões: {estatisticas_pool()}")
+    print(f"Transporte HTTP: {obter_transporte_http().contadores.resumo()}")
+    print(f"Orçamento de novas tentativas restante: {orcamento.restante()}")
+
+
+def executar_grupo_agendado(emails: List[str]) -> None:
+    """Job diário de um grupo de credenciais (as senhas vêm do banco, não do job)"""
+    executar_automacao(emails=emails)
+
+
+def sincronizar_agenda(scheduler, agenda: AgendaCredenciais) -> None:
+    """Um job por grupo das credenciais cadastradas (novas entram, removidas saem)"""
+    try:
+        emails = [email for email, _ in buscar_usuarios_geg(OrcamentoRetentativas())]
+        jobs = agenda.sincronizar(scheduler, emails, executar_grupo_agendado)
+        print(f"Agenda sincronizada: {jobs} job(s) para {len(emails)} credencial(is)")
+    except Exception as e:
+        print(f"Erro ao sincronizar a agenda de credenciais: {str(e)}")
+
+
+def agendar() -> None:
+    """Agenda os jobs diários das credenciais e bloqueia até SIGINT/SIGTERM"""
+    # O APScheduler só é carregado por quem agenda (ver cli.py)
+    from apscheduler.jobstores.memory import MemoryJobStore
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    from apscheduler.schedulers.blocking import BlockingScheduler
 
     jobstores = {
         "default": SQLAlchemyJobStore(
             url=os.getenv("ROBO_INTEGRACAO_GG_DATABASE_URL", "")
         )
     }
-    scheduler = BlockingScheduler(jobstores=jobstores, daemon=True)
+    agenda = AgendaCredenciais()
+    scheduler = BlockingScheduler(
+        jobstores=jobstores, executors=agenda.executores(), daemon=True
+    )
+    # Os jobs das credenciais são (re)criados a partir do cadastro logo ao
+    # iniciar e depois a cada GEG_AGENDA_SINCRONIZAR_MIN minutos; o job de
+    # sincronização fica só em memória (recebe o próprio scheduler)
+    scheduler.add_jobstore(MemoryJobStore(), "memoria")
     scheduler.add_job(
-        executar_automacao,
-        "cron",
-        hour=15,
-        minute=0,
-        id="automacao_geg_diaria",
-        replace_existing=True,
-        misfire_grace_time=3600,  # Executa até 1h depois se perder o horário
+        sincronizar_agenda,
+        "interval",
+        minutes=int(os.getenv("GEG_AGENDA_SINCRONIZAR_MIN", "60")),
+        args=[scheduler, agenda],
+        id="sincronizar_agenda",
+        jobstore="memoria",
+        executor=EXECUTOR_INTERNO,
+        next_run_time=datetime.now(),
+        coalesce=True,
     )
     print(
-        "Agendamento persistente configurado para rodar todos os dias às 15h.\n"
+        f"Agendamento persistente configurado: um job por credencial, "
+        f"{agenda.descricao()}.\n"
         "Se perder o horário, executa ao iniciar!"
     )
 
@@ -123,3 +405,20 @@ if __name__ == "__main__":
         scheduler.shutdown()
         scheduler_thread.join()
         print("Agendador encerrado com sucesso.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Robô de integração Gente e Gestão")
+    parser.add_argument(
+        "--perfil",
+        action="store_true",
+        help="Perfila cada credencial e a gravação no banco (cProfile + "
+        "tracemalloc); relatórios em output/perfis/<execução>/",
+    )
+    args = parser.parse_args()
+    if args.perfil:
+        PERFILADOR.habilitado = True
+
+    # Executa a automação imediatamente
+    executar_automacao()
+    agendar()
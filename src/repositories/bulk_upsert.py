@@ -0,0 +1,157 @@
+"""
+Upsert em lotes com SQLAlchemy Core
+MySQL: INSERT ... ON DUPLICATE KEY UPDATE; SQLite/PostgreSQL: ON CONFLICT DO UPDATE.
+Cada lote é enviado com executemany (um round trip por lote).
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import MetaData, Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+TAMANHO_LOTE_PADRAO = 1000
+
+_tabelas_refletidas: Dict[Tuple[str, str], Table] = {}
+_tabelas_lock = threading.Lock()
+
+
+def _valor_banco(valor):
+    """NaN/NaT viram NULL e Timestamps do pandas viram datetime"""
+    if valor is None:
+        return None
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    if hasattr(valor, "to_pydatetime"):
+        return None if valor != valor else valor.to_pydatetime()
+    return valor
+
+
+class BulkUpsert:
+    """
+    Upsert de registros (dicionários com os nomes das colunas do banco).
+
+    A tabela é refletida do banco uma vez por URL; colunas dos registros que não
+    existem na tabela são descartadas e listadas (uma vez cada) em
+    `estatisticas()["colunas_ignoradas"]`.
+    """
+
+    def __init__(
+        self,
+        nome_tabela: str,
+        chaves_primarias: Sequence[str],
+        tamanho_lote: Optional[int] = None,
+        colunas_sem_update: Iterable[str] = (),
+    ):
+        self.nome_tabela = nome_tabela
+        self.chaves_primarias = list(chaves_primarias)
+        self.tamanho_lote = max(
+            1,
+            tamanho_lote
+            or int(os.getenv("GEG_UPSERT_TAMANHO_LOTE", str(TAMANHO_LOTE_PADRAO))),
+        )
+        self.colunas_sem_update = frozenset(colunas_sem_update)
+
+        self.registros = 0
+        self.lotes = 0
+        self.tempo_execucao = 0.0
+        # Colunas dos registros que não existem na tabela, na ordem em que apareceram
+        self.colunas_ignoradas: List[str] = []
+
+    def executar(self, conn, registros: Iterable[Dict]) -> int:
+        """
+        Grava os registros em lotes e retorna o total processado.
+
+        `conn` pode ser uma Session ou Connection; o commit fica com o chamador.
+        """
+        registros = list(registros)
+        if not registros:
+            return 0
+
+        conexao = conn.connection() if isinstance(conn, Session) else conn
+        tabela = self._tabela(conexao)
+        colunas = self._colunas(tabela, registros)
+        statement = self.montar_statement(tabela, colunas, conexao.dialect.name)
+
+        inicio = time.perf_counter()
+        total = 0
+        for lote in self._lotes(registros, colunas):
+            conexao.execute(statement, lote)
+            self.lotes += 1
+            total += len(lote)
+
+        self.registros += total
+        self.tempo_execucao += time.perf_counter() - inicio
+        return total
+
+    def montar_statement(self, tabela: Table, colunas: List[str], dialeto: str):
+        """INSERT com cláusula de upsert do dialeto, atualizando as colunas não-chave"""
+        atualizar = [
+            coluna
+            for coluna in colunas
+            if coluna not in self.chaves_primarias
+            and coluna not in self.colunas_sem_update
+        ]
+
+        if dialeto == "mysql":
+            statement = mysql.insert(tabela)
+            if not atualizar:
+                return statement.prefix_with("IGNORE")
+            return statement.on_duplicate_key_update(
+                {coluna: statement.inserted[coluna] for coluna in atualizar}
+            )
+
+        if dialeto in ("sqlite", "postgresql"):
+            modulo = sqlite if dialeto == "sqlite" else postgresql
+            statement = modulo.insert(tabela)
+            if not atualizar:
+                return statement.on_conflict_do_nothing(
+                    index_elements=self.chaves_primarias
+                )
+            return statement.on_conflict_do_update(
+                index_elements=self.chaves_primarias,
+                set_={coluna: statement.excluded[coluna] for coluna in atualizar},
+            )
+
+        raise ValueError(f"Upsert não suportado para o dialeto {dialeto}")
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {
+            "registros": self.registros,
+            "lotes": self.lotes,
+            "tamanho_lote": self.tamanho_lote,
+            "tempo_execucao": round(self.tempo_execucao, 3),
+            "colunas_ignoradas": list(self.colunas_ignoradas),
+        }
+
+    def _tabela(self, conexao) -> Table:
+        chave = (str(conexao.engine.url), self.nome_tabela)
+        with _tabelas_lock:
+            if chave not in _tabelas_refletidas:
+                _tabelas_refletidas[chave] = Table(
+                    self.nome_tabela, MetaData(), autoload_with=conexao
+                )
+            return _tabelas_refletidas[chave]
+
+    def _colunas(self, tabela: Table, registros: List[Dict]) -> List[str]:
+        colunas = list(dict.fromkeys(c for registro in registros for c in registro))
+        self.colunas_ignoradas.extend(
+            c for c in colunas if c not in tabela.c and c not in self.colunas_ignoradas
+        )
+
+        faltando = [c for c in self.chaves_primarias if c not in colunas]
+        if faltando:
+            raise ValueError(f"Chaves primárias ausentes nos registros: {faltando}")
+
+        return [c for c in colunas if c in tabela.c]
+
+    def _lotes(self, registros: List[Dict], colunas: List[str]) -> Iterable[List[Dict]]:
+        for inicio in range(0, len(registros), self.tamanho_lote):
+            yield [
+                {coluna: _valor_banco(registro.get(coluna)) for coluna in colunas}
+                for registro in registros[inicio : inicio + self.tamanho_lote]
+            ]
@@ -1,24 +1,152 @@
 from json import load
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 from dotenv import load_dotenv
 import os
+import threading
+import time
 
 
 load_dotenv()
 
 
-session_maker = sessionmaker(
-    bind=create_engine(os.getenv("ROBO_INTEGRACAO_GG_DATABASE_URL", ""), echo=False),
-)
+class EstatisticasPool:
+    """Contadores de uso do pool de conexões (compartilhados entre recriações)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.conexoes_abertas = 0
+        self.conexoes_invalidadas = 0
+
+    def registrar_checkout(self, espera: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+    def registrar_conexao(self) -> None:
+        with self._lock:
+            self.conexoes_abertas += 1
+
+    def registrar_invalidacao(self) -> None:
+        with self._lock:
+            self.conexoes_invalidadas += 1
+
+    def como_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "espera_total": round(self.espera_total, 4),
+                "espera_media": (
+                    round(self.espera_total / self.checkouts, 4)
+                    if self.checkouts
+                    else 0.0
+                ),
+                "espera_maxima": round(self.espera_maxima, 4),
+                "conexoes_abertas": self.conexoes_abertas,
+                "conexoes_invalidadas": self.conexoes_invalidadas,
+            }
+
+
+estatisticas = EstatisticasPool()
+
+
+def _criar_engine(url: str):
+    """Engine com pool configurável e verificação de conexões (pre-ping/recycle)"""
+    opcoes = {"echo": False}
+    # SQLite em memória usa um pool próprio, sem as opções de QueuePool
+    if not (url.startswith("sqlite") and (url == "sqlite://" or ":memory:" in url)):
+        opcoes.update(
+            poolclass=QueuePool,
+            pool_size=int(os.getenv("GEG_DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("GEG_DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("GEG_DB_POOL_TIMEOUT", "30")),
+            # Abaixo do wait_timeout do servidor, que derruba conexões ociosas
+            pool_recycle=int(os.getenv("GEG_DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=os.getenv("GEG_DB_POOL_PRE_PING", "1") != "0",
+        )
+
+    engine = create_engine(url, **opcoes)
+    event.listen(engine, "connect", lambda *args: estatisticas.registrar_conexao())
+    event.listen(
+        engine, "invalidate", lambda *args: estatisticas.registrar_invalidacao()
+    )
+    return engine
+
+
+# Engine e sessionmaker são criados no primeiro uso: importar o módulo não
+# carrega o driver do banco nem exige a URL configurada
+_engine = None
+_session_maker = None
+_engine_lock = threading.Lock()
+
+
+def obter_engine():
+    """Engine do processo, criado na primeira chamada"""
+    global _engine, _session_maker
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = _criar_engine(os.getenv("ROBO_INTEGRACAO_GG_DATABASE_URL", ""))
+                _session_maker = sessionmaker(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def __getattr__(nome: str):
+    # Compatibilidade com `from repositories.database import engine/session_maker`
+    if nome == "engine":
+        return obter_engine()
+    if nome == "session_maker":
+        obter_engine()
+        return _session_maker
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+
+def _descartar_pool_herdado() -> None:
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+# Processos filhos (executor de processos do agendador) não reaproveitam as
+# conexões herdadas do pai: o pool do filho começa vazio
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_descartar_pool_herdado)
+
+
+def estatisticas_pool() -> dict:
+    """Checkouts/espera acumulados e estado atual do pool"""
+    dados = estatisticas.como_dict()
+    if _engine is None:
+        return dados
+    pool = _engine.pool
+    if isinstance(pool, QueuePool):
+        dados.update(
+            tamanho=pool.size(),
+            em_uso=pool.checkedout(),
+            ociosas=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    return dados
 
 
 @contextmanager
 def get_session_context():
     """Retorna uma sessão do banco de dados."""
-    session = session_maker()
+    obter_engine()
+    session = _session_maker()
     try:
+        # A conexão é pega já aqui para medir a espera por uma conexão livre do
+        # pool (inclui pre-ping e abertura de conexão nova)
+        inicio = time.perf_counter()
+        session.connection()
+        estatisticas.registrar_checkout(time.perf_counter() - inicio)
         yield session
     except Exception as e:
         session.rollback()
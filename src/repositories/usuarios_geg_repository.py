@@ -0,0 +1,50 @@
+"""
+Leitura das credenciais do Gente e Gestão (cad_usuarios_geg)
+Busca só email/senha já materializados e mantém o resultado em cache com TTL
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from database.models import CadUsuariosGEG
+from repositories.database import get_session_context
+
+_cache: Optional[Tuple[float, List[Tuple[str, str]]]] = None
+_cache_lock = threading.Lock()
+
+
+def buscar_credenciais(ttl_segundos: Optional[float] = None) -> List[Tuple[str, str]]:
+    """
+    Retorna a lista de (email, senha) das credenciais cadastradas.
+
+    O resultado fica em cache por GEG_CACHE_CREDENCIAIS_TTL segundos (padrão 300;
+    0 desliga o cache).
+    """
+    global _cache
+
+    if ttl_segundos is None:
+        ttl_segundos = float(os.getenv("GEG_CACHE_CREDENCIAIS_TTL", "300"))
+
+    with _cache_lock:
+        if _cache and time.monotonic() - _cache[0] < ttl_segundos:
+            return list(_cache[1])
+
+        with get_session_context() as session:
+            linhas = session.query(
+                CadUsuariosGEG.email_cad_usuarios_geg,
+                CadUsuariosGEG.senha_cad_usuarios_geg,
+            ).all()
+
+        credenciais = [(str(email), str(senha)) for email, senha in linhas]
+        _cache = (time.monotonic(), credenciais)
+        return list(credenciais)
+
+
+def invalidar_cache_credenciais() -> None:
+    """Força a próxima busca a ir ao banco"""
+    global _cache
+
+    with _cache_lock:
+        _cache = None
@@ -0,0 +1,181 @@
+"""
+Agendamento diário das credenciais
+Um job do APScheduler por credencial (ou por grupo de credenciais), executados
+em um pool de threads ou de processos, com max_instances, coalesce e jitter no
+horário de início: uma credencial lenta não atrasa as outras e os logins não
+chegam ao portal todos no mesmo segundo. Os argumentos dos jobs ficam gravados
+no job store, então levam só os emails; as senhas são lidas do banco quando o
+job roda
+"""
+
+import os
+from typing import Callable, Dict, List, Optional, Sequence
+
+from utils.file_util import slug_credencial
+
+# Jobs de credenciais no job store; os demais ids não são tocados
+PREFIXO_JOB = "geg_credencial_"
+
+# Job único de versões anteriores (todas as credenciais em sequência)
+JOB_LEGADO = "automacao_geg_diaria"
+
+# Executor dos jobs internos (ex.: sincronização da agenda), fora do pool das
+# credenciais para não disputar vaga com elas
+EXECUTOR_INTERNO = "interno"
+
+
+def dividir_em_grupos(emails: Sequence[str], por_job: int) -> List[List[str]]:
+    """Emails em ordem, em grupos de até `por_job` (estáveis entre execuções)"""
+    ordenados = sorted(set(emails))
+    por_job = max(1, por_job)
+    return [ordenados[i : i + por_job] for i in range(0, len(ordenados), por_job)]
+
+
+def id_job(grupo: Sequence[str]) -> str:
+    """Id do job de um grupo: o slug do primeiro email (os grupos não se repetem)"""
+    return f"{PREFIXO_JOB}{slug_credencial(grupo[0])}"
+
+
+class AgendaCredenciais:
+    """
+    Jobs diários das credenciais no APScheduler.
+
+    Cada job recebe a lista de emails do seu grupo. `max_instances` impede que
+    um grupo ainda rodando seja iniciado de novo e `coalesce` junta disparos
+    perdidos em uma única execução. O jitter sorteia, a cada disparo, um atraso
+    entre 0 e `jitter_segundos` depois do horário.
+    """
+
+    def __init__(
+        self,
+        hora: Optional[int] = None,
+        minuto: Optional[int] = None,
+        jitter_segundos: Optional[int] = None,
+        credenciais_por_job: Optional[int] = None,
+        executor: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_instancias: Optional[int] = None,
+        tolerancia_segundos: Optional[int] = None,
+    ):
+        """
+        Args:
+            hora: Hora do disparo diário (GEG_AGENDA_HORA)
+            minuto: Minuto do disparo diário (GEG_AGENDA_MINUTO)
+            jitter_segundos: Atraso máximo sorteado por disparo (GEG_AGENDA_JITTER_S)
+            credenciais_por_job: Credenciais em cada job, executadas em
+                sequência dentro dele (GEG_AGENDA_CREDENCIAIS_POR_JOB)
+            executor: "thread" ou "processo" (GEG_AGENDA_EXECUTOR)
+            workers: Jobs simultâneos (GEG_AGENDA_WORKERS)
+            max_instancias: Execuções simultâneas do mesmo job
+                (GEG_AGENDA_MAX_INSTANCIAS)
+            tolerancia_segundos: Atraso aceito para um disparo perdido
+                (misfire_grace_time, GEG_AGENDA_TOLERANCIA_S)
+        """
+        self.hora = (
+            hora if hora is not None else int(os.getenv("GEG_AGENDA_HORA", "15"))
+        )
+        self.minuto = (
+            minuto if minuto is not None else int(os.getenv("GEG_AGENDA_MINUTO", "0"))
+        )
+        self.jitter_segundos = (
+            jitter_segundos
+            if jitter_segundos is not None
+            else int(os.getenv("GEG_AGENDA_JITTER_S", "600"))
+        )
+        self.credenciais_por_job = credenciais_por_job or int(
+            os.getenv("GEG_AGENDA_CREDENCIAIS_POR_JOB", "1")
+        )
+        self.executor = (executor or os.getenv("GEG_AGENDA_EXECUTOR", "thread")).lower()
+        if self.executor not in ("thread", "processo"):
+            raise ValueError(
+                f"GEG_AGENDA_EXECUTOR inválido: {self.executor} (use thread ou processo)"
+            )
+        self.workers = workers or int(os.getenv("GEG_AGENDA_WORKERS", "4"))
+        self.max_instancias = max_instancias or int(
+            os.getenv("GEG_AGENDA_MAX_INSTANCIAS", "1")
+        )
+        self.tolerancia_segundos = tolerancia_segundos or int(
+            os.getenv("GEG_AGENDA_TOLERANCIA_S", "3600")
+        )
+
+    # O APScheduler é importado só por quem agenda: a execução única não o carrega
+
+    def executores(self) -> Dict:
+        """Executores do scheduler: o pool das credenciais e o interno"""
+        from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.executor == "processo":
+            padrao = ProcessPoolExecutor(self.workers)
+        else:
+            padrao = ThreadPoolExecutor(self.workers)
+        return {"default": padrao, EXECUTOR_INTERNO: ThreadPoolExecutor(1)}
+
+    def gatilho(self):
+        from apscheduler.triggers.cron import CronTrigger
+
+        return CronTrigger(
+            hour=self.hora, minute=self.minuto, jitter=self.jitter_segundos or None
+        )
+
+    def sincronizar(
+        self, scheduler, emails: Sequence[str], funcao: Callable, jobstore="default"
+    ) -> int:
+        """
+        Deixa no job store um job por grupo de `emails` chamando `funcao(grupo)`.
+
+        Só os grupos sem job são criados: os existentes mantêm o próximo disparo
+        já sorteado (e um disparo perdido, executado ao iniciar); apenas
+        argumentos e opções são atualizados, e o gatilho só é trocado se o
+        horário configurado mudou. Jobs de credenciais que saíram do cadastro (e
+        o job único legado) são removidos. Devolve a quantidade de jobs agendados.
+        """
+        existentes = {job.id: job for job in scheduler.get_jobs(jobstore=jobstore)}
+        grupos = dividir_em_grupos(emails, self.credenciais_por_job)
+        ids = set()
+        for grupo in grupos:
+            job_id = id_job(grupo)
+            ids.add(job_id)
+            opcoes = dict(
+                args=[grupo],
+                name=f"GEG {grupo[0]}"
+                + (f" (+{len(grupo) - 1})" if len(grupo) > 1 else ""),
+                max_instances=self.max_instancias,
+                coalesce=True,
+                misfire_grace_time=self.tolerancia_segundos,
+            )
+            job = existentes.get(job_id)
+            if job is None:
+                scheduler.add_job(
+                    funcao, self.gatilho(), id=job_id, jobstore=jobstore, **opcoes
+                )
+                continue
+
+            # Um novo gatilho recalcularia o disparo (e o jitter) do zero: dentro da
+            # janela do jitter, o job pularia para o dia seguinte
+            gatilho = self.gatilho()
+            if str(job.trigger) != str(gatilho):
+                scheduler.reschedule_job(job_id, jobstore, trigger=gatilho)
+            alteradas = {
+                chave: valor
+                for chave, valor in opcoes.items()
+                if chave != "args" and getattr(job, chave) != valor
+            }
+            if list(job.args) != [grupo]:
+                alteradas["args"] = [grupo]
+            if alteradas:
+                scheduler.modify_job(job_id, jobstore, **alteradas)
+
+        for job_id in existentes:
+            if job_id == JOB_LEGADO or (
+                job_id.startswith(PREFIXO_JOB) and job_id not in ids
+            ):
+                scheduler.remove_job(job_id, jobstore=jobstore)
+        return len(grupos)
+
+    def descricao(self) -> str:
+        return (
+            f"todos os dias às {self.hora:02d}:{self.minuto:02d} "
+            f"(+ até {self.jitter_segundos} s), {self.credenciais_por_job} "
+            f"credencial(is) por job, {self.workers} job(s) simultâneos "
+            f"em {self.executor}"
+        )
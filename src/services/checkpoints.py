@@ -0,0 +1,146 @@
+"""
+Checkpoints do pipeline de cada credencial
+Guarda em um SQLite local a saída da última etapa concluída de cada credencial
+(login → busca → extração → gravação), para que uma nova tentativa ou um
+reinício depois de uma falha no banco continue de onde parou em vez de logar e
+baixar a grid de novo. Os checkpoints expiram depois de uma janela configurável
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+
+# Etapas do pipeline, na ordem. O login não tem checkpoint próprio: a sessão
+# autenticada já fica no cache de sessões (services.session_cache)
+ETAPA_BUSCA = "busca"
+ETAPA_EXTRACAO = "extracao"
+ETAPA_GRAVACAO = "gravacao"
+ETAPAS_PIPELINE = ("login", ETAPA_BUSCA, ETAPA_EXTRACAO, ETAPA_GRAVACAO)
+
+
+class Checkpoint(NamedTuple):
+    """Última etapa concluída de uma credencial e a saída dela"""
+
+    etapa: str
+    criado_em: float
+    dados: Any
+
+
+class CheckpointsPipeline:
+    """
+    Última etapa concluída por credencial, com validade.
+
+    Cada etapa substitui a anterior (só a saída mais adiantada interessa para
+    retomar). A credencial é guardada pelo hash do email e os dados em pickle
+    comprimido, em um arquivo com permissão 0600. Checkpoints mais antigos que
+    `validade_horas` são ignorados e apagados.
+    """
+
+    def __init__(
+        self, caminho: Optional[str] = None, validade_horas: Optional[float] = None
+    ):
+        self.caminho = caminho or os.getenv(
+            "GEG_CHECKPOINT_DB", os.path.join("output", "checkpoints.sqlite3")
+        )
+        self.validade_horas = (
+            validade_horas
+            if validade_horas is not None
+            else float(os.getenv("GEG_CHECKPOINT_VALIDADE_H", "6"))
+        )
+        self._lock = threading.Lock()
+
+    def salvar(self, credencial: str, etapa: str, dados: Any = None) -> None:
+        """Registra `etapa` como a última concluída pela credencial"""
+        conteudo = zlib.compress(pickle.dumps(dados, pickle.HIGHEST_PROTOCOL), 1)
+        with self._lock, self._conexao() as conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO checkpoints (chave, etapa, criado_em, dados) "
+                "VALUES (?, ?, ?, ?)",
+                (self._chave(credencial), etapa, time.time(), conteudo),
+            )
+
+    def avancar(self, credenciais: Iterable[str], etapa: str) -> int:
+        """
+        Marca `etapa` nas credenciais mantendo os dados da etapa anterior (ex.:
+        gravação no banco, que vale para todas as credenciais de uma vez)
+        """
+        chaves = [(etapa, time.time(), self._chave(c)) for c in credenciais]
+        with self._lock, self._conexao() as conexao:
+            cursor = conexao.executemany(
+                "UPDATE checkpoints SET etapa = ?, criado_em = ? WHERE chave = ?",
+                chaves,
+            )
+            return cursor.rowcount
+
+    def carregar(self, credencial: str) -> Optional[Checkpoint]:
+        """Checkpoint ainda válido da credencial, ou None"""
+        chave = self._chave(credencial)
+        with self._lock, self._conexao() as conexao:
+            linha = conexao.execute(
+                "SELECT etapa, criado_em, dados FROM checkpoints WHERE chave = ?",
+                (chave,),
+            ).fetchone()
+            if linha is None:
+                return None
+            etapa, criado_em, conteudo = linha
+            if criado_em < self._limite():
+                conexao.execute("DELETE FROM checkpoints WHERE chave = ?", (chave,))
+                return None
+        return Checkpoint(etapa, criado_em, pickle.loads(zlib.decompress(conteudo)))
+
+    def etapa(self, credencial: str) -> Optional[str]:
+        """Última etapa concluída (válida) da credencial, sem carregar os dados"""
+        with self._lock, self._conexao() as conexao:
+            linha = conexao.execute(
+                "SELECT etapa FROM checkpoints WHERE chave = ? AND criado_em >= ?",
+                (self._chave(credencial), self._limite()),
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def remover(self, credencial: str) -> None:
+        with self._lock, self._conexao() as conexao:
+            conexao.execute(
+                "DELETE FROM checkpoints WHERE chave = ?", (self._chave(credencial),)
+            )
+
+    def expirar(self) -> int:
+        """Apaga os checkpoints fora da validade; devolve quantos"""
+        with self._lock, self._conexao() as conexao:
+            cursor = conexao.execute(
+                "DELETE FROM checkpoints WHERE criado_em < ?", (self._limite(),)
+            )
+            return cursor.rowcount
+
+    def _limite(self) -> float:
+        return time.time() - self.validade_horas * 3600
+
+    @staticmethod
+    def _chave(credencial: str) -> str:
+        return hashlib.sha256(credencial.strip().lower().encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _conexao(self) -> Iterator[sqlite3.Connection]:
+        """Conexão com commit ao final do bloco (rollback em caso de erro)"""
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        novo = not os.path.exists(self.caminho)
+        conexao = sqlite3.connect(self.caminho)
+        try:
+            with conexao:
+                conexao.execute(
+                    "CREATE TABLE IF NOT EXISTS checkpoints (chave TEXT PRIMARY KEY, "
+                    "etapa TEXT NOT NULL, criado_em REAL NOT NULL, dados BLOB)"
+                )
+                if novo:
+                    # Os dados incluem nomes e CPFs: só o dono do processo lê
+                    os.chmod(self.caminho, 0o600)
+                yield conexao
+        finally:
+            conexao.close()
@@ -0,0 +1,183 @@
+"""
+Registro compacto de colaborador extraído da grid
+Campos em __slots__, números já convertidos (uma vez por texto distinto) e
+textos repetitivos internados; mantém a interface de dicionário das etapas antigas
+"""
+
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator
+
+from utils.format_util import formatar_numero
+
+# Ordem dos campos = ordem das chaves do dicionário gerado pela extração
+CAMPOS = (
+    "situacao_empregado",
+    "nome",
+    "cpf",
+    "cargo",
+    "status",
+    "pontuacao",
+    "vencimento",
+    "celular",
+    "alimento",
+    "fumando",
+    "oclusao",
+    "cinto",
+    "velo1",
+    "velo2",
+    "velo3",
+    "via1",
+    "via2",
+    "via3",
+    "forcag",
+    "frenagem",
+    "power",
+    "operacao",
+)
+
+# Campos que ficam vazios (e não "0") quando a célula não tem valor
+CAMPOS_TEXTO = frozenset(
+    [
+        "nome",
+        "cpf",
+        "cargo",
+        "situacao_empregado",
+        "status",
+        "operacao",
+        "vencimento",
+    ]
+)
+
+CAMPOS_NUMERICOS = (
+    "pontuacao",
+    "celular",
+    "alimento",
+    "fumando",
+    "oclusao",
+    "cinto",
+    "velo1",
+    "velo2",
+    "velo3",
+    "via1",
+    "via2",
+    "via3",
+    "forcag",
+    "frenagem",
+    "power",
+)
+
+# Textos com poucos valores distintos: uma única cópia em memória
+CAMPOS_INTERNADOS = frozenset(["situacao_empregado", "cargo", "status", "operacao"])
+
+_NUMERICOS = frozenset(CAMPOS_NUMERICOS)
+_POSICOES = {campo: indice for indice, campo in enumerate(CAMPOS)}
+
+# Texto da célula -> float já arredondado como no formatar_numero
+_cache_numeros: Dict[str, float] = {}
+_LIMITE_CACHE_NUMEROS = 50_000
+
+
+def converter_numero(texto) -> float:
+    """Mesmo valor de float(formatar_numero(texto)), calculado uma vez por texto"""
+    if isinstance(texto, float):
+        return texto
+    numero = _cache_numeros.get(texto)
+    if numero is None:
+        numero = float(formatar_numero(texto))
+        if len(_cache_numeros) < _LIMITE_CACHE_NUMEROS:
+            _cache_numeros[texto] = numero
+    return numero
+
+
+def _internar(texto):
+    return sys.intern(texto) if isinstance(texto, str) else texto
+
+
+# (campo, conversão aplicada ao atribuir), na ordem de CAMPOS
+_CONVERSORES = tuple(
+    (
+        campo,
+        (
+            converter_numero
+            if campo in _NUMERICOS
+            else _internar if campo in CAMPOS_INTERNADOS else None
+        ),
+    )
+    for campo in CAMPOS
+)
+
+
+class Colaborador(MutableMapping):
+    """
+    Colaborador com campos tipados.
+
+    Acesso por atributo devolve o valor tipado (float nos campos numéricos);
+    acesso por chave (`colaborador["velo1"]`, `get`, `items`) devolve o texto
+    no formato antigo ("0.00"), para as etapas que tratam dicionários.
+    """
+
+    __slots__ = CAMPOS
+
+    def __init__(self, **valores):
+        self._preencher(valores.get(campo, "") for campo in CAMPOS)
+
+    @classmethod
+    def de_valores(cls, valores: Iterable) -> "Colaborador":
+        """Cria o registro a partir dos textos na ordem de CAMPOS"""
+        colaborador = cls.__new__(cls)
+        colaborador._preencher(valores)
+        return colaborador
+
+    def _preencher(self, valores: Iterable) -> None:
+        definir = object.__setattr__
+        numeros = _cache_numeros.get
+        for (campo, converter), valor in zip(_CONVERSORES, valores):
+            if converter is converter_numero:
+                numero = numeros(valor)
+                valor = numero if numero is not None else converter_numero(valor)
+            elif converter:
+                valor = converter(valor)
+            definir(self, campo, valor)
+
+    @classmethod
+    def de_dict(cls, dados) -> "Colaborador":
+        """Converte um dicionário de colaborador (ou devolve o próprio registro)"""
+        if isinstance(dados, cls):
+            return dados
+        return cls(**dados)
+
+    def __getitem__(self, campo: str):
+        if campo in _NUMERICOS:
+            return f"{getattr(self, campo):.2f}"
+        if campo not in _POSICOES:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo: str, valor) -> None:
+        if campo not in _POSICOES:
+            raise KeyError(campo)
+        converter = _CONVERSORES[_POSICOES[campo]][1]
+        object.__setattr__(self, campo, converter(valor) if converter else valor)
+
+    def __delitem__(self, campo: str) -> None:
+        raise TypeError("Campos do Colaborador não podem ser removidos")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CAMPOS)
+
+    def __len__(self) -> int:
+        return len(CAMPOS)
+
+    def __contains__(self, campo) -> bool:
+        return campo in _POSICOES
+
+    def get(self, campo, padrao=None):
+        if campo in _NUMERICOS:
+            return f"{getattr(self, campo):.2f}"
+        if campo not in _POSICOES:
+            return padrao
+        return getattr(self, campo)
+
+    def __repr__(self) -> str:
+        return f"<Colaborador(nome={self.nome}, cpf={self.cpf})>"
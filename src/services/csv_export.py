@@ -0,0 +1,188 @@
+"""
+Exportação do CSV final em fluxo
+Cada colaborador é formatado e escrito assim que sai da limpeza, por um arquivo
+com buffer grande; o CSV é montado em um arquivo temporário e só aparece com o
+nome final quando a exportação é concluída
+"""
+
+import os
+import re
+from operator import attrgetter
+from typing import Dict, Iterable, Optional
+
+from services.colaborador import CAMPOS, Colaborador
+from utils.format_util import formatar_numero
+
+# Colunas conforme formato do exemplo fornecido (sem id pois é gerado pelo banco)
+COLUNAS_CSV = [
+    "situacao_log_prontuarios_gente_gestao",
+    "nome_log_prontuarios_gente_gestao",
+    "cpf_log_prontuarios_gente_gestao",
+    "cargo_log_prontuarios_gente_gestao",
+    "status_log_prontuarios_gente_gestao",
+    "pontuacao_log_prontuarios_gente_gestao",
+    "vencimento_log_prontuarios_gente_gestao",
+    "celular_log_prontuarios_gente_gestao",
+    "alimento_log_prontuarios_gente_gestao",
+    "fumando_log_prontuarios_gente_gestao",
+    "oclusao_log_prontuarios_gente_gestao",
+    "cinto_log_prontuarios_gente_gestao",
+    "velo1_log_prontuarios_gente_gestao",
+    "velo2_log_prontuarios_gente_gestao",
+    "velo3_log_prontuarios_gente_gestao",
+    "via1_log_prontuarios_gente_gestao",
+    "via2_log_prontuarios_gente_gestao",
+    "via3_log_prontuarios_gente_gestao",
+    "forcag_log_prontuarios_gente_gestao",
+    "frenagem_log_prontuarios_gente_gestao",
+    "power_log_prontuarios_gente_gestao",
+    "operacao_log_prontuarios_gente_gestao",
+]
+
+# Cabeçalho com aspas apenas nos nomes das colunas
+CABECALHO_CSV = ";".join(f'"{coluna}"' for coluna in COLUNAS_CSV) + "\n"
+
+# Campos numéricos sem aspas, na ordem das colunas
+CAMPOS_NUMERICOS_CSV = (
+    "alimento",
+    "fumando",
+    "oclusao",
+    "cinto",
+    "velo1",
+    "velo2",
+    "velo3",
+    "via1",
+    "via2",
+    "via3",
+    "forcag",
+    "frenagem",
+    "power",
+)
+
+_PADRAO_PONTUACAO_CPF = re.compile(r"[.\-]")
+
+# As colunas do CSV seguem a ordem de CAMPOS: uma linha do Colaborador é um
+# único format (aspas em cpf, pontuação, vencimento e celular)
+_MODELO_LINHA = (
+    ";".join(
+        ["{}", "{}", '"{}"', "{}", "{}", '"{:.2f}"', '"{}"', '"{:.2f}"']
+        + ["{:.2f}"] * len(CAMPOS_NUMERICOS_CSV)
+        + ["{}"]
+    )
+    + "\n"
+)
+_valores_colaborador = attrgetter(*CAMPOS)
+_POSICAO_NOME = CAMPOS.index("nome")
+_POSICAO_CPF = CAMPOS.index("cpf")
+_POSICAO_VENCIMENTO = CAMPOS.index("vencimento")
+
+
+def formatar_cpf_sem_pontos(cpf: str) -> str:
+    """Remove pontos e traços do CPF para deixar apenas números"""
+    if not cpf:
+        return ""
+    return _PADRAO_PONTUACAO_CPF.sub("", cpf)
+
+
+def formatar_data_vencimento(data: str) -> str:
+    """Formata data de vencimento no padrão YYYY-MM-DD"""
+    if not data or data == "N/A":
+        # Data padrão futura (exemplo do CSV usa datas futuras)
+        return "2031-12-31"
+
+    # Aqui você pode implementar lógica para converter formatos de data
+    # Por enquanto retorna data padrão
+    return "2031-12-31"
+
+
+def linha_csv(colaborador: Dict) -> str:
+    """Linha do CSV (com a quebra) no formato padrão do sistema"""
+    if isinstance(colaborador, Colaborador):
+        valores = list(_valores_colaborador(colaborador))
+        valores[_POSICAO_NOME] = valores[_POSICAO_NOME].upper()
+        valores[_POSICAO_CPF] = formatar_cpf_sem_pontos(valores[_POSICAO_CPF])
+        valores[_POSICAO_VENCIMENTO] = formatar_data_vencimento(
+            valores[_POSICAO_VENCIMENTO]
+        )
+        return _MODELO_LINHA.format(*valores)
+
+    # Dicionários das extrações alternativas: textos como vieram, com padrões
+    valores = [
+        colaborador.get("situacao_empregado", "ATIVO"),  # situacao sem aspas
+        colaborador.get("nome", "").upper(),  # nome sem aspas
+        f'"{formatar_cpf_sem_pontos(colaborador.get("cpf", ""))}"',  # cpf com aspas
+        colaborador.get("cargo", "Motorista Caminhão Distribuição"),
+        colaborador.get("status", "LIBERADO"),  # status sem aspas
+        f'"{colaborador.get("pontuacao", "0")}"',  # pontuacao com aspas
+        f'"{formatar_data_vencimento(colaborador.get("vencimento", ""))}"',
+        f'"{colaborador.get("celular", "0")}"',  # celular com aspas
+    ]
+    # Valores numéricos sem aspas
+    valores.extend(
+        formatar_numero(colaborador.get(campo, "0")) for campo in CAMPOS_NUMERICOS_CSV
+    )
+    valores.append(colaborador.get("operacao", "CD FORTALEZA"))  # operacao sem aspas
+    return ";".join(valores) + "\n"
+
+
+class ExportadorCSV:
+    """
+    CSV de colaboradores escrito linha a linha.
+
+    O arquivo é gravado em `<caminho>.parcial` com um buffer de
+    GEG_CSV_BUFFER_KB (padrão 256 KB) e renomeado para `caminho` em `concluir`;
+    `descartar` apaga o parcial. Como gerenciador de contexto, conclui ao sair
+    normalmente e descarta se houver exceção.
+    """
+
+    def __init__(self, caminho: str, buffer_kb: Optional[int] = None):
+        self.caminho = caminho
+        self.linhas = 0
+        self._temporario = f"{caminho}.parcial"
+        buffer_bytes = (buffer_kb or int(os.getenv("GEG_CSV_BUFFER_KB", "256"))) * 1024
+        self._arquivo = open(
+            self._temporario,
+            "w",
+            newline="",
+            encoding="utf-8-sig",
+            buffering=max(buffer_bytes, 8192),
+        )
+        self._escrever_texto = self._arquivo.write
+        self._escrever_texto(CABECALHO_CSV)
+
+    @property
+    def aberto(self) -> bool:
+        return not self._arquivo.closed
+
+    def escrever(self, colaborador: Dict) -> None:
+        self._escrever_texto(linha_csv(colaborador))
+        self.linhas += 1
+
+    def escrever_todos(self, colaboradores: Iterable[Dict]) -> None:
+        for colaborador in colaboradores:
+            self.escrever(colaborador)
+
+    def concluir(self) -> str:
+        """Fecha o arquivo e publica o CSV com o nome final"""
+        self._arquivo.close()
+        os.replace(self._temporario, self.caminho)
+        return self.caminho
+
+    def descartar(self) -> None:
+        """Fecha e apaga o CSV parcial (nada aparece com o nome final)"""
+        self._arquivo.close()
+        try:
+            os.remove(self._temporario)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "ExportadorCSV":
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, traceback) -> None:
+        if not self.aberto:
+            return
+        if tipo_excecao is None:
+            self.concluir()
+        else:
+            self.descartar()
@@ -1,7 +1,57 @@
-from bs4 import BeautifulSoup
+from datetime import datetime
+import numpy as np
 import pandas as pd
 import re
 import csv
+from operator import attrgetter
+
+from services.colaborador import CAMPOS, CAMPOS_NUMERICOS, Colaborador
+from services.regras_texto import BUSCA_CPF, REGRAS_COLABORADOR
+
+
+# Mapeamento de operações para IDs
+OPERACOES_MAP = {
+    "NOVA RIO": {"id_cad_filiais": 2, "id_cad_operacoes": 2},
+    "NOVA MINAS": {"id_cad_filiais": 3, "id_cad_operacoes": 2},
+}
+
+SUFIXO_COLUNAS = "_log_prontuarios_gente_gestao"
+
+# Colunas DECIMAL(10,2) no banco (fadiga e telemetria)
+CAMPOS_DECIMAIS = frozenset(
+    [
+        "alimento",
+        "fumando",
+        "oclusao",
+        "cinto",
+        "velo1",
+        "velo2",
+        "velo3",
+        "via1",
+        "via2",
+        "via3",
+        "forcag",
+        "frenagem",
+        "power",
+    ]
+)
+
+# Colunas com poucos valores distintos
+CAMPOS_CATEGORICOS = frozenset(["situacao_empregado", "cargo", "status", "operacao"])
+
+# CPF, status e categoria (função) das linhas sem a grid principal
+_REGRAS_LINHA = REGRAS_COLABORADOR.selecionar("cpf", "status", "funcao")
+
+# Leitura dos atributos do Colaborador na ordem das colunas do banco
+_valores_colaborador = attrgetter(*CAMPOS)
+_COLUNAS_BANCO = tuple(f"{campo}{SUFIXO_COLUNAS}" for campo in CAMPOS)
+
+# Numéricos gravados como texto ("0.00"), como pontuacao e celular
+_COLUNAS_NUMERICAS_TEXTO = tuple(
+    f"{campo}{SUFIXO_COLUNAS}"
+    for campo in CAMPOS_NUMERICOS
+    if campo not in CAMPOS_DECIMAIS
+)
 
 
 class DataService:
@@ -10,6 +60,9 @@ class DataService:
         """
         Extrai os dados dos colaboradores da tabela HTML
         """
+        # Carregado só aqui, como em AutomacaoGEG._extrair_linhas
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html_content, "html.parser")
         colaboradores = []
 
@@ -35,7 +88,7 @@ class DataService:
         # Método 3: Procura por elementos que contenham dados específicos (CPF, nomes, etc)
         if not linhas_tabela:
             # Procura por elementos que contenham padrões de CPF
-            elementos_cpf = soup.find_all(text=re.compile(r"\d{3}\.\d{3}\.\d{3}-\d{2}"))
+            elementos_cpf = soup.find_all(text=BUSCA_CPF)
             for elemento in elementos_cpf:
                 # Pega o elemento pai que pode conter toda a linha de dados
                 linha_pai = elemento.parent
@@ -62,25 +115,16 @@ class DataService:
             # Extrai todo o texto da linha
             texto_linha = linha_elemento.get_text(separator=" ", strip=True)
 
-            # Padrões para extrair informações específicas
-            # CPF: ###.###.###-##
-            cpf_match = re.search(r"(\d{3}\.\d{3}\.\d{3}-\d{2})", texto_linha)
-
-            # Nome: geralmente aparece antes do CPF ou em posição específica
-            # Status: ATIVO, LIBERADO, etc.
-            status_match = re.search(
-                r"(ATIVO|INATIVO|LIBERADO|BLOQUEADO|AFASTADO|FÉRIAS)", texto_linha
-            )
-
-            # Empresa/Categoria: Manobrista, Motorista Carreta, etc.
-            categoria_match = re.search(r"(Manobrista|Motorista\s+\w+)", texto_linha)
+            # CPF (###.###.###-##), status (ATIVO, LIBERADO, etc.) e
+            # categoria (Manobrista, Motorista Carreta, etc.) com as regras compiladas
+            campos = _REGRAS_LINHA.extrair(texto_linha)
 
-            if cpf_match:
+            if campos:
                 colaborador = {
                     "linha_completa": texto_linha,
-                    "cpf": cpf_match.group(1) if cpf_match else None,
-                    "status": status_match.group(1) if status_match else None,
-                    "categoria": categoria_match.group(1) if categoria_match else None,
+                    "cpf": campos["cpf"],
+                    "status": campos["status"],
+                    "categoria": campos["funcao"],
                 }
 
                 # Tenta extrair o nome (geralmente está entre o status e o CPF)
@@ -177,41 +221,149 @@ class DataService:
 
 
     @staticmethod
-    def converter_dados_para_df(colaboradores):
+    def converter_dados_para_df(colaboradores, data_atualizacao=None):
         """
         Converte a lista de colaboradores para um DataFrame do pandas, padronizando colunas e tipos
-        """
-        import pandas as pd
 
+        Decimais em float32, campos repetitivos como category e vencimento em
+        datetime64
+        """
         if not colaboradores:
             return None
 
         # Cria DataFrame
-        df = pd.DataFrame(colaboradores)
-
-        # Mapeamento de operações para IDs
-        OPERACOES_MAP = {
-            "NOVA RIO": {"id_cad_filiais": 2, "id_cad_operacoes": 2},
-            "NOVA MINAS": {"id_cad_filiais": 3, "id_cad_operacoes": 2},
-        }
-
-        # Conversão de datas e atualização de timestamp
-        df["vencimento"] = pd.to_datetime(
-            df["vencimento"],
-            errors="coerce",
-            format="%d/%m/%Y",
-        )
-        df["data_atualizacao"] = pd.Timestamp.now()
+        if isinstance(colaboradores[0], Colaborador):
+            df = DataService._df_colaboradores(colaboradores)
+        else:
+            df = pd.DataFrame(colaboradores)
+
+        for campo in df.columns:
+            if campo in CAMPOS_DECIMAIS:
+                df[campo] = DataService._coluna_decimal(df[campo].to_numpy())
+            elif campo in CAMPOS_CATEGORICOS:
+                df[campo] = pd.Categorical(df[campo])
+            elif campo == "vencimento":
+                df[campo] = DataService._coluna_data(df[campo])
+        df["data_atualizacao"] = pd.Timestamp(data_atualizacao or datetime.now())
 
         # Renomeia colunas para padrão do banco
-        df.columns = [f"{col}_log_prontuarios_gente_gestao" for col in df.columns]
+        df.columns = [f"{col}{SUFIXO_COLUNAS}" for col in df.columns]
+
+        # Aplica mapeamento de IDs de operação/filial (operação fora do mapa = 0)
+        coluna_operacao = f"operacao{SUFIXO_COLUNAS}"
+        operacoes = df[coluna_operacao] if coluna_operacao in df else None
+        for coluna_id in ("id_cad_filiais", "id_cad_operacoes"):
+            df[coluna_id] = DataService._ids_operacao(operacoes, coluna_id, len(df))
 
-        # Aplica mapeamento de IDs de operação/filial
-        df["id_cad_filiais"] = df["operacao_log_prontuarios_gente_gestao"].map(
-            lambda op: OPERACOES_MAP.get(op, {}).get("id_cad_filiais", 0)
+        return df
+
+    @staticmethod
+    def _df_colaboradores(colaboradores):
+        """Monta as colunas direto dos atributos, sem um dicionário por linha"""
+        colunas = {}
+        for campo in CAMPOS:
+            if campo in CAMPOS_DECIMAIS:
+                colunas[campo] = np.fromiter(
+                    map(attrgetter(campo), colaboradores),
+                    dtype=np.float32,
+                    count=len(colaboradores),
+                )
+            else:
+                colunas[campo] = [colaborador[campo] for colaborador in colaboradores]
+        return pd.DataFrame(colunas)
+
+    @staticmethod
+    def _coluna_data(valores):
+        """dd/mm/aaaa -> datetime64, convertendo cada data distinta uma única vez"""
+        categorias = pd.Categorical(valores)
+        datas = pd.to_datetime(
+            categorias.categories, errors="coerce", format="%d/%m/%Y"
         )
-        df["id_cad_operacoes"] = df["operacao_log_prontuarios_gente_gestao"].map(
-            lambda op: OPERACOES_MAP.get(op, {}).get("id_cad_operacoes", 0)
+        # Código -1 (valor ausente) vira NaT
+        return pd.DatetimeIndex(
+            np.append(datas.to_numpy(), np.datetime64("NaT"))[categorias.codes]
         )
 
-        return df
+    @staticmethod
+    def _coluna_decimal(valores):
+        """Textos como "1.50" para float32 (inválidos viram NaN)"""
+        try:
+            return valores.astype(np.float32)
+        except (TypeError, ValueError):
+            return pd.to_numeric(
+                pd.Series(valores, dtype=object), errors="coerce"
+            ).astype(np.float32)
+
+    @staticmethod
+    def _ids_operacao(operacoes, coluna_id, total):
+        """Busca vetorizada do ID no OPERACOES_MAP"""
+        ids = np.array(
+            [ids_op[coluna_id] for ids_op in OPERACOES_MAP.values()] + [0],
+            dtype=np.int32,
+        )
+        if operacoes is None:
+            return np.zeros(total, dtype=np.int32)
+        # get_indexer devolve -1 para operações fora do mapa, que cai no 0 final
+        posicoes = pd.Index(list(OPERACOES_MAP)).get_indexer(operacoes.astype(object))
+        return ids[posicoes]
+
+    @staticmethod
+    def converter_dados_para_registros(colaboradores, data_atualizacao=None):
+        """
+        Converte os colaboradores direto para registros do banco (sem pandas),
+        com as mesmas colunas e valores do converter_dados_para_df
+        """
+        if not colaboradores:
+            return []
+
+        data_atualizacao = data_atualizacao or datetime.now()
+        registros = []
+        for colaborador in colaboradores:
+            if isinstance(colaborador, Colaborador):
+                registro = DataService._registro_colaborador(colaborador)
+            else:
+                registro = {
+                    f"{campo}{SUFIXO_COLUNAS}": (
+                        DataService._converter_decimal(valor)
+                        if campo in CAMPOS_DECIMAIS
+                        else valor
+                    )
+                    for campo, valor in colaborador.items()
+                }
+
+            if "vencimento" in colaborador:
+                registro[f"vencimento{SUFIXO_COLUNAS}"] = DataService._converter_data(
+                    colaborador["vencimento"]
+                )
+            registro[f"data_atualizacao{SUFIXO_COLUNAS}"] = data_atualizacao
+
+            ids = OPERACOES_MAP.get(colaborador.get("operacao"), {})
+            registro["id_cad_filiais"] = ids.get("id_cad_filiais", 0)
+            registro["id_cad_operacoes"] = ids.get("id_cad_operacoes", 0)
+            registros.append(registro)
+
+        return registros
+
+    @staticmethod
+    def _registro_colaborador(colaborador):
+        """Registro a partir dos atributos tipados (decimais já são float)"""
+        registro = dict(zip(_COLUNAS_BANCO, _valores_colaborador(colaborador)))
+        for coluna in _COLUNAS_NUMERICAS_TEXTO:
+            registro[coluna] = f"{registro[coluna]:.2f}"
+        return registro
+
+    @staticmethod
+    def _converter_decimal(valor):
+        """Texto -> float (None se inválido, como errors="coerce")"""
+        try:
+            return float(valor)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _converter_data(valor):
+        """dd/mm/aaaa -> datetime (None se inválida, como errors="coerce")"""
+        try:
+            return datetime.strptime(valor, "%d/%m/%Y")
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,444 @@
+"""
+Gravação assíncrona dos arquivos de debug (páginas e respostas intermediárias)
+Os arquivos vão para uma fila atendida por uma thread própria, são comprimidos
+com gzip e separados por execução e credencial; uma política de retenção por
+idade e tamanho total limpa os mais antigos. Respostas lidas em blocos vão cruas
+para o disco, sem passar inteiras pela memória, e são comprimidas pela thread
+do gravador
+"""
+
+import atexit
+import gzip
+import io
+import os
+import random
+import shutil
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from utils.file_util import slug_credencial
+
+# Fila acima desta fração da capacidade: artefatos passam a ser amostrados
+FRACAO_PRESSAO = 0.5
+
+# Blocos lidos do arquivo cru ao comprimir um artefato
+TAMANHO_BLOCO_COMPRESSAO = 1024 * 1024
+
+
+class ArtefatoDebug(io.TextIOBase):
+    """
+    Arquivo de debug escrito aos poucos (ex.: resposta lida em blocos).
+
+    Cada bloco vai cru para um arquivo temporário na pasta de destino, sem
+    guardar o conteúdo em memória nem comprimir na thread de quem escreve; o
+    close() enfileira a finalização (comprimir, renomear e contabilizar). Uma
+    falha de escrita descarta o arquivo sem interromper quem está escrevendo.
+    """
+
+    def __init__(self, gravador: "GravadorDebug", caminho: str, nome: str):
+        super().__init__()
+        self._gravador = gravador
+        self.caminho = caminho
+        self.nome = nome
+        # Conteúdo cru; com compressão, o .gz sai dele na finalização
+        self.temporario = f"{caminho}.bruto.tmp"
+        self.bytes_originais = 0
+        self.falhou = False
+
+        try:
+            self._arquivo = self._abrir_temporario()
+        except FileNotFoundError:
+            # A retenção pode ter removido a pasta vazia entre o makedirs e o open
+            self._arquivo = self._abrir_temporario()
+
+    def _abrir_temporario(self):
+        os.makedirs(os.path.dirname(self.caminho), mode=0o700, exist_ok=True)
+        return open(self.temporario, "wb")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, texto: str) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not self.falhou:
+            try:
+                dados = texto.encode("utf-8")
+                self._arquivo.write(dados)
+                self.bytes_originais += len(dados)
+            except Exception as e:
+                print(f"Erro ao gravar arquivo debug {self.nome}: {e}")
+                self.falhou = True
+        return len(texto)
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._arquivo.close()
+            except Exception as e:
+                if not self.falhou:
+                    print(f"Erro ao gravar arquivo debug {self.nome}: {e}")
+                self.falhou = True
+            self._gravador._finalizar(self)
+        super().close()
+
+    def finalizar(self) -> Tuple[int, int]:
+        """Comprime e publica o arquivo com o nome final (thread do gravador)"""
+        try:
+            if self._gravador.comprimir:
+                comprimido = f"{self.caminho}.tmp"
+                try:
+                    with open(self.temporario, "rb") as origem, gzip.open(
+                        comprimido, "wb", compresslevel=6
+                    ) as destino:
+                        shutil.copyfileobj(origem, destino, TAMANHO_BLOCO_COMPRESSAO)
+                    os.replace(comprimido, self.caminho)
+                except Exception:
+                    try:
+                        os.remove(comprimido)
+                    except OSError:
+                        pass
+                    raise
+                self.descartar()
+            else:
+                os.replace(self.temporario, self.caminho)
+        except Exception:
+            self.descartar()
+            raise
+        return self.bytes_originais, os.path.getsize(self.caminho)
+
+    def descartar(self) -> None:
+        try:
+            os.remove(self.temporario)
+        except OSError:
+            pass
+
+
+class GravadorDebug:
+    """
+    Fila limitada de arquivos de debug gravados em segundo plano.
+
+    `salvar` nunca bloqueia quem está fazendo requisições: com a fila acima de
+    FRACAO_PRESSAO da capacidade os arquivos são amostrados
+    (GEG_DEBUG_AMOSTRAGEM) e com a fila cheia são descartados. `abrir` decide o
+    mesmo ao abrir o arquivo, antes de qualquer dado; o conteúdo escrito não
+    ocupa a fila, então respostas grandes não são descartadas pelo tamanho. Os
+    arquivos ficam em <diretorio>/<execucao>/<credencial>/<nome>.gz.
+    """
+
+    def __init__(
+        self,
+        diretorio: Optional[str] = None,
+        max_arquivos_fila: Optional[int] = None,
+        max_mb_fila: Optional[float] = None,
+        amostragem: Optional[float] = None,
+        retencao_dias: Optional[float] = None,
+        retencao_mb: Optional[float] = None,
+        comprimir: Optional[bool] = None,
+        intervalo_retencao_s: Optional[float] = None,
+    ):
+        self.diretorio = diretorio or os.getenv(
+            "GEG_DEBUG_DIR", os.path.join("output", "debug")
+        )
+        self.max_arquivos_fila = max(
+            1, max_arquivos_fila or int(os.getenv("GEG_DEBUG_FILA_MAX", "32"))
+        )
+        self.max_bytes_fila = int(
+            (max_mb_fila or float(os.getenv("GEG_DEBUG_FILA_MB", "64"))) * 1024 * 1024
+        )
+        self.amostragem = (
+            amostragem
+            if amostragem is not None
+            else float(os.getenv("GEG_DEBUG_AMOSTRAGEM", "0.5"))
+        )
+        self.retencao_dias = (
+            retencao_dias
+            if retencao_dias is not None
+            else float(os.getenv("GEG_DEBUG_RETENCAO_DIAS", "7"))
+        )
+        self.retencao_bytes = int(
+            (
+                retencao_mb
+                if retencao_mb is not None
+                else float(os.getenv("GEG_DEBUG_RETENCAO_MB", "500"))
+            )
+            * 1024
+            * 1024
+        )
+        self.comprimir = (
+            comprimir
+            if comprimir is not None
+            else os.getenv("GEG_DEBUG_COMPRIMIR", "1") != "0"
+        )
+        # A retenção percorre toda a pasta de debug: roda ao iniciar a thread e
+        # depois no máximo uma vez por intervalo, quando a fila esvazia
+        self.intervalo_retencao_s = (
+            intervalo_retencao_s
+            if intervalo_retencao_s is not None
+            else float(os.getenv("GEG_DEBUG_RETENCAO_INTERVALO_S", "600"))
+        )
+
+        # (caminho, conteúdo ou artefato já gravado a finalizar, nome)
+        self._fila: Deque[Tuple[str, Union[str, ArtefatoDebug], str]] = deque()
+        self._bytes_fila = 0  # em caracteres, próximo dos bytes do HTML
+        self._gravando = 0
+        self._condicao = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._aleatorio = random.Random()
+
+        self.gravados = 0
+        self.amostrados = 0
+        self.descartados = 0
+        self.falhas = 0
+        self.bytes_originais = 0
+        self.bytes_gravados = 0
+        self.removidos_retencao = 0
+        self._ultima_retencao = 0.0
+
+    def salvar(
+        self,
+        nome: str,
+        conteudo: str,
+        execucao: Optional[str] = None,
+        credencial: Optional[str] = None,
+    ) -> bool:
+        """Enfileira o arquivo; False se foi amostrado/descartado pela carga"""
+        caminho = self._caminho(nome, execucao, credencial)
+        tamanho = len(conteudo)
+
+        with self._condicao:
+            if not self._admitir(tamanho):
+                return False
+            self._fila.append((caminho, conteudo, nome))
+            self._bytes_fila += tamanho
+            self._iniciar_thread()
+            self._condicao.notify_all()
+        return True
+
+    def abrir(
+        self,
+        nome: str,
+        execucao: Optional[str] = None,
+        credencial: Optional[str] = None,
+    ) -> Optional[ArtefatoDebug]:
+        """
+        Arquivo para escrita incremental direto no disco, finalizado em segundo
+        plano ao ser fechado; None se foi amostrado/descartado pela carga
+        """
+        with self._condicao:
+            if not self._admitir(0):
+                return None
+        return ArtefatoDebug(self, self._caminho(nome, execucao, credencial), nome)
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Espera a fila esvaziar; False se o timeout terminou antes"""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._condicao:
+            while self._fila or self._gravando:
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                self._condicao.wait(restante)
+        return True
+
+    def aplicar_retencao(self) -> int:
+        """Remove arquivos mais velhos que a retenção e, se preciso, os mais antigos
+        até caber no limite de tamanho. Retorna quantos foram removidos."""
+        arquivos: List[Tuple[float, int, str]] = []
+        for raiz, _, nomes in os.walk(self.diretorio):
+            for nome in nomes:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                arquivos.append((info.st_mtime, info.st_size, caminho))
+
+        arquivos.sort()
+        limite_idade = time.time() - self.retencao_dias * 86400
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        removidos = 0
+        for modificado_em, tamanho, caminho in arquivos:
+            expirado = modificado_em < limite_idade
+            if not expirado and total <= self.retencao_bytes:
+                break
+            # Artefato ainda sendo escrito: só sai por idade (sobra de um processo
+            # interrompido)
+            if not expirado and caminho.endswith(".tmp"):
+                continue
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            total -= tamanho
+            removidos += 1
+
+        self._remover_diretorios_vazios()
+        with self._condicao:
+            self.removidos_retencao += removidos
+            self._ultima_retencao = time.monotonic()
+        return removidos
+
+    def estatisticas(self) -> Dict[str, int]:
+        with self._condicao:
+            return {
+                "gravados": self.gravados,
+                "amostrados": self.amostrados,
+                "descartados": self.descartados,
+                "falhas": self.falhas,
+                "na_fila": len(self._fila),
+                "bytes_originais": self.bytes_originais,
+                "bytes_gravados": self.bytes_gravados,
+                "removidos_retencao": self.removidos_retencao,
+            }
+
+    def _admitir(self, tamanho: int) -> bool:
+        """Se um arquivo de `tamanho` caracteres entra na fila (com _condicao)"""
+        ocupacao = max(
+            len(self._fila) / self.max_arquivos_fila,
+            (self._bytes_fila + tamanho) / self.max_bytes_fila,
+        )
+        if ocupacao > 1:
+            self.descartados += 1
+            return False
+        if ocupacao > FRACAO_PRESSAO and self._aleatorio.random() >= self.amostragem:
+            self.amostrados += 1
+            return False
+        return True
+
+    def _finalizar(self, artefato: ArtefatoDebug) -> None:
+        """Enfileira a finalização de um artefato fechado"""
+        if artefato.falhou:
+            artefato.descartar()
+            with self._condicao:
+                self.falhas += 1
+            return
+        with self._condicao:
+            self._fila.append((artefato.caminho, artefato, artefato.nome))
+            self._iniciar_thread()
+            self._condicao.notify_all()
+
+    def _caminho(self, nome: str, execucao: Optional[str], credencial: Optional[str]):
+        # slug_credencial também serve para deixar a execução segura como pasta
+        pasta = os.path.join(
+            self.diretorio,
+            slug_credencial(execucao or "avulso"),
+            slug_credencial(credencial or "sem_credencial"),
+        )
+        return os.path.join(pasta, nome + (".gz" if self.comprimir else ""))
+
+    def _iniciar_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._processar_fila, name="geg-debug-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _processar_fila(self) -> None:
+        self.aplicar_retencao()
+        while True:
+            with self._condicao:
+                while not self._fila:
+                    self._condicao.wait()
+                caminho, conteudo, nome = self._fila.popleft()
+                if isinstance(conteudo, str):
+                    self._bytes_fila -= len(conteudo)
+                self._gravando += 1
+
+            try:
+                if isinstance(conteudo, ArtefatoDebug):
+                    bytes_originais, bytes_gravados = conteudo.finalizar()
+                else:
+                    bytes_originais, bytes_gravados = self._gravar(caminho, conteudo)
+                falhou = False
+            except Exception as e:
+                print(f"Erro ao salvar arquivo debug {nome}: {e}")
+                bytes_originais, bytes_gravados, falhou = 0, 0, True
+
+            with self._condicao:
+                self._gravando -= 1
+                if falhou:
+                    self.falhas += 1
+                else:
+                    self.gravados += 1
+                    self.bytes_originais += bytes_originais
+                    self.bytes_gravados += bytes_gravados
+                reter = (
+                    not self._fila
+                    and time.monotonic() - self._ultima_retencao
+                    >= self.intervalo_retencao_s
+                )
+
+            if reter:
+                self.aplicar_retencao()
+            with self._condicao:
+                self._condicao.notify_all()
+
+    def _gravar(self, caminho: str, conteudo: str) -> Tuple[int, int]:
+        """Grava em arquivo temporário e renomeia (leitores nunca veem meio arquivo)"""
+        pasta = os.path.dirname(caminho)
+        os.makedirs(pasta, mode=0o700, exist_ok=True)
+        temporario = f"{caminho}.tmp"
+        dados = conteudo.encode("utf-8")
+        try:
+            if self.comprimir:
+                with gzip.open(temporario, "wb", compresslevel=6) as arquivo:
+                    arquivo.write(dados)
+            else:
+                with open(temporario, "wb") as arquivo:
+                    arquivo.write(dados)
+            os.replace(temporario, caminho)
+        except Exception:
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            raise
+        return len(dados), os.path.getsize(caminho)
+
+    def _remover_diretorios_vazios(self) -> None:
+        for raiz, _, _ in sorted(os.walk(self.diretorio), reverse=True):
+            if raiz != self.diretorio:
+                try:
+                    os.rmdir(raiz)
+                except OSError:
+                    pass
+
+
+_gravador_padrao: Optional[GravadorDebug] = None
+_gravador_padrao_lock = threading.Lock()
+
+
+def obter_gravador_debug() -> GravadorDebug:
+    """
+    Retorna o gravador compartilhado pelo processo.
+
+    Ao sair, o processo espera até GEG_DEBUG_ESPERA_SAIDA segundos (padrão 10)
+    pelos arquivos ainda na fila.
+    """
+    global _gravador_padrao
+
+    with _gravador_padrao_lock:
+        if _gravador_padrao is None:
+            _gravador_padrao = GravadorDebug()
+            atexit.register(
+                _gravador_padrao.aguardar,
+                float(os.getenv("GEG_DEBUG_ESPERA_SAIDA", "10")),
+            )
+        return _gravador_padrao
+
+
+def _descartar_gravador_herdado() -> None:
+    global _gravador_padrao, _gravador_padrao_lock
+
+    _gravador_padrao = None
+    _gravador_padrao_lock = threading.Lock()
+
+
+# Processos filhos (executor de processos do agendador) não herdam a fila do pai:
+# a thread de gravação não existe no filho e a fila/condição podem estar no meio
+# de uma operação; o filho cria o próprio gravador
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_descartar_gravador_herdado)
@@ -0,0 +1,205 @@
+"""
+Sincronização incremental da log_prontuarios_gente_gestao
+Guarda um hash do conteúdo de cada CPF em um SQLite local e envia ao MySQL apenas
+as linhas novas ou alteradas
+"""
+
+import hashlib
+import os
+import sqlite3
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+COLUNA_CHAVE = "cpf_log_prontuarios_gente_gestao"
+
+# Colunas que mudam a cada execução e não representam alteração de conteúdo
+COLUNAS_IGNORADAS = ("data_atualizacao_log_prontuarios_gente_gestao",)
+
+_SEPARADOR = "\x1f"
+
+
+def _normalizar_coluna(serie: pd.Series) -> pd.Series:
+    """Representação textual estável da coluna (independe do dtype usado)"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.dt.strftime("%Y-%m-%d %H:%M:%S").fillna("")
+    if pd.api.types.is_float_dtype(serie):
+        return serie.map(lambda valor: "" if pd.isna(valor) else f"{valor:.2f}")
+
+    serie = serie.astype(object)
+    return serie.where(serie.notna(), "").astype(str)
+
+
+def _normalizar_valor(valor) -> str:
+    """Mesma representação de _normalizar_coluna, para um valor avulso"""
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return "" if valor != valor else valor.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(valor, float):
+        return "" if math.isnan(valor) else f"{valor:.2f}"
+    return str(valor)
+
+
+class DeltaSync:
+    """
+    Detecta linhas novas/alteradas comparando com os hashes da última gravação.
+
+    Os hashes só são atualizados em `confirmar()`, depois que a gravação no banco
+    deu certo. Linhas com hash mais antigo que `dias_ressincronizar` são
+    regravadas mesmo sem mudança, para que alterações feitas direto no banco
+    não fiquem permanentes.
+    """
+
+    def __init__(
+        self,
+        caminho: Optional[str] = None,
+        coluna_chave: str = COLUNA_CHAVE,
+        colunas_ignoradas: Iterable[str] = COLUNAS_IGNORADAS,
+        dias_ressincronizar: Optional[float] = None,
+    ):
+        self.caminho = caminho or os.getenv(
+            "GEG_DELTA_SYNC_DB", os.path.join("output", "delta_sync.sqlite3")
+        )
+        self.coluna_chave = coluna_chave
+        self.colunas_ignoradas = frozenset(colunas_ignoradas)
+        self.dias_ressincronizar = (
+            dias_ressincronizar
+            if dias_ressincronizar is not None
+            else float(os.getenv("GEG_DELTA_SYNC_RESSINCRONIZAR_DIAS", "7"))
+        )
+
+        self.resumo: Dict[str, int] = {}
+        self._pendentes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def calcular_hashes(self, df: pd.DataFrame) -> pd.Series:
+        """Hash do conteúdo de cada linha (sha1 das colunas normalizadas)"""
+        colunas = sorted(c for c in df.columns if c not in self.colunas_ignoradas)
+        # O nome da coluna entra no hash: mudanças de esquema forçam a regravação
+        prefixos = [f"{coluna}=" for coluna in colunas]
+        valores = [_normalizar_coluna(df[coluna]).tolist() for coluna in colunas]
+
+        hashes = [
+            hashlib.sha1(
+                _SEPARADOR.join(map(str.__add__, prefixos, linha)).encode("utf-8")
+            ).hexdigest()
+            for linha in zip(*valores)
+        ]
+        return pd.Series(hashes, index=df.index, dtype=object)
+
+    def hash_registro(self, registro: Dict) -> str:
+        """Hash de um registro; igual ao de calcular_hashes para a mesma linha"""
+        colunas = sorted(c for c in registro if c not in self.colunas_ignoradas)
+        texto = _SEPARADOR.join(
+            f"{coluna}={_normalizar_valor(registro[coluna])}" for coluna in colunas
+        )
+        return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+    def filtrar(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """
+        Retorna as linhas que precisam ser gravadas e o resumo da comparação.
+
+        Com CPFs repetidos prevalece a última linha (como no upsert); todas as
+        linhas de um CPF alterado são mantidas, na ordem original.
+        """
+        with self._lock:
+            hashes = self.calcular_hashes(df)
+            chaves = df[self.coluna_chave].astype(str)
+            alteradas = self._comparar(dict(zip(chaves, hashes)))
+            return df[chaves.isin(alteradas).values], dict(self.resumo)
+
+    def filtrar_registros(
+        self, registros: List[Dict]
+    ) -> Tuple[List[Dict], Dict[str, int]]:
+        """Versão de `filtrar` para registros (dicionários com as colunas do banco)"""
+        with self._lock:
+            chaves = [str(registro[self.coluna_chave]) for registro in registros]
+            alteradas = self._comparar(
+                dict(zip(chaves, map(self.hash_registro, registros)))
+            )
+            return [
+                registro
+                for chave, registro in zip(chaves, registros)
+                if chave in alteradas
+            ], dict(self.resumo)
+
+    def _comparar(self, atuais: Dict[str, str]) -> Set[str]:
+        """Classifica os CPFs contra os hashes gravados e guarda os pendentes"""
+        gravados = self._carregar_hashes(atuais.keys())
+        limite = time.time() - self.dias_ressincronizar * 86400
+
+        inseridos = atualizados = inalterados = ressincronizados = 0
+        alteradas = set()
+        for chave, hash_atual in atuais.items():
+            hash_gravado, gravado_em = gravados.get(chave, (None, 0.0))
+            if hash_gravado is None:
+                inseridos += 1
+            elif hash_gravado != hash_atual:
+                atualizados += 1
+            elif gravado_em < limite:
+                ressincronizados += 1
+            else:
+                inalterados += 1
+                continue
+            alteradas.add(chave)
+
+        self._pendentes = {chave: atuais[chave] for chave in alteradas}
+        self.resumo = {
+            "inseridos": inseridos,
+            "atualizados": atualizados,
+            "inalterados": inalterados,
+            "ressincronizados": ressincronizados,
+        }
+        return alteradas
+
+    def confirmar(self) -> None:
+        """Grava os hashes das linhas enviadas na última filtragem"""
+        with self._lock:
+            if not self._pendentes:
+                return
+            agora = time.time()
+            with self._conexao() as conexao:
+                conexao.executemany(
+                    "INSERT OR REPLACE INTO hashes (chave, hash, gravado_em) "
+                    "VALUES (?, ?, ?)",
+                    [(chave, h, agora) for chave, h in self._pendentes.items()],
+                )
+            self._pendentes = {}
+
+    def descartar(self) -> None:
+        """Esquece a última filtragem (gravação falhou, tenta tudo de novo)"""
+        with self._lock:
+            self._pendentes = {}
+
+    def _carregar_hashes(self, chaves: Iterable[str]) -> Dict[str, Tuple[str, float]]:
+        chaves = set(chaves)
+        with self._conexao() as conexao:
+            cursor = conexao.execute("SELECT chave, hash, gravado_em FROM hashes")
+            return {
+                chave: (h, gravado_em)
+                for chave, h, gravado_em in cursor
+                if chave in chaves
+            }
+
+    @contextmanager
+    def _conexao(self) -> Iterator[sqlite3.Connection]:
+        """Conexão com commit ao final do bloco (rollback em caso de erro)"""
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        conexao = sqlite3.connect(self.caminho)
+        try:
+            with conexao:
+                conexao.execute(
+                    "CREATE TABLE IF NOT EXISTS hashes (chave TEXT PRIMARY KEY, "
+                    "hash TEXT NOT NULL, gravado_em REAL NOT NULL)"
+                )
+                yield conexao
+        finally:
+            conexao.close()
@@ -0,0 +1,187 @@
+"""
+Decodificador incremental de envelopes de callback do DevExpress
+Lê a resposta em blocos e devolve o HTML decodificado sem montar cópias completas
+"""
+
+import html
+import re
+from typing import Iterable, Iterator
+
+
+MARCADOR_DX = "s/*DX*/"
+MARCADOR_RESULTADO = "'result':'"
+MARCADOR_FIM = "','id':"
+
+TAMANHO_BLOCO_PADRAO = 64 * 1024
+
+# Escapes JavaScript tratados pelo portal, na ordem de prioridade do replace original
+_ESCAPES_JS = (
+    ("\\r\\n", "\n"),
+    ("\\n", "\n"),
+    ('\\"', '"'),
+    ("\\'", "'"),
+    ("\\/", "/"),
+)
+
+# Caracteres que encerram qualquer entidade HTML (nomeada ou numérica)
+_PADRAO_FIM_ENTIDADE = re.compile(r"[\t\n\f <;]")
+_TAMANHO_MAXIMO_ENTIDADE = 64
+
+
+def _desfazer_escapes_js(trecho: str) -> str:
+    # Aplicado bloco a bloco: cada trecho é percorrido enquanto ainda está em cache
+    for escape, valor in _ESCAPES_JS:
+        if escape in trecho:
+            trecho = trecho.replace(escape, valor)
+    return trecho
+
+
+class DevExpressDecoder:
+    """
+    Decodifica o envelope s/*DX*/{'result':'...','id':...} de forma incremental.
+
+    Cada bloco recebido passa uma única vez pelos escapes JavaScript e pelas
+    entidades HTML; apenas a cauda que pode conter um escape ou entidade
+    incompleta fica retida até o próximo bloco.
+    """
+
+    def __init__(self):
+        self.envelope_encontrado = False
+        self.completo = False
+        self.caracteres_lidos = 0
+        self.caracteres_emitidos = 0
+
+    def decodificar_stream(self, blocos: Iterable[str]) -> Iterator[str]:
+        """
+        Consome blocos de texto da resposta e gera blocos de HTML decodificado.
+
+        Se a resposta não for um envelope DevExpress, os blocos são repassados
+        sem alteração.
+        """
+        self.envelope_encontrado = False
+        self.completo = False
+        self.caracteres_lidos = 0
+        self.caracteres_emitidos = 0
+
+        iterador = iter(blocos)
+        cabecalho = []
+        buffer = ""
+
+        # Fase 1: localiza o início do conteúdo ('result':')
+        for bloco in iterador:
+            self.caracteres_lidos += len(bloco)
+            cabecalho.append(bloco)
+            buffer += bloco
+
+            pos_dx = buffer.find(MARCADOR_DX)
+            if pos_dx < 0:
+                continue
+            pos_resultado = buffer.find(MARCADOR_RESULTADO, pos_dx + len(MARCADOR_DX))
+            if pos_resultado < 0:
+                continue
+
+            self.envelope_encontrado = True
+            buffer = buffer[pos_resultado + len(MARCADOR_RESULTADO) :]
+            cabecalho = []
+            break
+
+        if not self.envelope_encontrado:
+            # Não é um envelope DevExpress: devolve o conteúdo original
+            for bloco in cabecalho:
+                self.caracteres_emitidos += len(bloco)
+                yield bloco
+            return
+
+        # Fase 2: decodifica o conteúdo até o marcador de fim
+        pendente_html = ""
+        while True:
+            pos_fim = buffer.find(MARCADOR_FIM)
+            if pos_fim >= 0:
+                self.completo = True
+                yield from self._emitir(buffer[:pos_fim], pendente_html, final=True)
+                return
+
+            limite = len(buffer) - (len(MARCADOR_FIM) - 1)
+            corte = self._corte_escapes(buffer, max(limite, 0))
+            if corte > 0:
+                pendente_html, saida = self._decodificar_trecho(
+                    buffer[:corte], pendente_html
+                )
+                if saida:
+                    self.caracteres_emitidos += len(saida)
+                    yield saida
+                buffer = buffer[corte:]
+
+            bloco = next(iterador, None)
+            if bloco is None:
+                # Fim do stream sem marcador de fim: emite o restante
+                yield from self._emitir(buffer, pendente_html, final=True)
+                return
+            self.caracteres_lidos += len(bloco)
+            buffer += bloco
+
+    def decodificar(self, texto: str) -> str:
+        """
+        Decodifica uma resposta já carregada em memória.
+
+        Mantém o comportamento do processamento original: se o envelope estiver
+        incompleto, devolve o texto recebido.
+        """
+        pos_dx = texto.find(MARCADOR_DX)
+        if pos_dx < 0 or "result" not in texto:
+            return texto
+        pos_resultado = texto.find(MARCADOR_RESULTADO, pos_dx + len(MARCADOR_DX))
+        if pos_resultado < 0:
+            return texto
+        if texto.find(MARCADOR_FIM, pos_resultado + len(MARCADOR_RESULTADO)) <= (
+            pos_resultado + len(MARCADOR_RESULTADO)
+        ):
+            return texto
+
+        return "".join(self.decodificar_stream(self.fatiar(texto)))
+
+    @staticmethod
+    def fatiar(texto: str, tamanho: int = TAMANHO_BLOCO_PADRAO) -> Iterator[str]:
+        """Divide um texto em blocos para alimentar o decodificador"""
+        for inicio in range(0, len(texto), tamanho):
+            yield texto[inicio : inicio + tamanho]
+
+    def _emitir(self, trecho: str, pendente_html: str, final: bool) -> Iterator[str]:
+        pendente_html, saida = self._decodificar_trecho(trecho, pendente_html)
+        if final and pendente_html:
+            saida += html.unescape(pendente_html)
+        if saida:
+            self.caracteres_emitidos += len(saida)
+            yield saida
+
+    @staticmethod
+    def _corte_escapes(buffer: str, limite: int) -> int:
+        """Recua o corte para não dividir um escape JavaScript entre blocos"""
+        trecho = buffer[max(limite - 3, 0) : limite]
+        if trecho.endswith("\\r\\"):
+            return limite - 3
+        if trecho.endswith("\\r"):
+            return limite - 2
+        if trecho.endswith("\\"):
+            return limite - 1
+        return limite
+
+    @staticmethod
+    def _decodificar_trecho(trecho: str, pendente_html: str):
+        """
+        Aplica escapes JavaScript e entidades HTML em um trecho.
+
+        Retorna a cauda que pode conter uma entidade HTML incompleta e o texto
+        já decodificado.
+        """
+        texto = pendente_html + _desfazer_escapes_js(trecho)
+
+        pos_entidade = texto.rfind("&")
+        if (
+            pos_entidade >= 0
+            and len(texto) - pos_entidade <= _TAMANHO_MAXIMO_ENTIDADE
+            and not _PADRAO_FIM_ENTIDADE.search(texto, pos_entidade + 1)
+        ):
+            return texto[pos_entidade:], html.unescape(texto[:pos_entidade])
+
+        return "", html.unescape(texto)
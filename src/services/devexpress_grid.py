@@ -0,0 +1,200 @@
+"""
+Extração direcionada de linhas da grid DXMainTable do DevExpress
+Localiza as fronteiras <tr>/<td> sem montar a árvore DOM e só materializa o texto
+das colunas mapeadas
+"""
+
+import html
+import re
+from typing import Callable, Iterator, List, Optional
+
+from services.colaborador import CAMPOS, CAMPOS_TEXTO, Colaborador
+
+ID_TABELA_PRINCIPAL = "GridRelatorio_PanelGrid_grid_DXMainTable"
+
+# Mapeamento correto baseado na análise do HTML real
+# CPF está na coluna 2, Nome na coluna 1, etc.
+MAPEAMENTO_COLUNAS = {
+    # Colaborador (baseado na análise real das colunas)
+    0: "situacao_empregado",  # Coluna 0: 'FÉRIAS' (situação empregado)
+    1: "nome",  # Coluna 1: 'ADAIL VIANA TEIXEIRA JUNIOR' (nome)
+    2: "cpf",  # Coluna 2: '086.533.907-40' (CPF)
+    3: "cargo",  # Coluna 3: 'Motorista Carreta' (cargo)
+    # Situação
+    4: "status",  # Coluna 4: 'LIBERADO' (status)
+    # CNH (baseado na posição observada)
+    7: "pontuacao",  # Coluna 7: '0' (pontuação)
+    8: "vencimento",  # Coluna 8: '06/02/2032' (vencimento)
+    # Para os campos de Gerenciamento de Fadigas e Telemetria
+    # Como a tabela tem 70 colunas, vou mapear baseado nas posições prováveis
+    # Estes índices serão ajustados conforme a estrutura real
+    34: "celular",  # Estimativa para GERENCIAMENTO DE FADIGAS/CELULAR
+    35: "alimento",  # GERENCIAMENTO DE FADIGAS/CONSUMO ALIMENTO
+    36: "fumando",  # GERENCIAMENTO DE FADIGAS/FUMANDO
+    37: "oclusao",  # GERENCIAMENTO DE FADIGAS/OCLUSÃO
+    38: "cinto",  # GERENCIAMENTO DE FADIGAS/SEM CINTO
+    # Telemetria (estimativa baseada na estrutura)
+    49: "velo1",  # TELEMETRIA/EXCESSO VELOCIDADE 1
+    50: "velo2",  # TELEMETRIA/EXCESSO VELOCIDADE 2
+    51: "velo3",  # TELEMETRIA/EXCESSO VELOCIDADE 3
+    52: "via1",  # TELEMETRIA/EXCESSO VELOCIDADE POR VIA 1
+    53: "via2",  # TELEMETRIA/EXCESSO VELOCIDADE POR VIA 2
+    54: "via3",  # TELEMETRIA/EXCESSO VELOCIDADE POR VIA 3
+    55: "forcag",  # TELEMETRIA/FORÇA G
+    56: "frenagem",  # TELEMETRIA/FRENAGEM BRUSCA
+    57: "power",  # TELEMETRIA/POWER ON
+    # Localização (última coluna disponível)
+    69: "operacao",  # Última coluna - Operação
+}
+
+# MAPEAMENTO_COLUNAS segue a mesma ordem de CAMPOS (Colaborador.de_valores)
+_POSICAO_NOME = CAMPOS.index("nome")
+_POSICAO_CPF = CAMPOS.index("cpf")
+
+PADRAO_CPF_CELULA = re.compile(r"\d{3}\.\d{3}\.\d{3}-\d{2}|\b\d{11}\b")
+
+_PADRAO_TABELA = re.compile(
+    r"<table\b[^>]*?\sid\s*=\s*[\"']?" + ID_TABELA_PRINCIPAL + r"[\"'\s/>]",
+    re.IGNORECASE,
+)
+_PADRAO_FIM_TABELA = re.compile(r"</table\s*>", re.IGNORECASE)
+_PADRAO_LINHA = re.compile(r"<tr(?=[\s>])([^>]*)>(.*?)</tr\s*>", re.S)
+_PADRAO_CELULA = re.compile(r"<td(?=[\s>])[^>]*>(.*?)</td\s*>", re.S)
+_PADRAO_ID = re.compile(
+    r"""(?:^|\s)id\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE
+)
+_PADRAO_TAG = re.compile(r"<!--.*?-->|</?[a-zA-Z][^>]*>|<![^>]*>|<\?[^>]*>", re.S)
+# Estruturas que o extrator não reproduz fielmente (ficam com o BeautifulSoup):
+# tabelas aninhadas, scripts/estilos e tags com letras maiúsculas
+_PADRAO_NAO_SUPORTADO = re.compile(r"<(?:table|script|style)\b|</?[a-zA-Z]*[A-Z]")
+
+
+def montar_colaborador(
+    obter_texto: Callable[[int], str], total_colunas: int
+) -> Optional[Colaborador]:
+    """
+    Monta o colaborador a partir do texto das células mapeadas.
+
+    Retorna None quando a linha não é de dados (sem CPF na coluna 2 ou sem nome).
+    Os campos numéricos são convertidos uma única vez, na criação do registro.
+    """
+    if total_colunas < 5:  # Linha deve ter pelo menos as colunas básicas
+        return None
+
+    # Verifica se é linha de dados válida procurando por CPF na coluna 2
+    if not PADRAO_CPF_CELULA.search(obter_texto(2)):
+        return None
+
+    valores = []
+    for indice, campo in MAPEAMENTO_COLUNAS.items():
+        valor = obter_texto(indice) if indice < total_colunas else ""
+        # Limpa valor e define padrão
+        if valor and valor != "&nbsp;":
+            valores.append(valor)
+        else:
+            valores.append("" if campo in CAMPOS_TEXTO else "0")
+
+    # Validações básicas - nome e CPF devem estar presentes
+    if not (valores[_POSICAO_NOME] and valores[_POSICAO_CPF]):
+        return None
+
+    return Colaborador.de_valores(valores)
+
+
+def linha_de_cabecalho(linha_id: str) -> bool:
+    """Linhas de cabeçalho têm ID contendo "Header" """
+    return "Header" in linha_id or "DXHeadersRow" in linha_id
+
+
+def texto_celula(conteudo: str) -> str:
+    """Equivalente a get_text(strip=True) para o conteúdo de uma célula"""
+    if "<" not in conteudo:
+        if "&" in conteudo:
+            conteudo = html.unescape(conteudo)
+        return conteudo.strip()
+
+    partes = []
+    for parte in _PADRAO_TAG.split(conteudo):
+        if "&" in parte:
+            parte = html.unescape(parte)
+        parte = parte.strip()
+        if parte:
+            partes.append(parte)
+    return "".join(partes)
+
+
+class ExtratorGridDevExpress:
+    """
+    Extrator rápido da tabela GridRelatorio_PanelGrid_grid_DXMainTable.
+
+    Produz os mesmos dicionários do caminho com BeautifulSoup. Quando a tabela
+    tem estruturas aninhadas (tabelas, scripts) ou marcação desbalanceada,
+    sinaliza com `suportado = False` para que o chamador use o BeautifulSoup.
+    """
+
+    def __init__(self):
+        self.tabela_encontrada = False
+        self.suportado = False
+        self.linhas_analisadas = 0
+
+    def localizar_tabela(self, html_content: str) -> Optional[str]:
+        """Retorna o HTML interno da tabela principal, se o extrator suportá-la"""
+        self.tabela_encontrada = False
+        self.suportado = False
+
+        match = _PADRAO_TABELA.search(html_content)
+        if not match:
+            return None
+        self.tabela_encontrada = True
+
+        inicio = html_content.find(">", match.start()) + 1
+        fim = _PADRAO_FIM_TABELA.search(html_content, inicio)
+        if inicio <= 0 or not fim:
+            return None
+
+        corpo = html_content[inicio : fim.start()]
+        if _PADRAO_NAO_SUPORTADO.search(corpo):
+            return None
+
+        # Marcação desbalanceada depende das correções do html.parser
+        if corpo.count("<tr") != corpo.count("</tr>") or corpo.count(
+            "<td"
+        ) != corpo.count("</td>"):
+            return None
+
+        self.suportado = True
+        return corpo
+
+    def iterar_colaboradores(self, corpo_tabela: str) -> Iterator[Colaborador]:
+        """Percorre as linhas da tabela e gera os colaboradores encontrados"""
+        self.linhas_analisadas = 0
+
+        for linha in _PADRAO_LINHA.finditer(corpo_tabela):
+            self.linhas_analisadas += 1
+
+            match_id = _PADRAO_ID.search(linha.group(1))
+            linha_id = ""
+            if match_id:
+                linha_id = html.unescape(
+                    next(grupo for grupo in match_id.groups() if grupo is not None)
+                )
+            if linha_de_cabecalho(linha_id):
+                continue
+
+            celulas = _PADRAO_CELULA.findall(linha.group(2))
+            colaborador = montar_colaborador(
+                lambda indice: texto_celula(celulas[indice]), len(celulas)
+            )
+            if colaborador:
+                yield colaborador
+
+    def extrair(self, html_content: str) -> Optional[List[Colaborador]]:
+        """
+        Extrai os colaboradores da tabela principal.
+
+        Retorna None se a tabela não foi encontrada ou não é suportada.
+        """
+        corpo = self.localizar_tabela(html_content)
+        if corpo is None:
+            return None
+        return list(self.iterar_colaboradores(corpo))
@@ -0,0 +1,249 @@
+"""
+Histórico colunar dos prontuários extraídos
+Cada execução acrescenta um snapshot do DataFrame de converter_dados_para_df em
+arquivos Parquet comprimidos, particionados por data da execução e operação; as
+consultas leem só as colunas e partições pedidas, com filtros aplicados nas
+estatísticas dos arquivos
+"""
+
+import os
+import shutil
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Union
+
+import pandas as pd
+
+from services.colaborador import CAMPOS
+from services.data_service import CAMPOS_DECIMAIS, SUFIXO_COLUNAS
+
+# Colunas de partição (pastas data_execucao=AAAA-MM-DD/operacao=<operação>)
+COLUNA_DATA_EXECUCAO = "data_execucao"
+COLUNA_OPERACAO = "operacao"
+
+COLUNA_CPF = f"cpf{SUFIXO_COLUNAS}"
+COLUNA_DATA_ATUALIZACAO = f"data_atualizacao{SUFIXO_COLUNAS}"
+_COLUNA_OPERACAO_DF = f"operacao{SUFIXO_COLUNAS}"
+_COLUNAS_SEM_SUFIXO = frozenset(
+    ["id_cad_filiais", "id_cad_operacoes", COLUNA_DATA_EXECUCAO]
+)
+
+Data = Union[date, datetime, str]
+
+
+def _importar_pyarrow():
+    """pyarrow só é necessário para o histórico; importado na primeira gravação"""
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.fs
+    except ImportError as e:
+        raise ImportError(
+            "O histórico de prontuários precisa do pyarrow (pip install pyarrow)"
+        ) from e
+    return pyarrow
+
+
+def _esquema(pa):
+    """Esquema fixo dos snapshots, para que todos os arquivos sejam compatíveis"""
+    campos = []
+    for campo in CAMPOS:
+        if campo in CAMPOS_DECIMAIS:
+            tipo = pa.float32()
+        elif campo == "vencimento":
+            tipo = pa.timestamp("us")
+        else:
+            tipo = pa.string()
+        nome = COLUNA_OPERACAO if campo == "operacao" else f"{campo}{SUFIXO_COLUNAS}"
+        campos.append((nome, tipo))
+    campos += [
+        (COLUNA_DATA_ATUALIZACAO, pa.timestamp("us")),
+        ("id_cad_filiais", pa.int32()),
+        ("id_cad_operacoes", pa.int32()),
+        (COLUNA_DATA_EXECUCAO, pa.date32()),
+    ]
+    return pa.schema(campos)
+
+
+def _data(valor: Data) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(valor)
+
+
+class HistoricoProntuarios:
+    """
+    Snapshots append-only dos prontuários em Parquet.
+
+    Os arquivos ficam em <diretorio>/data_execucao=<data>/operacao=<operação>/ e
+    nunca são reescritos. Cada gravação é montada em uma pasta oculta e movida
+    para as partições no final, então consultas não veem snapshots pela metade.
+    """
+
+    def __init__(
+        self,
+        diretorio: Optional[str] = None,
+        compressao: Optional[str] = None,
+    ):
+        self.diretorio = diretorio or os.getenv(
+            "GEG_HISTORICO_DIR", os.path.join("output", "historico")
+        )
+        self.compressao = compressao or os.getenv("GEG_HISTORICO_COMPRESSAO", "zstd")
+
+    def gravar(
+        self, df: pd.DataFrame, executado_em: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Acrescenta o DataFrame de converter_dados_para_df ao histórico.
+
+        Retorna os arquivos criados (um por operação). A data da partição vem de
+        `executado_em` ou, na falta dele, da coluna de data de atualização.
+        """
+        if df is None or df.empty:
+            return []
+
+        pa = _importar_pyarrow()
+        if executado_em is None:
+            if COLUNA_DATA_ATUALIZACAO in df:
+                executado_em = pd.Timestamp(df[COLUNA_DATA_ATUALIZACAO].iloc[0])
+            else:
+                executado_em = datetime.now()
+
+        tabela = self._tabela(pa, df, executado_em)
+        # Ordenado por CPF: min/max de cada arquivo filtram as consultas por CPF
+        tabela = tabela.sort_by(COLUNA_CPF)
+
+        identificador = f"{executado_em:%Y%m%d_%H%M%S}-{uuid.uuid4().hex[:8]}"
+        temporario = os.path.join(self.diretorio, f".gravando-{identificador}")
+        os.makedirs(temporario, exist_ok=True)
+        try:
+            pa.dataset.write_dataset(
+                tabela,
+                temporario,
+                format="parquet",
+                partitioning=self._particionamento(pa),
+                basename_template=f"{identificador}-{{i}}.parquet",
+                file_options=pa.dataset.ParquetFileFormat().make_write_options(
+                    compression=self.compressao
+                ),
+            )
+            return self._publicar(temporario)
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+
+    def consultar(
+        self,
+        colunas: Optional[Iterable[str]] = None,
+        cpfs: Optional[Iterable[str]] = None,
+        inicio: Optional[Data] = None,
+        fim: Optional[Data] = None,
+        operacoes: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Lê o histórico com projeção de colunas e filtros empurrados para a leitura.
+
+        Colunas e filtros aceitam o nome do campo ("velo1") ou o da coluna do
+        banco ("velo1_log_prontuarios_gente_gestao"). `inicio` e `fim` limitam as
+        datas de execução (inclusive) e descartam partições inteiras; `cpfs` usa
+        as estatísticas de cada arquivo. Sem histórico, devolve um DataFrame vazio.
+        """
+        pa = _importar_pyarrow()
+        dataset = self._dataset(pa)
+        if dataset is None:
+            return pd.DataFrame(columns=list(colunas) if colunas else None)
+
+        campo = pa.dataset.field
+        filtros = []
+        if inicio is not None:
+            filtros.append(campo(COLUNA_DATA_EXECUCAO) >= _data(inicio))
+        if fim is not None:
+            filtros.append(campo(COLUNA_DATA_EXECUCAO) <= _data(fim))
+        if operacoes is not None:
+            filtros.append(campo(COLUNA_OPERACAO).isin(list(operacoes)))
+        if cpfs is not None:
+            filtros.append(campo(COLUNA_CPF).isin(list(cpfs)))
+
+        filtro = None
+        for expressao in filtros:
+            filtro = expressao if filtro is None else filtro & expressao
+
+        nomes = None
+        if colunas is not None:
+            nomes = [self._coluna(coluna) for coluna in colunas]
+
+        tabela = dataset.to_table(columns=nomes, filter=filtro)
+        df = tabela.to_pandas()
+        return df.rename(columns={COLUNA_OPERACAO: _COLUNA_OPERACAO_DF})
+
+    def historico_cpf(
+        self, cpf: str, dias: int = 90, colunas: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """Snapshots de um CPF nos últimos `dias`, do mais antigo ao mais novo"""
+        if colunas is not None:
+            colunas = list(dict.fromkeys([*colunas, COLUNA_DATA_ATUALIZACAO]))
+        df = self.consultar(
+            colunas=colunas,
+            cpfs=[cpf],
+            inicio=date.today() - timedelta(days=dias),
+        )
+        return df.sort_values(COLUNA_DATA_ATUALIZACAO, ignore_index=True)
+
+    def _tabela(self, pa, df: pd.DataFrame, executado_em: datetime):
+        esquema = _esquema(pa)
+        df = df.rename(columns={_COLUNA_OPERACAO_DF: COLUNA_OPERACAO})
+        colunas = []
+        for campo in esquema:
+            if campo.name == COLUNA_DATA_EXECUCAO:
+                valores = pa.array([_data(executado_em)] * len(df), pa.date32())
+            elif campo.name in df:
+                valores = pa.array(df[campo.name], from_pandas=True)
+                # category -> string; datetime64[ns] -> us
+                valores = valores.cast(campo.type, safe=False)
+            else:
+                valores = pa.nulls(len(df), campo.type)
+            colunas.append(valores)
+        return pa.Table.from_arrays(colunas, schema=esquema)
+
+    def _particionamento(self, pa):
+        return pa.dataset.partitioning(
+            pa.schema(
+                [(COLUNA_DATA_EXECUCAO, pa.date32()), (COLUNA_OPERACAO, pa.string())]
+            ),
+            flavor="hive",
+        )
+
+    def _dataset(self, pa):
+        if not os.path.isdir(self.diretorio):
+            return None
+        # Arquivos mapeados em memória; pastas ocultas (gravações em andamento)
+        # são ignoradas
+        dataset = pa.dataset.dataset(
+            self.diretorio,
+            schema=_esquema(pa),
+            format="parquet",
+            partitioning=self._particionamento(pa),
+            filesystem=pa.fs.LocalFileSystem(use_mmap=True),
+        )
+        return dataset if dataset.files else None
+
+    def _publicar(self, temporario: str) -> List[str]:
+        """Move os arquivos da pasta temporária para as partições finais"""
+        publicados = []
+        for raiz, _, nomes in os.walk(temporario):
+            destino = os.path.join(self.diretorio, os.path.relpath(raiz, temporario))
+            for nome in nomes:
+                os.makedirs(destino, exist_ok=True)
+                caminho = os.path.join(destino, nome)
+                os.replace(os.path.join(raiz, nome), caminho)
+                publicados.append(caminho)
+        return publicados
+
+    @staticmethod
+    def _coluna(nome: str) -> str:
+        if nome in (COLUNA_OPERACAO, _COLUNA_OPERACAO_DF):
+            return COLUNA_OPERACAO
+        if nome in _COLUNAS_SEM_SUFIXO or nome.endswith(SUFIXO_COLUNAS):
+            return nome
+        return f"{nome}{SUFIXO_COLUNAS}"
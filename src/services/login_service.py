@@ -1,11 +1,12 @@
 import requests
-from bs4 import BeautifulSoup
+from services.retentativas import levantar_status_transitorio
+from utils.html_util import CAMPOS_OCULTOS_ASPNET, extrair_campos_ocultos
 
 
 class LoginService:
     @staticmethod
     def obter_pagina_login(session, login_url):
-        response = session.get(login_url)
+        response = levantar_status_transitorio(session.get(login_url))
         return response.text
 
     @staticmethod
@@ -13,21 +14,8 @@ class LoginService:
         if data is None:
             data = {}
 
-        soup = BeautifulSoup(response_text, "html.parser")
-
         # Capturar campos ocultos
-        viewstate_elem = soup.find("input", {"name": "__VIEWSTATE"})
-        viewstategenerator_elem = soup.find("input", {"name": "__VIEWSTATEGENERATOR"})
-        eventvalidation_elem = soup.find("input", {"name": "__EVENTVALIDATION"})
-
-        if value := viewstate_elem.get("value") if viewstate_elem else None:  # type: ignore
-            data["__VIEWSTATE"] = value
-        if value := (
-            viewstategenerator_elem.get("value") if viewstategenerator_elem else None  # type: ignore
-        ):
-            data["__VIEWSTATEGENERATOR"] = value
-        if value := eventvalidation_elem.get("value") if eventvalidation_elem else None:  # type: ignore
-            data["__EVENTVALIDATION"] = value
+        data.update(extrair_campos_ocultos(response_text, CAMPOS_OCULTOS_ASPNET))
 
         return data
 
@@ -44,5 +32,5 @@ class LoginService:
 
     @staticmethod
     def logar(session, login_url, login_data):
-        response = session.post(login_url, data=login_data)
+        response = levantar_status_transitorio(session.post(login_url, data=login_data))
         return response
@@ -0,0 +1,475 @@
+"""
+Métricas por etapa de cada execução da automação
+Tempo de parede, tempo de CPU, bytes recebidos/enviados e linhas de cada etapa
+(login, navegação, callback, decodificação, extração, limpeza, CSV e banco) por
+credencial, exportados em JSON e no formato texto do Prometheus. Desligadas
+(GEG_METRICAS=0), as medições viram objetos nulos sem custo relevante
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from utils.file_util import TravaArquivo, slug_credencial
+
+# Ordem das etapas nos relatórios
+ETAPAS = (
+    "login",
+    "navegacao",
+    "callback",
+    "decodificacao",
+    "extracao",
+    "limpeza",
+    "csv",
+    "banco",
+)
+
+# Campos de cada etapa: (nome no JSON, métrica Prometheus, descrição)
+_CAMPOS = (
+    ("segundos", "geg_etapa_segundos", "Tempo de parede da etapa"),
+    ("cpu_segundos", "geg_etapa_cpu_segundos", "Tempo de CPU da etapa"),
+    (
+        "bytes_entrada",
+        "geg_etapa_bytes_entrada",
+        "Bytes recebidos (corpo descomprimido)",
+    ),
+    ("bytes_saida", "geg_etapa_bytes_saida", "Bytes enviados ou gravados"),
+    ("linhas", "geg_etapa_linhas", "Linhas processadas"),
+    ("chamadas", "geg_etapa_chamadas", "Vezes que a etapa foi executada"),
+)
+
+# Contadores de novas tentativas por operação (services.retentativas), acumulados
+# desde o início do processo
+_CAMPOS_RETENTATIVAS = (
+    (
+        "tentativas",
+        "geg_retentativas_tentativas",
+        "Execuções da operação, contando a primeira",
+    ),
+    (
+        "retentativas",
+        "geg_retentativas_novas",
+        "Novas tentativas após falha transitória",
+    ),
+    (
+        "segundos_espera",
+        "geg_retentativas_segundos_espera",
+        "Tempo dormindo antes das novas tentativas",
+    ),
+    (
+        "desistencias",
+        "geg_retentativas_desistencias",
+        "Falhas devolvidas (erro permanente ou tentativas/orçamento esgotados)",
+    ),
+)
+
+ARQUIVO_PROMETHEUS = "metricas.prom"
+
+# Rótulos de uma série do arquivo Prometheus (valores com escapes de _rotulo)
+PADRAO_ROTULO = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+class Etapa:
+    """Totais acumulados de uma etapa (somados entre chamadas e threads)"""
+
+    __slots__ = tuple(campo for campo, _, _ in _CAMPOS)
+
+    def __init__(self):
+        self.segundos = 0.0
+        self.cpu_segundos = 0.0
+        self.bytes_entrada = 0
+        self.bytes_saida = 0
+        self.linhas = 0
+        self.chamadas = 0
+
+    def para_dict(self) -> Dict:
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+
+class Medicao:
+    """
+    Trecho cronometrado de uma etapa (gerenciador de contexto).
+
+    Dentro do bloco, quem mede informa bytes e linhas nos atributos; ao sair,
+    tempo de parede e CPU da thread são somados à etapa.
+    """
+
+    __slots__ = ("_metricas", "_nome", "_inicio", "_inicio_cpu") + (
+        "bytes_entrada",
+        "bytes_saida",
+        "linhas",
+    )
+
+    def __init__(self, metricas: "MetricasExecucao", nome: str):
+        self._metricas = metricas
+        self._nome = nome
+        self.bytes_entrada = 0
+        self.bytes_saida = 0
+        self.linhas = 0
+
+    def __enter__(self) -> "Medicao":
+        self._inicio = time.perf_counter()
+        self._inicio_cpu = time.thread_time()
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, traceback) -> None:
+        self._metricas.registrar(
+            self._nome,
+            segundos=time.perf_counter() - self._inicio,
+            cpu_segundos=time.thread_time() - self._inicio_cpu,
+            bytes_entrada=self.bytes_entrada,
+            bytes_saida=self.bytes_saida,
+            linhas=self.linhas,
+        )
+
+
+class Cronometro:
+    """
+    Tempo de parede acumulado em trechos intercalados com outra etapa, como as
+    linhas de um gerador consumido pela limpeza
+    """
+
+    __slots__ = ("segundos", "itens")
+
+    def __init__(self):
+        self.segundos = 0.0
+        self.itens = 0
+
+    def iterar(self, iteravel: Iterable) -> Iterator:
+        """Repassa os itens somando o tempo gasto para produzir cada um"""
+        relogio = time.perf_counter
+        iterador = iter(iteravel)
+        while True:
+            inicio = relogio()
+            try:
+                item = next(iterador)
+            except StopIteration:
+                self.segundos += relogio() - inicio
+                return
+            self.segundos += relogio() - inicio
+            self.itens += 1
+            yield item
+
+    def chamar(self, funcao, *args):
+        """Chama `funcao(*args)` somando o tempo da chamada"""
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            self.segundos += time.perf_counter() - inicio
+            self.itens += 1
+
+
+class MetricasExecucao:
+    """Métricas de uma credencial em uma execução"""
+
+    habilitado = True
+
+    def __init__(self, credencial: str, execucao: str):
+        self.credencial = credencial
+        self.execucao = execucao
+        self.iniciado_em = datetime.now()
+        self.duracao_segundos = 0.0
+        self.sucesso: Optional[bool] = None
+        self.etapas: Dict[str, Etapa] = {}
+        self._inicio = time.perf_counter()
+        self._trava = threading.Lock()
+
+    def medir(self, nome: str) -> Medicao:
+        return Medicao(self, nome)
+
+    def registrar(
+        self,
+        nome: str,
+        segundos: float = 0.0,
+        cpu_segundos: float = 0.0,
+        bytes_entrada: int = 0,
+        bytes_saida: int = 0,
+        linhas: int = 0,
+        chamadas: int = 1,
+    ) -> None:
+        """Soma valores à etapa (seguro entre threads, ex.: páginas em paralelo)"""
+        with self._trava:
+            etapa = self.etapas.get(nome)
+            if etapa is None:
+                etapa = self.etapas[nome] = Etapa()
+            etapa.segundos += segundos
+            etapa.cpu_segundos += cpu_segundos
+            etapa.bytes_entrada += bytes_entrada
+            etapa.bytes_saida += bytes_saida
+            etapa.linhas += linhas
+            etapa.chamadas += chamadas
+
+    def finalizar(self, sucesso: bool) -> None:
+        self.sucesso = sucesso
+        self.duracao_segundos = time.perf_counter() - self._inicio
+
+    def para_dict(self) -> Dict:
+        ordem = {nome: posicao for posicao, nome in enumerate(ETAPAS)}
+        with self._trava:
+            etapas = {
+                nome: self.etapas[nome].para_dict()
+                for nome in sorted(self.etapas, key=lambda n: ordem.get(n, len(ordem)))
+            }
+        return {
+            "credencial": self.credencial,
+            "execucao": self.execucao,
+            "iniciado_em": self.iniciado_em.isoformat(timespec="seconds"),
+            "duracao_segundos": self.duracao_segundos,
+            "sucesso": self.sucesso,
+            "etapas": etapas,
+        }
+
+
+class _MedicaoNula:
+    """Medição que não mede nada (métricas desligadas)"""
+
+    __slots__ = ()
+    bytes_entrada = bytes_saida = linhas = 0
+
+    def __enter__(self) -> "_MedicaoNula":
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, traceback) -> None:
+        pass
+
+    def __setattr__(self, nome, valor) -> None:
+        pass
+
+
+_MEDICAO_NULA = _MedicaoNula()
+
+
+class MetricasDesligadas:
+    """Mesma interface de MetricasExecucao, sem registrar nada"""
+
+    habilitado = False
+
+    def medir(self, nome: str) -> _MedicaoNula:
+        return _MEDICAO_NULA
+
+    def registrar(self, nome: str, **valores) -> None:
+        pass
+
+    def finalizar(self, sucesso: bool) -> None:
+        pass
+
+
+METRICAS_DESLIGADAS = MetricasDesligadas()
+
+
+def _rotulo(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ColetorMetricas:
+    """
+    Reúne as métricas das credenciais de cada execução e as exporta.
+
+    `exportar` grava <diretorio>/metricas_<execução>.json só com as credenciais
+    daquela execução (jobs agendados simultâneos compartilham o coletor) e
+    atualiza no <diretorio>/metricas.prom (formato texto do Prometheus, para o
+    textfile collector do node_exporter) apenas as séries dessas credenciais,
+    mantendo as das demais. As novas tentativas são totais do processo.
+    """
+
+    def __init__(self, habilitado: Optional[bool] = None):
+        self.habilitado = (
+            habilitado
+            if habilitado is not None
+            else os.getenv("GEG_METRICAS", "1") != "0"
+        )
+        self._execucoes: List[MetricasExecucao] = []
+        self._retentativas: Dict[str, Dict] = {}
+        self._trava = threading.Lock()
+
+    def iniciar(self, credencial: str, execucao: str):
+        """Métricas de uma nova execução (ou METRICAS_DESLIGADAS)"""
+        if not self.habilitado:
+            return METRICAS_DESLIGADAS
+        metricas = MetricasExecucao(slug_credencial(credencial), execucao)
+        with self._trava:
+            self._execucoes.append(metricas)
+        return metricas
+
+    def registrar_retentativa(self, operacao: str, **valores) -> None:
+        """Soma tentativas, novas tentativas, espera ou desistências da operação"""
+        if not self.habilitado:
+            return
+        with self._trava:
+            contadores = self._retentativas.get(operacao)
+            if contadores is None:
+                contadores = self._retentativas[operacao] = {
+                    campo: 0 for campo, _, _ in _CAMPOS_RETENTATIVAS
+                }
+            for campo, valor in valores.items():
+                contadores[campo] += valor
+
+    def exportar(self, diretorio: str, execucao: Optional[str] = None) -> List[str]:
+        """
+        Grava JSON e Prometheus das métricas de `execucao` (sem ela, de todas as
+        coletadas) e as retira do coletor; devolve os arquivos
+        """
+        with self._trava:
+            execucoes = [
+                metricas
+                for metricas in self._execucoes
+                if execucao is None or metricas.execucao == execucao
+            ]
+            self._execucoes = [
+                metricas for metricas in self._execucoes if metricas not in execucoes
+            ]
+            retentativas = {
+                operacao: dict(contadores)
+                for operacao, contadores in self._retentativas.items()
+            }
+        if not execucoes:
+            return []
+
+        execucao = execucao or datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(diretorio, exist_ok=True)
+        caminho_json = os.path.join(diretorio, f"metricas_{execucao}.json")
+        caminho_prometheus = os.path.join(diretorio, ARQUIVO_PROMETHEUS)
+
+        conteudo = [metricas.para_dict() for metricas in execucoes]
+        self._gravar(
+            caminho_json,
+            json.dumps(
+                {
+                    "execucao": execucao,
+                    "credenciais": conteudo,
+                    "retentativas": retentativas,
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+        )
+        # Outros jobs (threads ou processos) atualizam o mesmo arquivo
+        with TravaArquivo(f"{caminho_prometheus}.lock"):
+            self._gravar(
+                caminho_prometheus,
+                self.mesclar_prometheus(
+                    self._ler(caminho_prometheus),
+                    self.formatar_prometheus(conteudo, retentativas),
+                ),
+            )
+        return [caminho_json, caminho_prometheus]
+
+    @staticmethod
+    def mesclar_prometheus(anterior: str, novo: str) -> str:
+        """
+        `novo` mais as séries de `anterior` de credenciais (e operações) que não
+        aparecem em `novo`, cada uma junto da própria métrica
+        """
+
+        def chave(linha: str):
+            rotulos = dict(PADRAO_ROTULO.findall(linha))
+            if "credencial" in rotulos:
+                return "credencial", rotulos["credencial"]
+            return "operacao", rotulos.get("operacao")
+
+        series_novas = {
+            chave(linha)
+            for linha in novo.splitlines()
+            if linha and not linha.startswith("#")
+        }
+        mantidas: Dict[str, List[str]] = {}
+        for linha in anterior.splitlines():
+            if not linha or linha.startswith("#") or chave(linha) in series_novas:
+                continue
+            mantidas.setdefault(linha.split("{", 1)[0], []).append(linha)
+
+        linhas = []
+        for linha in novo.splitlines():
+            linhas.append(linha)
+            if linha.startswith("# TYPE "):
+                linhas.extend(mantidas.pop(linha.split()[2], []))
+        for metrica, series in mantidas.items():
+            linhas.append(f"# TYPE {metrica} gauge")
+            linhas.extend(series)
+        return "\n".join(linhas) + "\n"
+
+    @staticmethod
+    def formatar_prometheus(
+        execucoes: List[Dict], retentativas: Optional[Dict[str, Dict]] = None
+    ) -> str:
+        """
+        Gauges da última execução, com rótulos credencial e etapa (e operação,
+        nas novas tentativas)
+        """
+        linhas = []
+        for campo, metrica, descricao in _CAMPOS:
+            linhas.append(f"# HELP {metrica} {descricao}")
+            linhas.append(f"# TYPE {metrica} gauge")
+            for dados in execucoes:
+                credencial = _rotulo(dados["credencial"])
+                for nome, etapa in dados["etapas"].items():
+                    linhas.append(
+                        f'{metrica}{{credencial="{credencial}",etapa="{_rotulo(nome)}"}}'
+                        f" {etapa[campo]}"
+                    )
+
+        for metrica, descricao, valor in (
+            (
+                "geg_execucao_segundos",
+                "Duração da execução da credencial",
+                lambda dados: dados["duracao_segundos"],
+            ),
+            (
+                "geg_execucao_sucesso",
+                "1 se a execução terminou com sucesso",
+                lambda dados: 1 if dados["sucesso"] else 0,
+            ),
+        ):
+            linhas.append(f"# HELP {metrica} {descricao}")
+            linhas.append(f"# TYPE {metrica} gauge")
+            for dados in execucoes:
+                linhas.append(
+                    f'{metrica}{{credencial="{_rotulo(dados["credencial"])}"}} '
+                    f"{valor(dados)}"
+                )
+
+        if retentativas:
+            for campo, metrica, descricao in _CAMPOS_RETENTATIVAS:
+                linhas.append(f"# HELP {metrica} {descricao}")
+                linhas.append(f"# TYPE {metrica} gauge")
+                for operacao, contadores in sorted(retentativas.items()):
+                    linhas.append(
+                        f'{metrica}{{operacao="{_rotulo(operacao)}"}} '
+                        f"{contadores[campo]}"
+                    )
+        return "\n".join(linhas) + "\n"
+
+    @staticmethod
+    def _ler(caminho: str) -> str:
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                return arquivo.read()
+        except FileNotFoundError:
+            return ""
+
+    @staticmethod
+    def _gravar(caminho: str, conteudo: str) -> None:
+        # Arquivo temporário + rename: o coletor nunca lê um arquivo pela metade
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(temporario, caminho)
+
+
+_coletor_padrao: Optional[ColetorMetricas] = None
+_coletor_padrao_lock = threading.Lock()
+
+
+def obter_coletor_metricas() -> ColetorMetricas:
+    """Retorna o coletor compartilhado pelo processo (GEG_METRICAS=0 desliga)"""
+    global _coletor_padrao
+
+    with _coletor_padrao_lock:
+        if _coletor_padrao is None:
+            _coletor_padrao = ColetorMetricas()
+        return _coletor_padrao
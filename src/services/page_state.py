@@ -0,0 +1,32 @@
+"""
+Estado da página do relatório (campos ocultos do ASP.NET)
+Carrega o __VIEWSTATE/__EVENTVALIDATION da resposta de navegação até o payload do
+callback, sem precisar buscar a página de novo
+"""
+
+import time
+from typing import Dict, Optional
+
+from utils.html_util import CAMPOS_OCULTOS_ASPNET, extrair_campos_ocultos
+
+
+class EstadoPagina:
+    """Campos ocultos capturados de uma página do portal"""
+
+    def __init__(self, campos: Dict[str, str], url: Optional[str] = None):
+        self.campos = campos
+        self.url = url
+        self.capturado_em = time.time()
+
+    @classmethod
+    def de_html(cls, html_content: str, url: Optional[str] = None) -> "EstadoPagina":
+        return cls(extrair_campos_ocultos(html_content, CAMPOS_OCULTOS_ASPNET), url)
+
+    @property
+    def valido(self) -> bool:
+        """O callback do PanelGrid exige pelo menos o __VIEWSTATE"""
+        return "__VIEWSTATE" in self.campos
+
+    def mesclar(self, payload: Dict[str, str]) -> Dict[str, str]:
+        """Campos ocultos combinados com o payload (o payload tem precedência)"""
+        return self.campos | payload
@@ -0,0 +1,204 @@
+"""
+Perfil de execução sob demanda (cProfile + tracemalloc)
+Liga o cProfile e o tracemalloc em torno de um trecho (uma credencial, a gravação
+no banco) e grava, ao lado do automacao.log, as estatísticas do cProfile (.prof,
+para pstats/snakeviz) e um relatório em texto com as funções mais pesadas, o pico
+de memória e os pontos que mais alocaram
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from utils.file_util import slug_credencial
+
+# Arquivos internos do Python/tracemalloc ficam fora das alocações listadas
+_FILTROS_ALOCACAO = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class Perfil:
+    """Resultado de um trecho perfilado"""
+
+    def __init__(self, rotulo: str):
+        self.rotulo = rotulo
+        self.segundos = 0.0
+        self.pico_memoria_bytes: Optional[int] = None
+        self.funcoes: List[Dict] = []
+        self.alocacoes: List[Dict] = []
+        self.arquivos: List[str] = []
+
+    def resumo(self, top: int = 5) -> str:
+        """Poucas linhas para o console: funções e alocações mais pesadas"""
+        cabecalho = f"Perfil {self.rotulo}: {self.segundos:.2f} s"
+        if self.pico_memoria_bytes is not None:
+            cabecalho += f", pico de memória {self.pico_memoria_bytes / 1048576:.1f} MB"
+        linhas = [cabecalho]
+        for funcao in self.funcoes[:top]:
+            linhas.append(
+                f"  {funcao['tempo_proprio_s']:8.3f} s próprio | "
+                f"{funcao['tempo_acumulado_s']:8.3f} s acumulado | {funcao['funcao']}"
+            )
+        for alocacao in self.alocacoes[:top]:
+            linhas.append(
+                f"  {alocacao['bytes'] / 1024:10.1f} KB alocados | {alocacao['local']}"
+            )
+        return "\n".join(linhas)
+
+
+class Perfilador:
+    """
+    Perfis por trecho, desligados por padrão (GEG_PERFIL=1 liga).
+
+    Os relatórios ficam em <diretorio>/<execução>/<rótulo>.prof e .txt. O
+    cProfile só enxerga a thread que entrou no trecho e o tracemalloc é global
+    ao processo, então os trechos perfilados rodam um de cada vez; com o
+    tracemalloc (GEG_PERFIL_MEMORIA, ligado junto) o código fica bem mais lento.
+    """
+
+    def __init__(
+        self,
+        diretorio: Optional[str] = None,
+        habilitado: Optional[bool] = None,
+        memoria: Optional[bool] = None,
+        top: Optional[int] = None,
+        quadros: Optional[int] = None,
+    ):
+        self.diretorio = diretorio or os.getenv(
+            "GEG_PERFIL_DIR", os.path.join("output", "perfis")
+        )
+        self.habilitado = (
+            habilitado if habilitado is not None else os.getenv("GEG_PERFIL") == "1"
+        )
+        self.memoria = (
+            memoria
+            if memoria is not None
+            else os.getenv("GEG_PERFIL_MEMORIA", "1") != "0"
+        )
+        self.top = top or int(os.getenv("GEG_PERFIL_TOP", "30"))
+        # Quadros guardados por alocação (mais quadros, mais custo)
+        self.quadros = quadros or int(os.getenv("GEG_PERFIL_QUADROS", "1"))
+        self.perfis: List[Perfil] = []
+        self._trava = threading.Lock()
+
+    @contextmanager
+    def perfilar(
+        self, rotulo: str, execucao: Optional[str] = None
+    ) -> Iterator[Optional[Perfil]]:
+        """
+        Perfila o bloco e grava os relatórios ao sair (mesmo com exceção).
+
+        Desligado, não faz nada e entrega None.
+        """
+        if not self.habilitado:
+            yield None
+            return
+
+        execucao = execucao or datetime.now().strftime("%Y%m%d_%H%M%S")
+        perfil = Perfil(rotulo)
+        with self._trava:
+            iniciou_tracemalloc = False
+            if self.memoria:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(self.quadros)
+                    iniciou_tracemalloc = True
+                tracemalloc.reset_peak()
+                inicial = tracemalloc.take_snapshot()
+
+            profiler = cProfile.Profile()
+            inicio = time.perf_counter()
+            profiler.enable()
+            try:
+                yield perfil
+            finally:
+                profiler.disable()
+                perfil.segundos = time.perf_counter() - inicio
+                if self.memoria:
+                    _, perfil.pico_memoria_bytes = tracemalloc.get_traced_memory()
+                    final = tracemalloc.take_snapshot()
+                    if iniciou_tracemalloc:
+                        tracemalloc.stop()
+                    perfil.alocacoes = self._alocacoes(inicial, final)
+                # Falha ao gravar o relatório não interrompe a execução perfilada
+                try:
+                    self._gravar(perfil, profiler, execucao)
+                except Exception as e:
+                    print(f"Erro ao gravar perfil de {rotulo}: {str(e)}")
+                self.perfis.append(perfil)
+
+    def _alocacoes(self, inicial, final) -> List[Dict]:
+        """Linhas que mais alocaram (e mantiveram) memória durante o trecho"""
+        diferencas = final.filter_traces(_FILTROS_ALOCACAO).compare_to(
+            inicial.filter_traces(_FILTROS_ALOCACAO), "lineno"
+        )
+        diferencas.sort(key=lambda diferenca: diferenca.size_diff, reverse=True)
+        return [
+            {
+                "local": f"{diferenca.traceback[0].filename}:"
+                f"{diferenca.traceback[0].lineno}",
+                "bytes": diferenca.size_diff,
+                "blocos": diferenca.count_diff,
+            }
+            for diferenca in diferencas[: self.top]
+            if diferenca.size_diff > 0
+        ]
+
+    def _gravar(self, perfil: Perfil, profiler: cProfile.Profile, execucao: str):
+        destino = os.path.join(self.diretorio, execucao)
+        os.makedirs(destino, exist_ok=True)
+        base = os.path.join(destino, slug_credencial(perfil.rotulo))
+
+        estatisticas = pstats.Stats(profiler)
+        estatisticas.dump_stats(f"{base}.prof")
+        mais_pesadas = sorted(
+            estatisticas.stats.items(), key=lambda item: item[1][2], reverse=True
+        )
+        perfil.funcoes = []
+        for funcao, (_, chamadas, proprio, acumulado, _) in mais_pesadas[: self.top]:
+            perfil.funcoes.append(
+                {
+                    "funcao": pstats.func_std_string(funcao),
+                    "chamadas": chamadas,
+                    "tempo_proprio_s": proprio,
+                    "tempo_acumulado_s": acumulado,
+                }
+            )
+
+        relatorio = io.StringIO()
+        relatorio.write(f"Perfil: {perfil.rotulo} (execução {execucao})\n")
+        relatorio.write(f"Tempo de parede: {perfil.segundos:.3f} s\n")
+        if perfil.pico_memoria_bytes is not None:
+            relatorio.write(
+                f"Pico de memória (tracemalloc): "
+                f"{perfil.pico_memoria_bytes / 1024 / 1024:.1f} MB\n"
+            )
+        for ordem, titulo in (
+            ("tottime", "Funções por tempo próprio"),
+            ("cumulative", "Funções por tempo acumulado"),
+        ):
+            relatorio.write(f"\n=== {titulo} ===\n")
+            pstats.Stats(profiler, stream=relatorio).sort_stats(ordem).print_stats(
+                self.top
+            )
+        if perfil.alocacoes:
+            relatorio.write("\n=== Alocações mantidas ao fim do trecho ===\n")
+            for alocacao in perfil.alocacoes:
+                relatorio.write(
+                    f"{alocacao['bytes'] / 1024:12.1f} KB {alocacao['blocos']:9d} "
+                    f"blocos  {alocacao['local']}\n"
+                )
+
+        with open(f"{base}.txt", "w", encoding="utf-8") as arquivo:
+            arquivo.write(relatorio.getvalue())
+        perfil.arquivos = [f"{base}.prof", f"{base}.txt"]
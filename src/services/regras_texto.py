@@ -0,0 +1,176 @@
+"""
+Motor de regras para os extratores de texto (fallbacks sem a grid principal)
+Os padrões de cada campo são compilados uma única vez e todos os campos de uma
+linha saem de uma só chamada; campos cujos padrões se sobrepõem reaproveitam a
+busca do campo de origem. Cada campo ainda faz o próprio re.search: uma única
+alternância com grupos nomeados percorrida com finditer dá o mesmo resultado,
+mas é mais lenta no re do CPython (ver bench_regras_texto)
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+PADRAO_CPF = r"\d{3}\.\d{3}\.\d{3}-\d{2}"
+PADRAO_STATUS = r"ATIVO|LIBERADO|BLOQUEADO|AFASTADO|FÉRIAS|INATIVO"
+PADRAO_FUNCAO = r"Motorista\s+\w+|Manobrista"
+
+SITUACOES_CNH = ("LIBERADO", "BLOQUEADO")
+
+# Só o CPF, para quem precisa apenas saber se a linha é de um colaborador
+BUSCA_CPF = re.compile(PADRAO_CPF)
+
+
+class Regra(NamedTuple):
+    """
+    Regra de extração de um campo: vale o primeiro trecho da linha que casa com
+    `padrao`.
+
+    Com `origem`, o padrão da regra precisa estar contido no da regra de origem
+    (ex.: a situação da CNH é o primeiro status LIBERADO/BLOQUEADO). O motor
+    reaproveita o trecho da origem quando ele já é um dos `valores` e, senão,
+    só procura depois dele. `obrigatoria` interrompe a linha quando o campo não
+    é encontrado.
+    """
+
+    campo: str
+    padrao: str
+    origem: Optional[str] = None
+    valores: FrozenSet[str] = frozenset()
+    obrigatoria: bool = False
+
+
+class MotorRegras:
+    """
+    Conjunto de regras compiladas, aplicadas linha a linha.
+
+    Cada regra sem origem é uma busca separada, de propósito. A alternativa de
+    uma só expressão, `(?=(?P<cpf>...))|(?=(?P<status>...))|...` com finditer
+    (lookahead para que campos sobrepostos não se escondam), testa todas as
+    alternativas em cada posição da linha e perde a varredura por prefixo
+    literal que o re faz em cada padrão isolado: nas linhas do relatório ela
+    fica de 2x a 3x mais lenta que as três buscas. O ganho do motor está em
+    compilar uma vez, parar no CPF ausente e reaproveitar o trecho da origem.
+    """
+
+    def __init__(self, regras: Iterable[Regra]):
+        self.regras = list(regras)
+        self.campos = tuple(regra.campo for regra in self.regras)
+
+        vistos = set()
+        for regra in self.regras:
+            if regra.origem and regra.origem not in vistos:
+                raise ValueError(
+                    f"Regra {regra.campo}: a origem {regra.origem} deve vir antes"
+                )
+            vistos.add(regra.campo)
+
+        self._compiladas = [
+            (
+                regra.campo,
+                re.compile(regra.padrao).search,
+                regra.origem,
+                regra.valores,
+                regra.obrigatoria,
+            )
+            for regra in self.regras
+        ]
+
+    def selecionar(self, *campos: str) -> "MotorRegras":
+        """Motor só com as regras dos campos pedidos (na ordem original)"""
+        return MotorRegras(regra for regra in self.regras if regra.campo in campos)
+
+    def extrair(self, linha: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Primeiro valor de cada campo na linha (None quando não encontrado).
+
+        Retorna None se faltar um campo obrigatório — as demais regras nem são
+        avaliadas.
+        """
+        encontrados: Dict[str, Optional[str]] = {}
+        posicoes: Dict[str, int] = {}
+
+        for campo, buscar, origem, valores, obrigatoria in self._compiladas:
+            if origem:
+                inicio = posicoes.get(origem)
+                if inicio is None:
+                    # Sem trecho da origem não há como casar o padrão contido nela
+                    encontrados[campo] = None
+                    continue
+                if encontrados[origem] in valores:
+                    encontrados[campo] = encontrados[origem]
+                    posicoes[campo] = inicio
+                    continue
+                match = buscar(linha, inicio + 1)
+            else:
+                match = buscar(linha)
+
+            if match is None:
+                if obrigatoria:
+                    return None
+                encontrados[campo] = None
+                continue
+
+            encontrados[campo] = match.group()
+            posicoes[campo] = match.start()
+
+        return encontrados
+
+
+# Regras compartilhadas por AutomacaoGEG e DataService
+REGRAS_COLABORADOR = MotorRegras(
+    [
+        Regra("cpf", PADRAO_CPF, obrigatoria=True),
+        Regra("status", PADRAO_STATUS),
+        Regra("funcao", PADRAO_FUNCAO),
+        Regra(
+            "situacao_cnh",
+            "|".join(SITUACOES_CNH),
+            origem="status",
+            valores=frozenset(SITUACOES_CNH),
+        ),
+    ]
+)
+
+# Limpeza do nome, aplicada só nos trechos que não são palavras simples
+_PADRAO_SITUACOES_CNH = re.compile("|".join(SITUACOES_CNH))
+_PADRAO_NUMEROS = re.compile(r"\d+")
+_PADRAO_NAO_PALAVRA = re.compile(r"[^\w\s]")
+_PADRAO_LETRA = re.compile(r"[^\W\d_]")
+
+
+def extrair_nome(
+    linha: str, removidos: Iterable[Optional[str]], max_palavras: int = 4
+) -> str:
+    """
+    Nome do colaborador na linha: retira os valores já extraídos (CPF, status,
+    função), situações de CNH e números, e junta as primeiras palavras
+    alfabéticas com mais de 2 letras.
+
+    Como nada disso remove espaços, cada trecho entre espaços é limpo de forma
+    independente e a leitura para assim que o nome está completo.
+    """
+    for valor in removidos:
+        if valor:
+            linha = linha.replace(valor, "")
+
+    palavras: List[str] = []
+    for trecho in linha.split():
+        if trecho.isalpha():
+            if "LIBERADO" in trecho or "BLOQUEADO" in trecho:
+                candidatas = _PADRAO_SITUACOES_CNH.sub("", trecho).split()
+            else:
+                candidatas = (trecho,)
+        elif _PADRAO_LETRA.search(trecho):
+            trecho = _PADRAO_NUMEROS.sub("", _PADRAO_SITUACOES_CNH.sub("", trecho))
+            candidatas = _PADRAO_NAO_PALAVRA.sub(" ", trecho).split()
+        else:
+            # Só números e pontuação: não sobra nenhuma letra
+            continue
+
+        for palavra in candidatas:
+            if len(palavra) > 2 and palavra.isalpha():
+                palavras.append(palavra.capitalize())
+                if len(palavras) == max_palavras:
+                    return " ".join(palavras)
+
+    return " ".join(palavras)
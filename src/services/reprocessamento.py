@@ -0,0 +1,185 @@
+"""
+Reprocessamento offline das respostas arquivadas do portal
+Localiza as respostas de callback guardadas em output/debug/ (resposta_ajax_dados
+e as páginas _pNNNN, comprimidas ou não) e refaz decodificação, extração,
+limpeza e CSV de cada uma em um pool de processos, pelo mesmo código da
+execução real (AutomacaoGEG.reprocessar_respostas), sem acessar o portal
+"""
+
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# resposta_ajax_dados.html(.gz), páginas resposta_ajax_dados_p0001.html(.gz) e o
+# nome antigo debug_resposta_ajax_dados.html
+PADRAO_RESPOSTA = re.compile(
+    r"^(?:debug_)?resposta_ajax_dados(?:_p(\d+))?\.html(?:\.gz)?$"
+)
+
+# Pastas de execução do GravadorDebug (<execução>/<credencial>/)
+PADRAO_EXECUCAO = re.compile(r"^\d{8}_\d{6}$")
+
+
+class RespostaArquivada(NamedTuple):
+    """Uma busca da grid: o callback único ou as páginas, em ordem"""
+
+    relativo: str
+    arquivos: Tuple[str, ...]
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        """Execução original (nome da pasta), para o CSV ter o nome da execução real"""
+        for parte in self.relativo.split(os.sep):
+            if PADRAO_EXECUCAO.match(parte):
+                return parte
+        return None
+
+
+def localizar_respostas(raiz: str) -> Tuple[List[RespostaArquivada], List[str]]:
+    """
+    Respostas arquivadas sob `raiz` e os avisos das que não podem ser refeitas
+    (páginas faltando, descartadas pela amostragem do GravadorDebug)
+    """
+    respostas: List[RespostaArquivada] = []
+    avisos: List[str] = []
+    for diretorio, subdiretorios, nomes in os.walk(raiz):
+        subdiretorios.sort()
+        relativo = os.path.relpath(diretorio, raiz)
+        unica: Optional[str] = None
+        paginas: Dict[int, str] = {}
+        # Nomes novos antes do antigo (debug_...): na mesma pasta, vale o novo
+        for nome in sorted(nomes, key=lambda nome: (nome.startswith("debug_"), nome)):
+            encontrado = PADRAO_RESPOSTA.match(nome)
+            if not encontrado:
+                continue
+            caminho = os.path.join(diretorio, nome)
+            if encontrado.group(1) is None:
+                unica = unica or caminho
+            else:
+                paginas.setdefault(int(encontrado.group(1)), caminho)
+
+        if unica:
+            respostas.append(RespostaArquivada(relativo, (unica,)))
+        if paginas:
+            numeros = sorted(paginas)
+            if numeros != list(range(1, len(numeros) + 1)):
+                faltando = sorted(set(range(1, numeros[-1] + 1)) - set(numeros))
+                avisos.append(f"{relativo}: página(s) {faltando} ausente(s), ignorada")
+                continue
+            respostas.append(
+                RespostaArquivada(relativo, tuple(paginas[n] for n in numeros))
+            )
+    return respostas, avisos
+
+
+def reprocessar_resposta(resposta: RespostaArquivada, destino: str) -> Dict:
+    """
+    Refaz uma resposta (executado nos processos do pool).
+
+    O CSV vai para <destino>/<caminho relativo da resposta>/, com o timestamp
+    da execução original quando a pasta o tem.
+    """
+    from automacao_geg import AutomacaoGEG
+
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    automacao = AutomacaoGEG(os.path.join(destino, resposta.relativo))
+    automacao.logger.setLevel(logging.WARNING)
+    # Fora de uma pasta de execução, o CSV leva o nome do arquivo da resposta
+    timestamp = (
+        resposta.timestamp or os.path.basename(resposta.arquivos[0]).split(".")[0]
+    )
+    arquivo_csv, colaboradores = automacao.reprocessar_respostas(
+        resposta.arquivos, timestamp
+    )
+    return {
+        "resposta": resposta.relativo,
+        "paginas": len(resposta.arquivos),
+        "bytes": sum(os.path.getsize(arquivo) for arquivo in resposta.arquivos),
+        "linhas": len(colaboradores) if colaboradores else 0,
+        "arquivo_csv": arquivo_csv,
+        "segundos": time.perf_counter() - inicio,
+        "cpu_segundos": time.process_time() - inicio_cpu,
+    }
+
+
+class Reprocessamento:
+    """
+    Refaz as respostas arquivadas em paralelo, um processo por resposta.
+
+    A extração é CPU pura: processos (não threads) usam todos os núcleos. O
+    resumo traz linhas por segundo de parede e os bytes lidos do arquivo.
+    """
+
+    def __init__(self, destino: str, workers: Optional[int] = None):
+        """
+        Args:
+            destino: Diretório dos CSVs refeitos
+            workers: Processos simultâneos (GEG_REPROCESSAMENTO_WORKERS; padrão:
+                núcleos da máquina)
+        """
+        self.destino = destino
+        self.workers = max(
+            1,
+            workers
+            or int(os.getenv("GEG_REPROCESSAMENTO_WORKERS", "0"))
+            or os.cpu_count()
+            or 1,
+        )
+
+    def executar(
+        self,
+        respostas: List[RespostaArquivada],
+        ao_concluir: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """Reprocessa as respostas e devolve o resumo (resultados e taxas)"""
+        inicio = time.perf_counter()
+        resultados: List[Dict] = []
+        falhas: List[str] = []
+
+        def registrar(resultado: Dict) -> None:
+            resultados.append(resultado)
+            if not resultado["arquivo_csv"]:
+                falhas.append(resultado["resposta"])
+            if ao_concluir:
+                ao_concluir(resultado)
+
+        workers = min(self.workers, len(respostas)) or 1
+        if workers == 1:
+            for resposta in respostas:
+                try:
+                    registrar(reprocessar_resposta(resposta, self.destino))
+                except Exception as e:
+                    falhas.append(resposta.relativo)
+                    print(f"Erro ao reprocessar {resposta.relativo}: {e}")
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futuros = {
+                    executor.submit(reprocessar_resposta, resposta, self.destino): (
+                        resposta
+                    )
+                    for resposta in respostas
+                }
+                for futuro in as_completed(futuros):
+                    try:
+                        registrar(futuro.result())
+                    except Exception as e:
+                        falhas.append(futuros[futuro].relativo)
+                        print(f"Erro ao reprocessar {futuros[futuro].relativo}: {e}")
+
+        segundos = time.perf_counter() - inicio
+        linhas = sum(resultado["linhas"] for resultado in resultados)
+        bytes_lidos = sum(resultado["bytes"] for resultado in resultados)
+        return {
+            "respostas": len(respostas),
+            "falhas": falhas,
+            "workers": workers,
+            "linhas": linhas,
+            "bytes": bytes_lidos,
+            "segundos": segundos,
+            "cpu_segundos": sum(r["cpu_segundos"] for r in resultados),
+            "linhas_por_segundo": linhas / segundos if segundos else 0.0,
+            "resultados": sorted(resultados, key=lambda r: r["resposta"]),
+        }
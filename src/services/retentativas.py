@@ -0,0 +1,245 @@
+"""
+Política de novas tentativas do projeto
+Backoff exponencial com jitter, apenas para falhas transitórias de HTTP e de
+banco, limitado por um orçamento de novas tentativas e de espera por execução
+(compartilhado pelas operações dessa execução), com tentativas e tempo dormindo
+registrados nas métricas
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from functools import wraps
+from typing import Callable, Optional
+
+import requests
+
+from services.metricas import ColetorMetricas, obter_coletor_metricas
+
+# Respostas HTTP que costumam passar sozinhas (sobrecarga, gateway, limite)
+STATUS_HTTP_TRANSITORIOS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Erros do MySQL que não mudam com uma nova tentativa (acesso negado, banco
+# inexistente); os demais erros operacionais e de interface (conexão perdida,
+# deadlock, lock wait timeout, too many connections) são transitórios
+ERROS_MYSQL_PERMANENTES = frozenset({1044, 1045, 1049})
+
+
+def erro_transitorio(erro: BaseException) -> bool:
+    """Se vale a pena repetir a operação que falhou com `erro`"""
+    if isinstance(erro, requests.HTTPError):
+        resposta = erro.response
+        return resposta is not None and resposta.status_code in (
+            STATUS_HTTP_TRANSITORIOS
+        )
+    if isinstance(
+        erro,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    ):
+        return True
+
+    # O SQLAlchemy só é consultado se já foi carregado (sem ele no processo, o
+    # erro não é dele); assim importar este módulo não carrega o SQLAlchemy
+    sqlalchemy_exc = sys.modules.get("sqlalchemy.exc")
+    if sqlalchemy_exc is None:
+        return isinstance(erro, (ConnectionError, TimeoutError))
+
+    if isinstance(erro, sqlalchemy_exc.DBAPIError):
+        if erro.connection_invalidated:
+            return True
+        # O mysql-connector usa InterfaceError para algumas falhas de conexão
+        if isinstance(
+            erro, (sqlalchemy_exc.OperationalError, sqlalchemy_exc.InterfaceError)
+        ):
+            codigo = getattr(erro.orig, "errno", None)
+            return codigo not in ERROS_MYSQL_PERMANENTES
+        return False
+    if isinstance(
+        erro, (sqlalchemy_exc.DisconnectionError, sqlalchemy_exc.TimeoutError)
+    ):
+        return True
+
+    # Socket derrubado ou sem resposta fora do requests/SQLAlchemy
+    return isinstance(erro, (ConnectionError, TimeoutError))
+
+
+def levantar_status_transitorio(response: requests.Response) -> requests.Response:
+    """
+    Converte uma resposta com status HTTP transitório em HTTPError, para que a
+    política repita a requisição; as demais respostas seguem para quem chamou
+    """
+    if response.status_code in STATUS_HTTP_TRANSITORIOS:
+        response.raise_for_status()
+    return response
+
+
+class OrcamentoRetentativas:
+    """
+    Limite de novas tentativas e de segundos de espera de uma execução.
+
+    Compartilhado pelas políticas: uma dependência instável não soma as
+    tentativas de cada operação; esgotado, a falha seguinte é devolvida.
+    """
+
+    def __init__(
+        self, retentativas: Optional[int] = None, segundos: Optional[float] = None
+    ):
+        self.retentativas = (
+            retentativas
+            if retentativas is not None
+            else int(os.getenv("GEG_RETENTATIVAS_ORCAMENTO", "20"))
+        )
+        self.segundos = (
+            segundos
+            if segundos is not None
+            else float(os.getenv("GEG_RETENTATIVAS_ORCAMENTO_S", "300"))
+        )
+        self._trava = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Novo orçamento (início de uma execução)"""
+        with self._trava:
+            self.retentativas_usadas = 0
+            self.segundos_usados = 0.0
+
+    def consumir(self, espera: float) -> bool:
+        """Reserva uma nova tentativa com `espera` segundos, se couber"""
+        with self._trava:
+            if self.retentativas_usadas >= self.retentativas:
+                return False
+            if self.segundos_usados + espera > self.segundos:
+                return False
+            self.retentativas_usadas += 1
+            self.segundos_usados += espera
+            return True
+
+    def restante(self) -> str:
+        with self._trava:
+            return (
+                f"{self.retentativas - self.retentativas_usadas} novas tentativas, "
+                f"{max(0.0, self.segundos - self.segundos_usados):.0f} s de espera"
+            )
+
+
+class PoliticaRetentativa:
+    """
+    Repete uma operação após falhas transitórias.
+
+    A espera antes da tentativa n é sorteada entre 0 e
+    min(maximo_segundos, base_segundos * 2^(n-1)) (full jitter), para que
+    credenciais e workers não voltem todos ao mesmo tempo. Erros permanentes,
+    tentativas esgotadas ou orçamento esgotado devolvem a última exceção.
+    Pode ser usada como decorador ou via `executar`.
+    """
+
+    def __init__(
+        self,
+        nome: str,
+        tentativas: Optional[int] = None,
+        base_segundos: Optional[float] = None,
+        maximo_segundos: Optional[float] = None,
+        orcamento: Optional[OrcamentoRetentativas] = None,
+        classificar: Callable[[BaseException], bool] = erro_transitorio,
+        coletor_metricas: Optional[ColetorMetricas] = None,
+        dormir: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            nome: Operação (rótulo nas métricas e mensagens)
+            tentativas: Execuções no máximo, contando a primeira (GEG_RETENTATIVAS)
+            base_segundos: Teto da primeira espera (GEG_RETENTATIVAS_BASE_S)
+            maximo_segundos: Teto de qualquer espera (GEG_RETENTATIVAS_MAXIMO_S)
+            orcamento: Orçamento da execução (padrão: o compartilhado do processo)
+            classificar: Decide se a exceção é transitória
+            coletor_metricas: Destino das métricas (padrão: coletor do processo)
+            dormir: Função de espera (substituível para testes)
+        """
+        self.nome = nome
+        self.tentativas = max(1, tentativas or int(os.getenv("GEG_RETENTATIVAS", "4")))
+        self.base_segundos = (
+            base_segundos
+            if base_segundos is not None
+            else float(os.getenv("GEG_RETENTATIVAS_BASE_S", "2"))
+        )
+        self.maximo_segundos = (
+            maximo_segundos
+            if maximo_segundos is not None
+            else float(os.getenv("GEG_RETENTATIVAS_MAXIMO_S", "60"))
+        )
+        self.orcamento = orcamento or obter_orcamento_retentativas()
+        self.classificar = classificar
+        self.coletor_metricas = coletor_metricas or obter_coletor_metricas()
+        self.dormir = dormir
+
+    def espera(self, tentativa: int) -> float:
+        """Segundos antes da tentativa seguinte à `tentativa` que falhou"""
+        teto = min(self.maximo_segundos, self.base_segundos * 2 ** (tentativa - 1))
+        return random.uniform(0, teto)
+
+    def executar(self, funcao: Callable, *args, **kwargs):
+        for tentativa in range(1, self.tentativas + 1):
+            self.coletor_metricas.registrar_retentativa(self.nome, tentativas=1)
+            try:
+                return funcao(*args, **kwargs)
+            except Exception as e:
+                motivo = self._motivo_desistencia(e, tentativa)
+                if motivo is None:
+                    espera = self.espera(tentativa)
+                    if self.orcamento.consumir(espera):
+                        print(
+                            f"{self.nome}: tentativa {tentativa}/{self.tentativas} "
+                            f"falhou ({type(e).__name__}: {str(e)}); nova "
+                            f"tentativa em {espera:.1f} s"
+                        )
+                        self.coletor_metricas.registrar_retentativa(
+                            self.nome, retentativas=1, segundos_espera=espera
+                        )
+                        self.dormir(espera)
+                        continue
+                    motivo = "orçamento da execução esgotado"
+
+                print(
+                    f"{self.nome}: desistindo após {tentativa} tentativa(s) "
+                    f"({motivo}): {type(e).__name__}: {str(e)}"
+                )
+                self.coletor_metricas.registrar_retentativa(self.nome, desistencias=1)
+                raise
+
+    def _motivo_desistencia(self, erro: Exception, tentativa: int) -> Optional[str]:
+        if not self.classificar(erro):
+            return "erro permanente"
+        if tentativa >= self.tentativas:
+            return "tentativas esgotadas"
+        return None
+
+    def __call__(self, funcao: Callable) -> Callable:
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            return self.executar(funcao, *args, **kwargs)
+
+        return envoltorio
+
+
+_orcamento_padrao: Optional[OrcamentoRetentativas] = None
+_orcamento_padrao_lock = threading.Lock()
+
+
+def obter_orcamento_retentativas() -> OrcamentoRetentativas:
+    """
+    Orçamento compartilhado pelo processo, das políticas criadas sem o de uma
+    execução. Execuções simultâneas (jobs agendados) criam cada uma o seu em vez
+    de reiniciar este, que as outras ainda estão usando.
+    """
+    global _orcamento_padrao
+
+    with _orcamento_padrao_lock:
+        if _orcamento_padrao is None:
+            _orcamento_padrao = OrcamentoRetentativas()
+        return _orcamento_padrao
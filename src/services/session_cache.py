@@ -0,0 +1,159 @@
+"""
+Cache persistente de sessões autenticadas no portal Gente e Gestão
+Guarda os cookies de cada credencial em disco (arquivos restritos ao usuário dono)
+para reaproveitar o login enquanto o cookie de autenticação continuar válido
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+# Requisições do fluxo de login (GET da página + POST das credenciais)
+REQUISICOES_LOGIN = 2
+
+
+class SessionCache:
+    """
+    Cache de cookies por email, com TTL.
+
+    Os arquivos ficam em um diretório com permissão 0700 e são gravados com
+    permissão 0600; o nome do arquivo é o hash do email para não expor a
+    credencial na listagem do diretório.
+    """
+
+    def __init__(
+        self, diretorio: Optional[str] = None, ttl_segundos: Optional[int] = None
+    ):
+        self.diretorio = diretorio or os.getenv(
+            "GEG_CACHE_SESSAO_DIR", os.path.join("output", ".sessoes")
+        )
+        self.ttl_segundos = (
+            ttl_segundos
+            if ttl_segundos is not None
+            else int(os.getenv("GEG_CACHE_SESSAO_TTL", "3600"))
+        )
+
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidados = 0
+        self._lock = threading.Lock()
+
+    def restaurar(self, email: str, session: requests.Session) -> bool:
+        """Carrega na sessão os cookies em cache da credencial, se ainda no TTL"""
+        caminho = self._caminho(email)
+        try:
+            with open(caminho, "r", encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        except (OSError, ValueError):
+            return False
+
+        if time.time() - dados.get("criado_em", 0) > self.ttl_segundos:
+            self._remover(caminho)
+            return False
+
+        for cookie in dados.get("cookies", []):
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+                secure=cookie.get("secure", False),
+                expires=cookie.get("expires"),
+            )
+        return True
+
+    def salvar(self, email: str, session: requests.Session) -> None:
+        """Persiste os cookies atuais da sessão para a credencial"""
+        dados = {
+            "criado_em": time.time(),
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "secure": cookie.secure,
+                    "expires": cookie.expires,
+                }
+                for cookie in session.cookies
+            ],
+        }
+
+        self._preparar_diretorio()
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            os.chmod(temporario, 0o600)
+            with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+                json.dump(dados, arquivo)
+            os.replace(temporario, self._caminho(email))
+        except Exception:
+            self._remover(temporario)
+            raise
+
+    def invalidar(self, email: str) -> None:
+        """Descarta a sessão em cache da credencial"""
+        self._remover(self._caminho(email))
+        with self._lock:
+            self.invalidados += 1
+
+    def registrar_acerto(self) -> None:
+        with self._lock:
+            self.acertos += 1
+
+    def registrar_falha(self) -> None:
+        with self._lock:
+            self.falhas += 1
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Contadores de uso do cache e requisições de login evitadas"""
+        with self._lock:
+            validacoes = self.acertos + self.invalidados
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "invalidados": self.invalidados,
+                # Cada acerto evita o fluxo de login; cada validação custa um GET
+                "requisicoes_evitadas": self.acertos * REQUISICOES_LOGIN - validacoes,
+            }
+
+    def _caminho(self, email: str) -> str:
+        nome = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+        return os.path.join(self.diretorio, f"{nome}.json")
+
+    def _preparar_diretorio(self) -> None:
+        os.makedirs(self.diretorio, mode=0o700, exist_ok=True)
+        os.chmod(self.diretorio, 0o700)
+
+    @staticmethod
+    def _remover(caminho: str) -> None:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+
+_cache_padrao: Optional[SessionCache] = None
+_cache_padrao_lock = threading.Lock()
+
+
+def obter_cache_sessao() -> Optional[SessionCache]:
+    """
+    Retorna o cache compartilhado pelo processo (contadores acumulam entre credenciais).
+
+    Desligado com GEG_CACHE_SESSAO=0.
+    """
+    global _cache_padrao
+
+    if os.getenv("GEG_CACHE_SESSAO", "1") == "0":
+        return None
+
+    with _cache_padrao_lock:
+        if _cache_padrao is None:
+            _cache_padrao = SessionCache()
+        return _cache_padrao
@@ -0,0 +1,350 @@
+"""
+Transporte HTTP compartilhado pelo login e pela automação
+Sessões requests que reaproveitam um mesmo pool de conexões keep-alive entre as
+credenciais, com timeouts de conexão e leitura em todas as requisições e
+accept-encoding restrito ao que o urllib3 anuncia e o transporte descomprime (br
+e zstd só com os pacotes brotli/zstandard instalados). O corpo é lido cru pela
+API pública do urllib3 e descomprimido aqui, somando os bytes recebidos na rede
+(comprimidos) e os entregues ao código (descomprimidos)
+"""
+
+import os
+import threading
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+
+def _descompressor_brotli() -> Optional[Callable[[], Callable[[bytes], bytes]]]:
+    for modulo in ("brotli", "brotlicffi"):
+        try:
+            brotli = __import__(modulo)
+        except ImportError:
+            continue
+        return lambda: brotli.Decompressor().process
+    return None
+
+
+def _descompressor_zstd() -> Optional[Callable[[], Callable[[bytes], bytes]]]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return lambda: zstandard.ZstdDecompressor().decompressobj().decompress
+
+
+class _DescompressorZlib:
+    """gzip (com vários membros) e deflate (zlib ou cru, como o urllib3 aceita)"""
+
+    def __init__(self, codificacao: str):
+        self._gzip = codificacao in ("gzip", "x-gzip")
+        self._inicio = True
+        self._objeto = self._novo()
+
+    def _novo(self, wbits: Optional[int] = None):
+        if wbits is None:
+            wbits = 16 + zlib.MAX_WBITS if self._gzip else zlib.MAX_WBITS
+        return zlib.decompressobj(wbits)
+
+    def __call__(self, dados: bytes) -> bytes:
+        try:
+            saida = self._objeto.decompress(dados)
+        except zlib.error:
+            if self._gzip or not self._inicio:
+                raise
+            # Servidores que mandam deflate sem o cabeçalho zlib
+            self._objeto = self._novo(-zlib.MAX_WBITS)
+            saida = self._objeto.decompress(dados)
+        self._inicio = False
+        while self._gzip and self._objeto.eof and self._objeto.unused_data:
+            resto = self._objeto.unused_data
+            self._objeto = self._novo()
+            saida += self._objeto.decompress(resto)
+        return saida
+
+
+# Content-encodings que o transporte descomprime (fábricas de descompressores)
+DESCOMPRESSORES: Dict[str, Callable[[], Callable[[bytes], bytes]]] = {
+    "gzip": lambda: _DescompressorZlib("gzip"),
+    "x-gzip": lambda: _DescompressorZlib("gzip"),
+    "deflate": lambda: _DescompressorZlib("deflate"),
+}
+for _codificacao, _fabrica in (
+    ("br", _descompressor_brotli()),
+    ("zstd", _descompressor_zstd()),
+):
+    if _fabrica is not None:
+        DESCOMPRESSORES[_codificacao] = _fabrica
+
+
+def codificacoes_suportadas() -> Tuple[str, ...]:
+    """
+    Content-encodings que o urllib3 instalado anuncia e que o transporte
+    descomprime (ex.: gzip, deflate)
+    """
+    return tuple(
+        codificacao.strip()
+        for codificacao in ACCEPT_ENCODING.split(",")
+        if codificacao.strip() in DESCOMPRESSORES
+    )
+
+
+class ContadoresHTTP:
+    """Respostas e bytes recebidos, na rede e descomprimidos (seguro entre threads)"""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.zerar()
+
+    def zerar(self) -> None:
+        with self._trava:
+            self.respostas = 0
+            self.bytes_rede = 0
+            self.bytes_conteudo = 0
+            self.codificacoes: Dict[str, int] = {}
+
+    def registrar(self, codificacao: str, bytes_rede: int, bytes_conteudo: int) -> None:
+        with self._trava:
+            self.respostas += 1
+            self.bytes_rede += bytes_rede
+            self.bytes_conteudo += bytes_conteudo
+            self.codificacoes[codificacao] = self.codificacoes.get(codificacao, 0) + 1
+
+    @property
+    def taxa_compressao(self) -> float:
+        """Bytes descomprimidos por byte recebido na rede"""
+        return self.bytes_conteudo / self.bytes_rede if self.bytes_rede else 1.0
+
+    def para_dict(self) -> Dict:
+        with self._trava:
+            return {
+                "respostas": self.respostas,
+                "bytes_rede": self.bytes_rede,
+                "bytes_conteudo": self.bytes_conteudo,
+                "taxa_compressao": round(self.taxa_compressao, 2),
+                "codificacoes": dict(self.codificacoes),
+            }
+
+    def resumo(self) -> str:
+        dados = self.para_dict()
+        codificacoes = ", ".join(
+            f"{nome}: {quantidade}"
+            for nome, quantidade in sorted(dados["codificacoes"].items())
+        )
+        return (
+            f"{dados['respostas']} respostas | "
+            f"{dados['bytes_rede'] / 1024:.1f} KB na rede | "
+            f"{dados['bytes_conteudo'] / 1024:.1f} KB descomprimidos "
+            f"({dados['taxa_compressao']:.1f}x) | {codificacoes or '-'}"
+        )
+
+
+class _CorpoContado:
+    """
+    Envolve a resposta do urllib3 (response.raw) e registra os bytes ao fim da
+    leitura do corpo.
+
+    O corpo é lido cru pela API pública (`stream(decode_content=False)`, que
+    também desfaz o chunked), contado como bytes da rede e descomprimido aqui;
+    os descomprimidos são os entregues por `stream()`, usado pelo
+    iter_content/content do requests.
+    """
+
+    def __init__(self, raw, contadores: Tuple[ContadoresHTTP, ...]):
+        self._raw = raw
+        self._contadores = contadores
+        self._bytes_rede = 0
+        self._registrado = False
+        self._codificacao = raw.headers.get("content-encoding", "identity").lower()
+
+    def __getattr__(self, nome):
+        return getattr(self._raw, nome)
+
+    def stream(self, amt: int = 2**16, decode_content: Optional[bool] = None):
+        descomprimir = self._descompressores() if decode_content else []
+        bytes_conteudo = 0
+        try:
+            for bloco in self._raw.stream(amt, decode_content=False):
+                self._bytes_rede += len(bloco)
+                for descompressor in descomprimir:
+                    bloco = self._descomprimir(descompressor, bloco)
+                if bloco:
+                    bytes_conteudo += len(bloco)
+                    yield bloco
+        finally:
+            self._registrar(bytes_conteudo)
+
+    def _descompressores(self) -> List[Callable[[bytes], bytes]]:
+        """Na ordem inversa da aplicada pelo servidor (ex.: "gzip, br")"""
+        codificacoes = [
+            codificacao.strip()
+            for codificacao in self._codificacao.split(",")
+            if codificacao.strip() not in ("", "identity")
+        ]
+        if any(codificacao not in DESCOMPRESSORES for codificacao in codificacoes):
+            # Codificação não pedida: o corpo segue como veio
+            return []
+        return [
+            DESCOMPRESSORES[codificacao]() for codificacao in reversed(codificacoes)
+        ]
+
+    def _descomprimir(self, descompressor, bloco: bytes) -> bytes:
+        try:
+            return descompressor(bloco)
+        except Exception as e:
+            raise requests.exceptions.ContentDecodingError(
+                f"Falha ao descomprimir o corpo ({self._codificacao}): {e}"
+            ) from e
+
+    def _registrar(self, bytes_conteudo: int) -> None:
+        if self._registrado:
+            return
+        self._registrado = True
+        for contadores in self._contadores:
+            contadores.registrar(self._codificacao, self._bytes_rede, bytes_conteudo)
+
+
+class AdaptadorHTTP(HTTPAdapter):
+    """
+    HTTPAdapter de uma sessão: usa o pool de conexões do transporte e conta os
+    bytes de cada resposta. Fechar a sessão não fecha o pool compartilhado
+    """
+
+    def __init__(self, transporte: "TransporteHTTP", contadores: ContadoresHTTP):
+        self._contadores = (contadores, transporte.contadores)
+        super().__init__(
+            pool_connections=transporte.pool_hosts,
+            pool_maxsize=transporte.pool_conexoes,
+            max_retries=0,
+        )
+        self.poolmanager = transporte.poolmanager
+
+    def build_response(self, req, resp) -> requests.Response:
+        response = super().build_response(req, resp)
+        response.raw = _CorpoContado(resp, self._contadores)
+        return response
+
+    def close(self) -> None:
+        # O pool pertence ao transporte (TransporteHTTP.fechar)
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+
+class SessaoHTTP(requests.Session):
+    """
+    requests.Session do transporte: timeout padrão em toda requisição, accept-
+    encoding suportado e contadores de bytes próprios da sessão
+    """
+
+    def __init__(self, transporte: "TransporteHTTP"):
+        super().__init__()
+        self.transporte = transporte
+        self.timeout = transporte.timeout
+        self.contadores = ContadoresHTTP()
+        self.headers["Accept-Encoding"] = transporte.accept_encoding
+
+        adaptador = AdaptadorHTTP(transporte, self.contadores)
+        self.mount("https://", adaptador)
+        self.mount("http://", adaptador)
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+class TransporteHTTP:
+    """
+    Pool de conexões e configuração HTTP compartilhados pelas sessões.
+
+    Cada credencial tem a própria SessaoHTTP (cookies separados), mas as
+    conexões TCP/TLS abertas com o portal voltam ao mesmo pool e são
+    reaproveitadas pelas próximas requisições de qualquer sessão.
+    """
+
+    def __init__(
+        self,
+        timeout_conexao: Optional[float] = None,
+        timeout_leitura: Optional[float] = None,
+        pool_hosts: Optional[int] = None,
+        pool_conexoes: Optional[int] = None,
+        codificacoes: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            timeout_conexao: Segundos para abrir a conexão (GEG_HTTP_TIMEOUT_CONEXAO)
+            timeout_leitura: Segundos sem receber dados antes de desistir da
+                resposta (GEG_HTTP_TIMEOUT_LEITURA); não limita a duração total
+                de um callback que continua recebendo blocos
+            pool_hosts: Hosts com pool próprio (GEG_HTTP_POOL_HOSTS)
+            pool_conexoes: Conexões keep-alive guardadas por host
+                (GEG_HTTP_POOL_CONEXOES); acima disso as conexões extras são
+                fechadas ao terminar
+            codificacoes: Content-encodings pedidos ao servidor (GEG_HTTP_CODIFICACOES,
+                separados por vírgula); os que o urllib3 não descomprime são
+                descartados
+        """
+        self.timeout = (
+            timeout_conexao or float(os.getenv("GEG_HTTP_TIMEOUT_CONEXAO", "10")),
+            timeout_leitura or float(os.getenv("GEG_HTTP_TIMEOUT_LEITURA", "120")),
+        )
+        self.pool_hosts = pool_hosts or int(os.getenv("GEG_HTTP_POOL_HOSTS", "4"))
+        self.pool_conexoes = pool_conexoes or int(
+            os.getenv("GEG_HTTP_POOL_CONEXOES", "16")
+        )
+
+        suportadas = codificacoes_suportadas()
+        if codificacoes is None:
+            pedidas = os.getenv("GEG_HTTP_CODIFICACOES")
+            codificacoes = pedidas.split(",") if pedidas else suportadas
+        self.codificacoes = tuple(
+            codificacao.strip()
+            for codificacao in codificacoes
+            if codificacao.strip() in suportadas
+        ) or ("identity",)
+        self.accept_encoding = ", ".join(self.codificacoes)
+
+        self.contadores = ContadoresHTTP()
+        self.poolmanager = HTTPAdapter(
+            pool_connections=self.pool_hosts,
+            pool_maxsize=self.pool_conexoes,
+            max_retries=0,
+        ).poolmanager
+
+    def criar_sessao(self) -> SessaoHTTP:
+        """Nova sessão (cookies vazios) sobre o pool compartilhado"""
+        return SessaoHTTP(self)
+
+    def fechar(self) -> None:
+        """Fecha as conexões guardadas no pool"""
+        self.poolmanager.clear()
+
+
+_transporte_padrao: Optional[TransporteHTTP] = None
+_transporte_padrao_lock = threading.Lock()
+
+
+def obter_transporte_http() -> TransporteHTTP:
+    """Retorna o transporte compartilhado pelo processo"""
+    global _transporte_padrao
+
+    with _transporte_padrao_lock:
+        if _transporte_padrao is None:
+            _transporte_padrao = TransporteHTTP()
+        return _transporte_padrao
+
+
+def _descartar_transporte_herdado() -> None:
+    global _transporte_padrao, _transporte_padrao_lock
+
+    _transporte_padrao = None
+    _transporte_padrao_lock = threading.Lock()
+
+
+# Processos filhos (executor de processos do agendador) não reaproveitam as
+# conexões keep-alive herdadas do pai: o filho cria o próprio transporte
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_descartar_transporte_herdado)
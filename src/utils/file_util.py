@@ -1,5 +1,12 @@
 # Este módulo contém utilitários para salvar respostas HTTP em arquivos HTML.
 import os
+import re
+import threading
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
 
 def save_response_to_file(response, filename):
     """Salva o conteúdo de uma resposta HTTP em um arquivo."""
@@ -7,3 +14,67 @@ def save_response_to_file(response, filename):
         file.write(response.text)
 
     print(f"Resposta salva em {filename}")
+
+
+def slug_credencial(email):
+    """Gera um nome seguro para diretórios/arquivos a partir do email da credencial."""
+    return re.sub(r"[^\w.-]", "_", email.strip().lower()) or "credencial"
+
+
+class TravaArquivo:
+    """
+    Trava exclusiva entre threads e entre processos (ex.: jobs do agendador no
+    executor de processos), sobre um arquivo de trava. Uso: `with trava: ...`
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._arquivo = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+            self._arquivo = open(self.caminho, "a+b")
+            _travar(self._arquivo)
+        except BaseException:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+            self._lock.release()
+            raise
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, traceback):
+        try:
+            _destravar(self._arquivo)
+        finally:
+            self._arquivo.close()
+            self._arquivo = None
+            self._lock.release()
+
+
+if os.name == "nt":
+
+    def _travar(arquivo):
+        arquivo.seek(0)
+        while True:
+            try:
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK desiste depois de ~10 s; continua esperando a vez
+                continue
+
+    def _destravar(arquivo):
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+
+    def _travar(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+
+    def _destravar(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
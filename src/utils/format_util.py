@@ -0,0 +1,11 @@
+# Este módulo contém utilitários de formatação compartilhados pela extração e exportação.
+
+
+def formatar_numero(valor: str) -> str:
+    """Formata valores numéricos para o padrão do CSV (ex: 0.00)"""
+    try:
+        # Converte para float e formata com 2 casas decimais
+        num = float(valor.replace(",", ".")) if valor else 0.0
+        return f"{num:.2f}"
+    except:
+        return "0.00"
@@ -0,0 +1,66 @@
+"""
+Leitura direcionada de campos ocultos do ASP.NET
+Percorre apenas as tags <input> da página, sem montar a árvore DOM
+"""
+
+import html
+import re
+from typing import Dict, Iterable
+
+CAMPOS_OCULTOS_ASPNET = ("__VIEWSTATE", "__VIEWSTATEGENERATOR", "__EVENTVALIDATION")
+
+# Comentários, scripts e estilos são ignorados (o html.parser não vê tags dentro
+# deles); valores entre aspas podem conter ">"
+_PADRAO_INPUT = re.compile(
+    r"<!--.*?-->|<(script|style)\b.*?</\1\s*>"
+    r"|<input\b((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>",
+    re.IGNORECASE | re.S,
+)
+_PADRAO_ATRIBUTO = re.compile(
+    r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]*)))?""", re.S
+)
+
+
+def atributos_tag(trecho: str) -> Dict[str, str]:
+    """Atributos de uma tag (nomes em minúsculas, último valor repetido vence)"""
+    atributos = {}
+    for match in _PADRAO_ATRIBUTO.finditer(trecho):
+        nome, aspas_duplas, aspas_simples, sem_aspas = match.groups()
+        valor = next(
+            (v for v in (aspas_duplas, aspas_simples, sem_aspas) if v is not None), ""
+        )
+        atributos[nome.lower()] = html.unescape(valor) if "&" in valor else valor
+    return atributos
+
+
+def extrair_campos_ocultos(
+    html_content: str, nomes: Iterable[str] = CAMPOS_OCULTOS_ASPNET
+) -> Dict[str, str]:
+    """
+    Retorna o value do primeiro <input> com cada um dos nomes pedidos.
+
+    Campos ausentes ou com value vazio não entram no resultado, como no
+    caminho com BeautifulSoup.
+    """
+    nomes = tuple(nomes)
+    pendentes = set(nomes)
+    vistos = set()
+    encontrados = {}
+
+    for match in _PADRAO_INPUT.finditer(html_content):
+        trecho = match.group(2)
+        if trecho is None:
+            continue
+        atributos = atributos_tag(trecho)
+        nome = atributos.get("name")
+        if nome not in pendentes or nome in vistos:
+            continue
+
+        vistos.add(nome)
+        if atributos.get("value"):
+            encontrados[nome] = atributos["value"]
+        if len(vistos) == len(pendentes):
+            break
+
+    # Mesma ordem dos nomes pedidos, independente da ordem na página
+    return {nome: encontrados[nome] for nome in nomes if nome in encontrados}